@@ -8,6 +8,7 @@ import subprocess
 import sys
 from pathlib import Path
 from shutil import copy
+from time import perf_counter
 
 from tqdm import tqdm
 
@@ -16,7 +17,7 @@ from tests.utils.example_finder import (
     get_example_directory,
     get_example_project,
 )
-from pyfmu.builder import export_project
+from pyfmu.builder import export_projects, format_export_summary
 from pyfmu.resources import Resources
 
 
@@ -44,6 +45,14 @@ if __name__ == "__main__":
         help="Exports all example projects as FMUs with the built wrapper.",
     )
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of example projects exported concurrently, defaults to the number of processors.",
+    )
+
     parser.add_argument(
         "--rust-tests",
         action="store_true",
@@ -96,13 +105,19 @@ if __name__ == "__main__":
     if args.export_examples:
         logger.info("Exporting example projects")
 
-        for example in [get_example_project(name) for name in get_all_examples()]:
-            export_project(
-                project_or_path=example,
-                output_path=root_dir / "examples" / "exported" / example.stem,
-                compress=False,
-                overwrite=True,
-            )
+        start = perf_counter()
+        results = export_projects(
+            [get_example_project(name) for name in get_all_examples()],
+            root_dir / "examples" / "exported",
+            jobs=args.jobs,
+            compress=False,
+            overwrite=True,
+            progress=lambda r, n, total: logger.info(f"[{n}/{total}] {r}"),
+        )
+        logger.info(format_export_summary(results, perf_counter() - start))
+
+        if not all(r.ok for r in results):
+            raise RuntimeError("One or more example projects failed to export")
 
     if args.rust_tests:
         os.chdir(wrapper_dir)
@@ -8,18 +8,16 @@ import tqdm
 
 from pyfmu.tests import get_example_project, get_all_examples
 
-from pyfmu.builder.export import export_project
-from pyfmu.builder.generate import PyfmuProject
+from pyfmu.builder.export import export_projects, format_export_summary
 
 
 def export_all():
-    for name in get_all_examples():
-
-        p = get_example_project(name)
-
-        outdir = Path(__file__).parent / 'exported' / name
-        project = PyfmuProject.from_existing(p)
-        export_project(project, outdir, overwrite=True)
+    results = export_projects(
+        [get_example_project(name) for name in get_all_examples()],
+        Path(__file__).parent / 'exported',
+        overwrite=True,
+    )
+    print(format_export_summary(results))
 
 
 if __name__ == "__main__":
@@ -3,6 +3,10 @@ import numpy as np
 
 
 class Adder(Fmi2Slave):
+
+    # the outputs depend on the inputs and parameters alone, see Fmi2Slave.stateless
+    stateless = True
+
     def __init__(self, visible=False, logging_on=False, *args, **kwargs):
 
         super().__init__(
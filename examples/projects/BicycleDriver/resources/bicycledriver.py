@@ -1,6 +1,3 @@
-from oomodelling.Model import Model
-from scipy.integrate import solve_ivp, RK45
-
 from pyfmu.fmi2 import Fmi2Slave, Fmi2Status, Fmi2Status_T
 import numpy as np
 
@@ -32,34 +29,9 @@ class BicycleDriver(Fmi2Slave):
         self, current_time: float, step_size: float, no_prior_step: bool
     ) -> Fmi2Status_T:
 
-        self.log_ok("Compute model derivative function.")
-        f = self.driver_model.derivatives()
-        self.log_ok("Compute state vector at start of step.")
-        x = self.driver_model.state_vector()
-
-        n_states = self.driver_model.nstates()
-
-        self.log_ok("Record current state in model history.")
-        self.driver_model.record_state(x, current_time)
-
-        self.log_ok("Invoking internal solver.")
-        stop_time = current_time + step_size
-        sol = solve_ivp(
-            f,
-            (current_time, stop_time),
-            x,
-            method=RK45,
-            max_step=step_size,
-            t_eval=[stop_time],
-        )
-        self.log_ok(f"Solution success: {sol.success}")
-        assert sol.success
-        assert sol.y.shape == (n_states, 1), (sol.y, sol.y.shape)
-
+        # the steering is a function of time alone, the driver has no states to integrate
         self.log_ok("Getting outputs from internal model.")
-        # Important to convert to float64.
-        # Otherwise COE will crash because the type of self.X is numpy.float64
-        self.deltaf = float(self.driver_model.steering())
+        self.deltaf = self.driver_model.steering(current_time)
 
         if current_time > 10.0:
             self.Caf = 500.0
@@ -83,25 +55,21 @@ class BicycleDriver(Fmi2Slave):
         return Fmi2Status.ok
 
 
-class DriverDynamic(Model):
-
+class DriverDynamic:
     def __init__(self):
-        super().__init__()
-        self.width = self.parameter(2.6)
-        self.amplitude = self.parameter(0.8)
-        self.risingtime = self.parameter(3.0)
-        self.starttime = self.parameter(3.0)
-        self.steering = self.var(self.get_steering)
+        self.width = 2.6
+        self.amplitude = 0.8
+        self.risingtime = 3.0
+        self.starttime = 3.0
         self.last_period_endtime = 0
-        self.nperiods = self.parameter(2)
+        self.nperiods = 2
         self.nperiods_counter = 0
-        self.save()
 
-    def get_steering(self):
+    def steering(self, time: float) -> float:
         if self.nperiods_counter >= self.nperiods:
             return 0.0
 
-        t = self.time() - self.last_period_endtime
+        t = time - self.last_period_endtime
         if t < self.starttime:
             return 0.0
         elif (t - self.starttime) < self.risingtime:
@@ -115,7 +83,7 @@ class DriverDynamic(Model):
             res = self.amplitude - self.amplitude * (t - self.starttime - self.risingtime - self.width) / self.risingtime
             if res <= 0.0:
                 # New period ended
-                self.last_period_endtime = self.time()
+                self.last_period_endtime = time
                 self.nperiods_counter += 1
             return max(0.0, res)
 
@@ -1,22 +1,23 @@
-import logging
-import math
+from math import cos, sin
 
-from oomodelling.Model import Model
-from scipy.integrate import solve_ivp, RK45
-
-from thirdparty.BicycleDynamicModel import BicycleDynamicModel
-from pyfmu.fmi2 import Fmi2Slave, Fmi2Status, Fmi2Status_T
+from pyfmu.fmi2 import Fmi2OdeSlave, Fmi2Status, Fmi2Status_T
 import numpy as np
 
 
-class BicycleDynamic(Fmi2Slave):
+class BicycleDynamic(Fmi2OdeSlave):
+    """Dynamic bicycle model, with the equations of thirdparty.BicycleDynamicModel."""
+
     def __init__(self, visible=False, logging_on=False, *args, **kwargs):
         super().__init__(
             model_name="BicycleDynamic", author="", description="", *args, **kwargs
         )
 
-        self.log_ok("Instantiating bicycle model")
-        self.bicycle_model = BicycleDynamicModel()
+        self.lf = 1.105  # distance from the the center of mass to the front (m)
+        self.lr = 1.738  # distance from the the center of mass to the rear (m)
+        self.m = 1292.2  # Vehicle's mass (kg)
+        self.Iz = 1.0  # Yaw inertial (kgm^2) (Not taken from the book)
+        self.Car = 800.0  # Rear Tire cornering stiffness
+        self.a = 0.0  # longitudinal acceleration
 
         self.reset()
 
@@ -32,67 +33,56 @@ class BicycleDynamic(Fmi2Slave):
             description="steering angle at the front wheel",
         )
 
-        self.register_output(
-            "X",
-            "real",
-            "continuous",
-            description="x coordinate in the reference frame",
+        self.register_state(
+            "X", description="x coordinate in the reference frame", initial="calculated"
         )
-
-        self.register_output(
-            "Y",
-            "real",
-            "continuous",
-            description="y coordinate in the reference frame",
+        self.register_state(
+            "Y", description="y coordinate in the reference frame", initial="calculated"
         )
 
-    def do_step(
-        self, current_time: float, step_size: float, no_prior_step: bool
-    ) -> Fmi2Status_T:
-
-        self.log_ok("Setting inputs.")
-        self.bicycle_model.Caf = lambda: self.Caf
-        self.bicycle_model.deltaf = lambda: self.deltaf
-
-        self.log_ok("Compute model derivative function.")
-        f = self.bicycle_model.derivatives()
-        self.log_ok("Compute state vector at start of step.")
-        x = self.bicycle_model.state_vector()
-
-        n_states = self.bicycle_model.nstates()
-
-        self.log_ok("Record current state in model history.")
-        self.bicycle_model.record_state(x, current_time)
-
-        self.log_ok("Invoking internal solver.")
-        stop_time = current_time + step_size
-        sol = solve_ivp(
-            f,
-            (current_time, stop_time),
-            x,
-            method=RK45,
-            max_step=step_size,
-            t_eval=[stop_time],
+        self.register_state(
+            "x", description="longitudinal displacement in the body frame"
+        )
+        self.register_state("y", description="lateral displacement in the body frame")
+        self.register_state("vx", description="velocity along x")
+        self.register_state("vy", description="velocity along y")
+        self.register_state("psi", description="yaw")
+        self.register_state("dpsi", description="yaw rate")
+
+    def derivatives(self, t, state):
+        X, Y, x, y, vx, vy, psi, dpsi = state
+
+        af = self.deltaf - (vy + self.lf * dpsi) / vx  # Front Tire slip angle
+        ar = (vy - self.lr * dpsi) / vx  # Rear Tire slip angle
+        # lateral tire forces at the front and rear tires in the frames of the tires
+        Fcf = self.Caf * af
+        Fcr = self.Car * (-ar)
+
+        return np.array(
+            [
+                vx * cos(psi) - vy * sin(psi),
+                vx * sin(psi) + vy * cos(psi),
+                vx,
+                vy,
+                dpsi * vy + self.a,
+                -dpsi * vx + (1 / self.m) * (Fcf * cos(self.deltaf) + Fcr),
+                dpsi,
+                (2 / self.Iz) * (self.lf * Fcf - self.lr * Fcr),
+            ]
         )
-        self.log_ok(f"Solution success: {sol.success}")
-        assert sol.success
-        assert sol.y.shape == (n_states, 1), (sol.y, sol.y.shape)
-
-        self.log_ok("Getting outputs from internal model.")
-        # Important to convert to float64.
-        # Otherwise COE will crash because the type of self.X is numpy.float64
-        self.X = float(self.bicycle_model.X())
-        self.Y = float(self.bicycle_model.Y())
-
-        return Fmi2Status.ok
 
     def reset(self) -> Fmi2Status_T:
         self.X = 0.0
         self.Y = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.vx = 1.0
+        self.vy = 0.0
+        self.psi = 0.0
+        self.dpsi = 0.0
         self.Caf = 800.0
         self.deltaf = 0.0
-        self.bicycle_model.reset()
-        return Fmi2Status.ok
+        return super().reset()
 
     def enter_initialization_mode(self) -> Fmi2Status_T:
         return Fmi2Status.ok
@@ -103,4 +93,4 @@ class BicycleDynamic(Fmi2Slave):
     def setup_experiment(
         self, start_time: float, stop_time: float = None, tolerance: float = None
     ) -> Fmi2Status_T:
-        return Fmi2Status.ok
+        return super().setup_experiment(start_time, stop_time, tolerance)
@@ -1,20 +1,26 @@
-from math import cos, sin, atan, tan
-
-from scipy.integrate import solve_ivp
-
+import numpy as np
 
 from pyfmu.fmi2 import (
-    Fmi2Slave,
+    Fmi2OdeSlave,
     Fmi2Status,
     Fmi2Status_T,
 )
 
 
-class Bicycle_Kinematic(Fmi2Slave):
+class Bicycle_Kinematic(Fmi2OdeSlave):
+
+    # variables may hold a value for each member of an ensemble, see Fmi2Ensemble
+    supports_ensembles = True
+
     def __init__(self, visible=False, logging_on=False, *args, **kwargs):
 
         super().__init__(
-            model_name="BicycleKinematic", author="", description="", *args, **kwargs
+            model_name="BicycleKinematic",
+            author="",
+            description="",
+            vectorized=True,
+            *args,
+            **kwargs
         )
 
         # silience incorrect warnings about undeclared variables
@@ -25,29 +31,17 @@ class Bicycle_Kinematic(Fmi2Slave):
         self.register_input("a", "real", "continuous", description="acceleration")
         self.register_input("df", "real", "continuous", description="steering angle")
 
-        self.register_output(
-            "x",
-            "real",
-            "continuous",
-            "calculated",
-            description="x position of the robot",
+        self.register_state(
+            "x", description="x position of the robot", initial="calculated"
         )
-        self.register_output(
-            "y",
-            "real",
-            "continuous",
-            "calculated",
-            description="y position of the robot",
+        self.register_state(
+            "y", description="y position of the robot", initial="calculated"
         )
-        self.register_output(
-            "psi",
-            "real",
-            "continuous",
-            "calculated",
-            description="inertial heading of the robot",
+        self.register_state(
+            "psi", description="inertial heading of the robot", initial="calculated"
         )
-        self.register_output(
-            "v", "real", "continuous", "calculated", description="velocity of the robot"
+        self.register_state(
+            "v", description="velocity of the robot", initial="calculated"
         )
 
         self.register_parameter(
@@ -89,22 +83,22 @@ class Bicycle_Kinematic(Fmi2Slave):
         self.y_r = 0.0
         self.psi_r = 0.0
         self.v_r = 0.0
-        return Fmi2Status.ok
+        return super().reset()
 
-    @staticmethod
-    def _derivatives(t, state, params):
-        df, a, lf, lr = params
+    def derivatives(self, t, state):
+        lf, lr = self.lf, self.lr
 
+        # the columns of the state hold the states when the jacobian is approximated
         _, _, psi, v = state
 
-        beta = atan((lr / (lr + lf)) * tan(df))
+        beta = np.arctan((lr / (lr + lf)) * np.tan(self.df))
 
-        x_d = v * cos(psi + beta)
-        y_d = v * sin(psi + beta)
-        psi_d = (v / lr) * sin(beta)
-        v_d = a
+        x_d = v * np.cos(psi + beta)
+        y_d = v * np.sin(psi + beta)
+        psi_d = v * (np.sin(beta) / lr)
+        v_d = 0.0 * v + self.a
 
-        return [x_d, y_d, psi_d, v_d]
+        return np.array([x_d, y_d, psi_d, v_d])
 
     def enter_initialization_mode(self):
         # outputs are have initial = calculated
@@ -114,33 +108,6 @@ class Bicycle_Kinematic(Fmi2Slave):
         self.v = self.v0
         return Fmi2Status.ok
 
-    def do_step(self, current_time: float, step_size: float, no_prior_step: bool):
-
-        # bundle the parameters in the function call
-        def fun(t, state):
-            params = (self.df, self.a, self.lf, self.lr)
-            return Bicycle_Kinematic._derivatives(t, state, params)
-
-        h0 = (self.x, self.y, self.psi, self.v)
-        end = current_time + step_size
-        t_span = (current_time, end)
-
-        res = solve_ivp(
-            fun,
-            t_span,
-            h0,
-            # max_step=0.1,
-            t_eval=[end],
-        )
-
-        x, y, psi, v = tuple(res.y)
-        self.x = x[0].item()
-        self.y = y[0].item()
-        self.psi = psi[0].item()
-        self.v = v[0].item()
-
-        return Fmi2Status.ok
-
 
 if __name__ == "__main__":
 
@@ -8,6 +8,10 @@ from pyfmu.fmi2 import (
 
 
 class ConstantSignalGenerator(Fmi2Slave):
+
+    # the outputs depend on the inputs and parameters alone, see Fmi2Slave.stateless
+    stateless = True
+
     def __init__(self, visible=False, logging_on=False, *args, **kwargs):
 
         super().__init__(
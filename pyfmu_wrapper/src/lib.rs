@@ -5,7 +5,7 @@ use num_enum::TryFromPrimitive;
 use pyo3::once_cell::GILOnceCell;
 use pyo3::prelude::*;
 use pyo3::types::PyDict;
-use pyo3::types::PyTuple;
+use pyo3::IntoPyPointer;
 use std::boxed::Box;
 use std::convert::TryFrom;
 use std::ffi::CStr;
@@ -380,34 +380,69 @@ fn call_parameterless_method(c: *const c_int, function: &str) -> c_int {
     }
 }
 
-fn get_xxx<T>(c: *const c_int, vr: *const c_uint, nvr: usize, values: *mut T) -> c_int
-where
-    T: for<'a> FromPyObject<'a>,
-{
-    let get_real = || -> Result<c_int, Error> {
-        let references = unsafe { std::slice::from_raw_parts(vr, nvr as usize) }.to_vec();
-        let h = unsafe { *c };
+// flags used to create memoryviews, see PyMemoryView_FromMemory
+const PYBUF_READ: c_int = 0x100;
+const PYBUF_WRITE: c_int = 0x200;
 
-        let gil = Python::acquire_gil();
-        let py = gil.python();
+/// Wraps memory owned by the caller of an FMI function in a memoryview, allowing Python to access it without copying.
+///
+/// ## Safety
+///
+/// The view refers directly to the caller's memory, as such it must be released before the FMI function returns.
+unsafe fn memoryview<T>(
+    py: Python,
+    ptr: *const T,
+    len: usize,
+    writable: bool,
+) -> Result<PyObject, Error> {
+    let flags = if writable { PYBUF_WRITE } else { PYBUF_READ };
+    let size = (len * mem::size_of::<T>()) as pyo3::ffi::Py_ssize_t;
+    PyObject::from_owned_ptr_or_err(
+        py,
+        pyo3::ffi::PyMemoryView_FromMemory(ptr as *mut c_char, size, flags),
+    )
+    .map_pyerr(py)
+}
 
-        // TODO replace with "map_error"
-        let (values_vec, status): (Vec<T>, c_int) = get_slave_manager(py)
-            .call_method1("get_xxx", (h, references))
-            .map_pyerr(py)?
-            .extract()
-            .map_pyerr(py)?;
+/// Invoke a method of the slave manager which exchanges values through views of the caller's buffers.
+///
+/// The views are released once the call returns, regardless of its outcome.
+fn call_with_buffers<T>(
+    function: &str,
+    c: *const c_int,
+    vr: *const c_uint,
+    nvr: usize,
+    values: *const T,
+    writable: bool,
+) -> Result<c_int, Error> {
+    let h = unsafe { *c };
 
-        unsafe {
-            std::ptr::copy(values_vec.as_ptr(), values, nvr);
-        }
+    let gil = Python::acquire_gil();
+    let py = gil.python();
 
-        Fmi2Status::try_from(status)?;
+    let references = unsafe { memoryview(py, vr, nvr, false)? };
+    let values = unsafe { memoryview(py, values, nvr, writable)? };
 
-        Ok(status)
-    };
+    let result = get_slave_manager(py).call_method1(
+        function,
+        (h, references.clone_ref(py), values.clone_ref(py)),
+    );
+
+    references.call_method0(py, "release").map_pyerr(py)?;
+    values.call_method0(py, "release").map_pyerr(py)?;
 
-    match get_real() {
+    let status: c_int = result.map_pyerr(py)?.extract().map_pyerr(py)?;
+
+    Fmi2Status::try_from(status)?;
+
+    Ok(status)
+}
+
+/// Read variables of a primitive type directly into the buffer provided by the caller.
+///
+/// The slave manager writes the values into a view of the buffer, rather than returning them one Python object at a time.
+fn get_xxx<T>(c: *const c_int, vr: *const c_uint, nvr: usize, values: *mut T) -> c_int {
+    match call_with_buffers("get_xxx_buffer", c, vr, nvr, values as *const T, true) {
         Ok(s) => s,
         Err(e) => {
             println!("{}", e);
@@ -531,32 +566,9 @@ pub extern "C" fn fmi2GetString(
     }
 }
 
-fn set_xxx<T>(c: *const c_int, vr: *const c_uint, nvr: usize, values: *const T) -> c_int
-where
-    T: for<'a> FromPyObject<'a> + Clone + std::fmt::Debug,
-    (c_int, Vec<c_uint>, Vec<T>): IntoPy<Py<PyTuple>>,
-{
-    let set_xxx = || -> Result<c_int, Error> {
-        let references = unsafe { std::slice::from_raw_parts(vr, nvr).to_vec() };
-        let values = unsafe { std::slice::from_raw_parts(values, nvr).to_vec() };
-        let h = unsafe { *c };
-
-        let gil = Python::acquire_gil();
-        let py = gil.python();
-
-        // TODO replace with ?
-        let status: c_int = get_slave_manager(py)
-            .call_method1("set_xxx", (h, references, values))
-            .map_pyerr(py)?
-            .extract()
-            .map_pyerr(py)?;
-
-        Fmi2Status::try_from(status)?;
-
-        Ok(status)
-    };
-
-    match set_xxx() {
+/// Set variables of a primitive type directly from the buffer provided by the caller.
+fn set_xxx<T>(c: *const c_int, vr: *const c_uint, nvr: usize, values: *const T) -> c_int {
+    match call_with_buffers("set_xxx_buffer", c, vr, nvr, values, false) {
         Ok(s) => s,
         Err(e) => {
             println!("{}", e);
@@ -595,7 +607,7 @@ pub extern "C" fn fmi2SetBoolean(
     nvr: usize,
     values: *const c_int,
 ) -> c_int {
-    set_xxx(c, vr, nvr, values as *mut bool)
+    set_xxx(c, vr, nvr, values)
 }
 
 /// Set string variables of an FMU
@@ -663,11 +675,36 @@ impl<T> PyErrToErr<T> for PyResult<T> {
     }
 }
 
+/// Release a state previously captured by fmi2GetFMUstate or created by fmi2DeSerializeFMUstate.
+///
+/// States are Python objects, the reference owned by the environment is released and the pointer set to null.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
-pub extern "C" fn fmi2FreeFMUstate(c: *const c_int) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2OK.into()
+#[allow(non_snake_case)]
+pub extern "C" fn fmi2FreeFMUstate(c: *const c_int, state: *mut *mut c_void) -> c_int {
+    let free_state = || -> Result<c_int, Error> {
+        if state.is_null() || unsafe { (*state).is_null() } {
+            return Ok(Fmi2Status::Fmi2OK.into());
+        }
+
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        // take ownership of the reference held by the environment, releasing it when dropped
+        let obj = unsafe { PyObject::from_owned_ptr(py, *state as *mut pyo3::ffi::PyObject) };
+        unsafe { *state = null_mut() };
+
+        let status: c_int = get_slave_manager(py)
+            .call_method1("free_fmu_state", (h, obj))
+            .map_pyerr(py)?
+            .extract()
+            .map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+        Ok(status)
+    };
+
+    report_status("fmi2FreeFMUstate", free_state())
 }
 
 #[no_mangle]
@@ -741,11 +778,30 @@ pub extern "C" fn fmi2Instantiate(
     }
 }
 
+/// Restore the FMU to a state previously captured by fmi2GetFMUstate or created by fmi2DeSerializeFMUstate.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
-pub extern "C" fn fmi2SetFMUstate(c: *const c_int, state: *const c_void) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2Error.into()
+#[allow(non_snake_case)]
+pub extern "C" fn fmi2SetFMUstate(c: *const c_int, state: *mut c_void) -> c_int {
+    let set_state = || -> Result<c_int, Error> {
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        if state.is_null() {
+            return Err(anyhow::anyhow!("the state may not be null"));
+        }
+
+        let status: c_int = get_slave_manager(py)
+            .call_method1("set_fmu_state", (h, unsafe { state_object(py, state) }))
+            .map_pyerr(py)?
+            .extract()
+            .map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+        Ok(status)
+    };
+
+    report_status("fmi2SetFMUstate", set_state())
 }
 
 #[no_mangle]
@@ -763,42 +819,185 @@ pub extern "C" fn fmi2GetDirectionalDerivative(
     Fmi2Status::Fmi2Error.into()
 }
 
+/// Capture the state of the FMU.
+///
+/// If the state points to null a new state is allocated, otherwise the existing state is overwritten **(2.1.8 p.25)**.
+/// The state is a Python object, for which the environment holds a reference until it is freed by fmi2FreeFMUstate.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
+#[allow(non_snake_case)]
 pub extern "C" fn fmi2GetFMUstate(c: *const c_int, state: *mut *mut c_void) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2Error.into()
+    let get_state = || -> Result<c_int, Error> {
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        let previous = unsafe {
+            if (*state).is_null() {
+                py.None()
+            } else {
+                state_object(py, *state)
+            }
+        };
+
+        let (captured, status): (PyObject, c_int) = get_slave_manager(py)
+            .call_method1("get_fmu_state", (h, previous))
+            .map_pyerr(py)?
+            .extract()
+            .map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+
+        // the existing state is updated in place, as such only newly allocated states are handed to the environment
+        if unsafe { (*state).is_null() } && !captured.is_none() {
+            unsafe { *state = captured.into_ptr() as *mut c_void };
+        }
+
+        Ok(status)
+    };
+
+    report_status("fmi2GetFMUstate", get_state())
 }
 
+/// Serialize the state into the buffer provided by the environment, its size is given by fmi2SerializedFMUstateSize.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
+#[allow(non_snake_case)]
 pub extern "C" fn fmi2SerializeFMUstate(
     c: *const c_int,
     state: *mut c_void,
-    data: *const c_char,
+    data: *mut c_char,
     size: usize,
 ) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2Error.into()
+    let serialize = || -> Result<c_int, Error> {
+        if state.is_null() {
+            return Err(anyhow::anyhow!("the state may not be null"));
+        }
+
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        let view = unsafe { memoryview(py, data as *const c_char, size, true)? };
+
+        let result = get_slave_manager(py).call_method1(
+            "serialize_fmu_state",
+            (h, unsafe { state_object(py, state) }, view.clone_ref(py)),
+        );
+
+        view.call_method0(py, "release").map_pyerr(py)?;
+
+        let status: c_int = result.map_pyerr(py)?.extract().map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+        Ok(status)
+    };
+
+    ffi_panic_boundary! {
+        report_status("fmi2SerializeFMUstate", serialize())
+    }
 }
 
+/// Create a state from its serialized representation.
+///
+/// If the state points to an existing state, this is released and replaced by the deserialized state.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
+#[allow(non_snake_case)]
 pub extern "C" fn fmi2DeSerializeFMUstate(
     c: *const c_int,
     serialized_state: *const c_char,
     size: usize,
-    state: *mut c_void,
+    state: *mut *mut c_void,
 ) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2Error.into()
+    let deserialize = || -> Result<c_int, Error> {
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        let view = unsafe { memoryview(py, serialized_state, size, false)? };
+
+        let result = get_slave_manager(py)
+            .call_method1("deserialize_fmu_state", (h, view.clone_ref(py)));
+
+        view.call_method0(py, "release").map_pyerr(py)?;
+
+        let (deserialized, status): (PyObject, c_int) =
+            result.map_pyerr(py)?.extract().map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+
+        if !deserialized.is_none() {
+            unsafe {
+                if !(*state).is_null() {
+                    drop(PyObject::from_owned_ptr(
+                        py,
+                        *state as *mut pyo3::ffi::PyObject,
+                    ));
+                }
+                *state = deserialized.into_ptr() as *mut c_void;
+            }
+        }
+
+        Ok(status)
+    };
+
+    report_status("fmi2DeSerializeFMUstate", deserialize())
 }
 
+/// Returns the size of the serialized state in bytes.
+///
+/// The serialized representation is cached by the state, as such the subsequent call to fmi2SerializeFMUstate does not serialize it again.
 #[no_mangle]
-#[allow(non_snake_case, unused_variables)]
-pub extern "C" fn fmi2SerializedFMUstateSize(c: *const c_int, state: *mut *mut c_void) -> c_int {
-    println!("NOT IMPLEMENTED");
-    Fmi2Status::Fmi2Error.into()
+#[allow(non_snake_case)]
+pub extern "C" fn fmi2SerializedFMUstateSize(
+    c: *const c_int,
+    state: *mut c_void,
+    size: *mut usize,
+) -> c_int {
+    let serialized_size = || -> Result<c_int, Error> {
+        if state.is_null() {
+            return Err(anyhow::anyhow!("the state may not be null"));
+        }
+
+        if size.is_null() {
+            return Err(anyhow::anyhow!("the size may not be null"));
+        }
+
+        let h = unsafe { *c };
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        let (n, status): (usize, c_int) = get_slave_manager(py)
+            .call_method1(
+                "serialized_fmu_state_size",
+                (h, unsafe { state_object(py, state) }),
+            )
+            .map_pyerr(py)?
+            .extract()
+            .map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+        unsafe { *size = n };
+        Ok(status)
+    };
+
+    ffi_panic_boundary! {
+        report_status("fmi2SerializedFMUstateSize", serialized_size())
+    }
+}
+
+/// Borrow the Python object referred to by a FMU state pointer.
+unsafe fn state_object(py: Python, state: *mut c_void) -> PyObject {
+    PyObject::from_borrowed_ptr(py, state as *mut pyo3::ffi::PyObject)
+}
+
+/// Convert the result of a call to the slave manager to a status code, printing the error if any.
+fn report_status(function: &str, result: Result<c_int, Error>) -> c_int {
+    match result {
+        Ok(s) => s,
+        Err(e) => {
+            println!("{} failed due to error: {}", function, e);
+            Fmi2Status::Fmi2Error.into()
+        }
+    }
 }
 
 #[no_mangle]
@@ -908,6 +1107,78 @@ pub extern "C" fn fmi2DoStep(
     }
 }
 
+/// Set real inputs, perform a step and read real outputs of the FMU using a single call.
+///
+/// This is not part of the FMI2 interface, it is an extension which allows masters that are aware of it,
+/// such as an in-process Python master using ctypes, to exchange values for an entire communication step
+/// acquiring the GIL and dispatching to the slave manager only once.
+///
+/// The semantics are those of calling fmi2SetReal, fmi2DoStep and fmi2GetReal in sequence.
+#[no_mangle]
+#[allow(non_snake_case)]
+pub extern "C" fn pyfmuStepExchange(
+    c: *const c_int,
+    set_vr: *const c_uint,
+    n_set: usize,
+    set_values: *const c_double,
+    current_communication_point: c_double,
+    communication_step_size: c_double,
+    no_set_fmu_state_prior_to_current_point: c_int,
+    get_vr: *const c_uint,
+    n_get: usize,
+    get_values: *mut c_double,
+) -> c_int {
+    let step_exchange = || -> Result<c_int, Error> {
+        let h = unsafe { *c };
+
+        let gil = Python::acquire_gil();
+        let py = gil.python();
+
+        let views = unsafe {
+            [
+                memoryview(py, set_vr, n_set, false)?,
+                memoryview(py, set_values, n_set, false)?,
+                memoryview(py, get_vr, n_get, false)?,
+                memoryview(py, get_values as *const c_double, n_get, true)?,
+            ]
+        };
+
+        let result = get_slave_manager(py).call_method1(
+            "step_exchange_buffer",
+            (
+                h,
+                views[0].clone_ref(py),
+                views[1].clone_ref(py),
+                current_communication_point,
+                communication_step_size,
+                no_set_fmu_state_prior_to_current_point != 0,
+                views[2].clone_ref(py),
+                views[3].clone_ref(py),
+            ),
+        );
+
+        for view in views.iter() {
+            view.call_method0(py, "release").map_pyerr(py)?;
+        }
+
+        let status: c_int = result.map_pyerr(py)?.extract().map_pyerr(py)?;
+
+        Fmi2Status::try_from(status)?;
+
+        Ok(status)
+    };
+
+    ffi_panic_boundary! {
+        match step_exchange() {
+            Ok(s) => s,
+            Err(e) => {
+                println!("Step exchange failed due to error: {}", e);
+                Fmi2Status::Fmi2Error.into()
+            }
+        }
+    }
+}
+
 /// Disposes the specified FMU instance and free all allocated memory.
 ///
 /// **This should not be confused with terminate**
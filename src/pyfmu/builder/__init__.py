@@ -20,7 +20,12 @@ from pyfmu.builder.generate import (  # noqa: F401
 
 from pyfmu.builder.validate import validate_fmu, validate_project  # noqa: F401
 
+from pyfmu.builder.cache import ExportCache, ValidationCache  # noqa: F401
+
 from pyfmu.builder.export import (  # noqa: F401
     PyfmuArchive,
+    ExportResult,
     export_project,
+    export_projects,
+    format_export_summary,
 )
@@ -0,0 +1,243 @@
+"""Defines content-addressed caches of build artifacts, used to skip exporting and validating FMUs which have not changed."""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from shutil import copy2, copytree, rmtree
+from tempfile import mkdtemp, mkstemp
+from typing import Iterable, List, Optional
+
+from pyfmu.types import AnyPath
+
+logger = logging.getLogger(__name__)
+
+# files produced by the interpreter, which do not influence the exported FMU
+_ignored_names = {"__pycache__"}
+_ignored_suffixes = {".pyc"}
+
+
+def pyfmu_version() -> str:
+    """Returns the version of the installed pyfmu package."""
+    try:
+        from importlib.metadata import version
+
+        return version("pyfmu")
+    except Exception:
+        return "unknown"
+
+
+def default_cache_dir() -> Path:
+    """Returns the directory in which artifacts are cached.
+
+    This is defined by the environment variable PYFMU_CACHE_DIR, or defaults to ~/.cache/pyfmu.
+    """
+    return Path(
+        os.environ.get("PYFMU_CACHE_DIR", Path.home() / ".cache" / "pyfmu")
+    )
+
+
+def _files(root: Path) -> Iterable[Path]:
+    """Yields the files of a directory tree in a deterministic order."""
+    for path in sorted(root.rglob("*")):
+        if any(p in _ignored_names for p in path.relative_to(root).parts):
+            continue
+        if path.is_file() and path.suffix not in _ignored_suffixes:
+            yield path
+
+
+def hash_tree(digest, root: AnyPath) -> None:
+    """Update the digest with the relative paths and contents of every file in a directory tree."""
+    root = Path(root)
+
+    for path in _files(root):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+
+
+def hash_file(path: AnyPath) -> str:
+    """Returns the sha256 of a file, or of every file in a directory if the path is a directory."""
+    path = Path(path)
+    digest = hashlib.sha256()
+
+    if path.is_dir():
+        hash_tree(digest, path)
+    else:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def hash_export(resources_dir: AnyPath, configuration: dict, *variant: str) -> str:
+    """Returns a hash of everything which influences the export of a project.
+
+    Args:
+        resources_dir: the resources directory of the project.
+        configuration: the slave configuration written to the archive.
+        variant: additional values which influence the export, such as the compression settings.
+    """
+    from pyfmu.resources import Resources
+
+    digest = hashlib.sha256()
+    digest.update(pyfmu_version().encode())
+    digest.update(json.dumps(configuration, sort_keys=True).encode())
+    digest.update(json.dumps(variant).encode())
+    hash_tree(digest, resources_dir)
+    hash_tree(digest, Resources.get().binaries_dir)
+    return digest.hexdigest()
+
+
+def _ignore_files(directory: str, names: List[str]) -> List[str]:
+    """Returns the names of the files produced by the interpreter, for use as the ignore argument of copytree."""
+    return [
+        n for n in names if n in _ignored_names or Path(n).suffix in _ignored_suffixes
+    ]
+
+
+def link_or_copy(src: AnyPath, dst: AnyPath) -> None:
+    """Create a hard link to the file, falling back to copying if linking is not possible, e.g. across file systems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy2(src, dst)
+
+
+class ExportCache:
+    """Cache of exported FMUs keyed on a hash of everything which influences the export.
+
+    The key is computed from the project's resources, including the slave script, its configuration,
+    the wrapper binaries and the version of pyfmu. On a hit the cached FMU is hard-linked into
+    the output path rather than exported again.
+
+    .. warning::
+        Since files are hard-linked, modifying the files of an exported FMU in place also modifies the cached copy.
+    """
+
+    def __init__(self, cache_dir: AnyPath = None):
+        self.root = Path(cache_dir if cache_dir else default_cache_dir()) / "exports"
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, resources_dir: AnyPath, configuration: dict, *variant: str) -> str:
+        """Compute the key of an export of a project, see hash_export."""
+        return hash_export(resources_dir, configuration, *variant)
+
+    def fetch(self, key: str, output_path: AnyPath) -> bool:
+        """Link the cached export into the output path, if it exists.
+
+        Returns:
+            true on a hit, false on a miss.
+        """
+        entry = self.root / key
+
+        if not entry.exists():
+            self.misses += 1
+            logger.info(f"Export cache miss for key {key}")
+            return False
+
+        output_path = Path(output_path)
+
+        if entry.is_dir():
+            copytree(entry, output_path, copy_function=link_or_copy)
+        else:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(entry, output_path)
+
+        self.hits += 1
+        logger.info(f"Export cache hit for key {key}, linked {entry} to {output_path}")
+        return True
+
+    def store(self, key: str, path: AnyPath) -> None:
+        """Add an exported FMU, either a directory or an archive, to the cache."""
+        path = Path(path)
+        entry = self.root / key
+
+        if entry.exists():
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # populate a temporary entry which is renamed atomically, such that concurrent exports never observe partial entries
+        tmp = Path(mkdtemp(dir=self.root, prefix=".tmp-"))
+        try:
+            staged = tmp / "entry"
+            if path.is_dir():
+                copytree(path, staged, copy_function=link_or_copy)
+            else:
+                link_or_copy(path, staged)
+            os.replace(staged, entry)
+        except OSError:
+            # another process stored the same entry first
+            if not entry.exists():
+                raise
+        finally:
+            rmtree(tmp, ignore_errors=True)
+
+    def summary(self) -> str:
+        return f"export cache hits: {self.hits}, misses: {self.misses}"
+
+
+class ValidationCache:
+    """Cache of the results of validating FMUs, keyed on a hash of the FMU and the version of the validation tool.
+
+    Each entry holds the outcome reported by a single tool, such that an unchanged FMU is only validated
+    again by the tools which have changed.
+    """
+
+    def __init__(self, cache_dir: AnyPath = None):
+        self.root = (
+            Path(cache_dir if cache_dir else default_cache_dir()) / "validation"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, fmu_hash: str, tool: str, tool_version: str) -> str:
+        """Compute the key of the result of validating an FMU with a tool.
+
+        Args:
+            fmu_hash: hash of the FMU, see hash_file.
+            tool: name of the tool.
+            tool_version: identifies the version of the tool.
+        """
+        digest = hashlib.sha256()
+        for part in (fmu_hash, tool, tool_version):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def fetch(self, key: str) -> Optional[dict]:
+        """Returns the cached result, or None on a miss."""
+        entry = self.root / f"{key}.json"
+
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return result
+
+    def store(self, key: str, result: dict) -> None:
+        """Add the result of a validation to the cache."""
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = mkstemp(dir=self.root, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp, self.root / f"{key}.json")
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def summary(self) -> str:
+        return f"validation cache hits: {self.hits}, misses: {self.misses}"
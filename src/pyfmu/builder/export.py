@@ -1,26 +1,39 @@
 import importlib
 import json
 import logging
+import os
+import py_compile
 import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from importlib.util import module_from_spec, spec_from_file_location
 import datetime
 from pathlib import Path
-from shutil import copytree, rmtree
-from tempfile import TemporaryDirectory
-from typing import Union
+from shutil import copyfileobj, copytree, rmtree
+from tempfile import TemporaryDirectory, mkdtemp, mkstemp
+from time import perf_counter
+from traceback import format_exc
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+from uuid import NAMESPACE_URL, uuid5
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 
 import lxml.etree as ET
 
 from pyfmu.builder import PyfmuProject
+from pyfmu.builder.cache import ExportCache, _files, _ignore_files, hash_export
 from pyfmu.resources import Resources
 from pyfmu.types import AnyPath
-from pyfmu.fmi2.types import Fmi2SlaveLike
+from pyfmu.fmi2.types import Fmi2ScalarVariable, Fmi2SlaveLike, Fmi2Value_T
 
 
 # from pyfmu.builder.utils import DisplayablePath
 
 logger = logging.getLogger(__name__)
 
+# earliest time which can be represented in a zip archive, 1980-01-01
+_zip_epoch = 315532800
+
 
 class PyfmuArchive:
     """Object representation of exported Python FMU.
@@ -51,6 +64,9 @@ class PyfmuArchive:
         self.slave_class = slave_class
         self.slave_configuration = None
 
+        # whether the archive was reused from the export cache, None if no cache was used
+        self.cache_hit: Optional[bool] = None
+
         # paths
         self.root = Path(root)
         self.resources_dir = Path(resources_dir)
@@ -62,17 +78,40 @@ class PyfmuArchive:
         self.wrapper_linux64 = Path(wrapper_linux64)
 
 
-def extract_model_description(slave: Fmi2SlaveLike) -> bytes:
+def _current_value(slave: Fmi2SlaveLike, var: Fmi2ScalarVariable) -> Fmi2Value_T:
+    """Returns the value of a variable, reading it from the array storage of the slave if kept there.
+
+    The elements of array variables, such as u[1], are not attributes of the slave and are only found there.
+    """
+    get_value_location = getattr(slave, "get_value_location", None)
+    location = get_value_location(var.value_reference) if get_value_location else None
+
+    if location is None:
+        return getattr(slave, var.name)
+
+    values, offset = location
+    return bool(values[offset]) if var.data_type == "boolean" else values[offset]
+
+
+def extract_model_description(
+    slave: Fmi2SlaveLike, generation_time: datetime.datetime = None
+) -> bytes:
     """Extract model description from an instance of a FMI2 slave.
 
     Scalar variables are generated by iterating over the slaves variables attribute.
     For variables which must define a start value, such as inputs, exact outputs, this is
     determined by accessing the attributes of the slave.
+
+    Args:
+        slave: the slave.
+        generation_time: the time written as the generation time of the model description, defaults to the current time.
     """
 
     # 2.2.1 p.29) Structure
 
-    data_time_obj = datetime.datetime.now()
+    data_time_obj = (
+        generation_time if generation_time is not None else datetime.datetime.now()
+    )
     date_str_xsd = datetime.datetime.strftime(data_time_obj, "%Y-%m-%dT%H:%M:%SZ")
 
     fmd = ET.Element("fmiModelDescription")
@@ -81,7 +120,10 @@ def extract_model_description(slave: Fmi2SlaveLike) -> bytes:
     fmd.set("guid", slave.guid)
     fmd.set("author", slave.author)
     fmd.set("generationDateAndTime", date_str_xsd)
-    fmd.set("variableNamingConvention", "flat")
+    fmd.set(
+        "variableNamingConvention",
+        getattr(slave, "variable_naming_convention", "flat"),
+    )
     fmd.set("generationTool", "pyfmu")
 
     #
@@ -90,6 +132,8 @@ def extract_model_description(slave: Fmi2SlaveLike) -> bytes:
     cs.set("needsExecutionTool", "true")
     cs.set("canNotUseMemoryManagementFunctions", "false")
     cs.set("canHandleVariableCommunicationStepSize", "true")
+    cs.set("canGetAndSetFMUstate", "true")
+    cs.set("canSerializeFMUstate", "true")
 
     # 2.2.4 p.42) Log categories:
     cs = ET.SubElement(fmd, "LogCategories")
@@ -133,7 +177,7 @@ def extract_model_description(slave: Fmi2SlaveLike) -> bytes:
         # 2.2.7. p.48) start values
         if var.initial in {"exact", "approx"} or var.causality == "input":
             start = str(
-                getattr(slave, var.name)
+                _current_value(slave, var)
             ).lower()  # lower maps from python uppercase True to fmi2 true.
             val.set("start", start)
 
@@ -175,108 +219,499 @@ def export_project(
     output_path: AnyPath,
     compress: bool,
     overwrite=True,
+    cache: ExportCache = None,
+    compresslevel: int = 6,
+    precompile: bool = False,
 ) -> PyfmuArchive:
-
-    if compress:
-        raise NotImplementedError()
+    """Export a project as an FMU.
+
+    The model description is extracted from the slave before anything is written, after which the resources,
+    the binaries and the model description are written to the output path in a single pass.
+    The FMU is first written next to the output path and then renamed, such that the output path never holds a partially written FMU.
+    Unless the slave assigns its own, the GUID is derived from the contents of the project, see *hash_export*,
+    such that exporting an unchanged project with the same SOURCE_DATE_EPOCH yields an identical FMU.
+
+    Args:
+        project_or_path: the project or the path to it.
+        output_path: path to which the FMU is written.
+        compress: if true the FMU is written as a zip archive, otherwise as a directory.
+        overwrite: allow existing files at the output path to be overwritten. Defaults to True.
+        cache: if provided, the export is reused from the cache if neither the project, the wrapper
+            nor pyfmu has changed since it was last exported, see *ExportCache*.
+        compresslevel: the level of compression used for compressed archives, from 0 (none) to 9 (best).
+        precompile: if true the scripts of the resources are compiled to bytecode, which is placed in
+            the __pycache__ directories of the resources. This spares the interpreter loading the FMU from
+            compiling the scripts, provided that its version matches that of the interpreter running the export.
+    """
 
     output_path = Path(output_path)
     assert isinstance(output_path, Path)
 
-    if overwrite and output_path.is_dir():
-        logger.debug(f"Erasing existing directory {output_path}")
-        rmtree(path=output_path)
+    if not 0 <= compresslevel <= 9:
+        raise ValueError(
+            f"The compression level must be between 0 and 9, got {compresslevel}"
+        )
+
+    if output_path.exists():
+        if not overwrite:
+            raise FileExistsError(
+                f"Unable to export project, the output path {output_path} already exists"
+            )
+        logger.debug(f"Erasing existing FMU {output_path}")
+        if output_path.is_dir():
+            rmtree(path=output_path)
+        else:
+            output_path.unlink()
 
     if not isinstance(project_or_path, PyfmuProject):
         project = PyfmuProject.from_existing(project_or_path)
     else:
         project: PyfmuProject = project_or_path
 
-    logger.debug(
-        "Creating temporary directory for archive used to store files until the archive is finalized"
-    )
-    with TemporaryDirectory() as tmpdir:
+    slave_configuration = {
+        **project.project_configuration,
+        "slave_class": project.slave_class,
+        "slave_script": project.slave_script,
+    }
+
+    if cache is not None:
+        variant = ("zip", str(compresslevel)) if compress else ()
+        if precompile:
+            variant += ("bytecode", sys.implementation.cache_tag)
+        key = cache.key(project.resources_dir, slave_configuration, *variant)
+
+        if cache.fetch(key, output_path):
+            if compress:
+                with ZipFile(output_path) as zf:
+                    model_description = zf.read("modelDescription.xml")
+            else:
+                model_description = (output_path / "modelDescription.xml").read_bytes()
+
+            archive = _create_archive(
+                output_path, project, model_description.decode("utf-8")
+            )
+            archive.cache_hit = True
+            return archive
 
-        # create directories
-        tmpdir = Path(tmpdir)
+    # the GUID is derived from the contents of the project, such that exporting it again yields the same FMU
+    content_hash = hash_export(project.resources_dir, slave_configuration)
+    guid = str(uuid5(NAMESPACE_URL, f"pyfmu:{content_hash}"))
+    model_description = _extract_project_model_description(project, guid)
+    configuration = json.dumps(slave_configuration).encode("utf-8")
+    binaries_dir = Resources.get().binaries_dir
 
-        # copy resources
-        archive_resources_path = tmpdir / "resources"
-        logger.debug(
-            f"Copying projects resource directory {project.resources_dir} to archive resources {archive_resources_path}"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if compress:
+        logger.debug(f"Writing archive {output_path}")
+        _write_zip(
+            output_path,
+            project.resources_dir,
+            configuration,
+            binaries_dir,
+            model_description,
+            compresslevel,
+            precompile,
         )
-        copytree(
-            src=project.resources_dir, dst=archive_resources_path,
+    else:
+        logger.debug(f"Writing archive directory {output_path}")
+        _write_directory(
+            output_path,
+            project.resources_dir,
+            configuration,
+            binaries_dir,
+            model_description,
+            precompile,
         )
 
-        # slave configuration
-        config_path = tmpdir / "resources" / "slave_configuration.json"
-        logger.debug(f"Writing slave configuration to {config_path}")
-        with open(config_path, "w") as config:
-            json.dump(
-                obj={
-                    "slave_class": project.slave_class,
-                    "slave_script": project.slave_script,
-                },
-                fp=config,
-            )
+    archive = _create_archive(
+        output_path, project, model_description.decode("utf-8")
+    )
 
-        # copy-binaries
-        binaries_dir = Resources.get().binaries_dir
-        archive_binaries_dir = tmpdir / "binaries"
-        logger.debug(
-            f"copying binaries form {binaries_dir} to archive binaries {archive_binaries_dir}"
-        )
-        copytree(src=binaries_dir, dst=archive_binaries_dir)
+    if cache is not None:
+        cache.store(key, output_path)
+        archive.cache_hit = False
 
-        # Instantiate slave
-        """
-        Extract model description by creating an instance of the main class
-        https://docs.python.org/3/library/importlib.html?highlight=import_module#importing-a-source-file-directly
-        """
-        # try:
-        module = project.slave_script_path.stem
-        logger.debug(
-            f"Importing module {module} defined by {project.slave_script} which defines slave class {project.slave_class}"
-        )
-        sys.path.append(project.slave_script_path.parent.__fspath__())
+    return archive
+
+
+def _source_date_epoch() -> Optional[int]:
+    """Returns the time defined by the SOURCE_DATE_EPOCH environment variable, used to produce reproducible builds."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    return int(epoch) if epoch else None
+
+
+def _extract_project_model_description(project: PyfmuProject, guid: str) -> bytes:
+    """Extract the model description by creating an instance of the slave class of the project.
+
+    The GUID is written to the model description, unless the slave assigns one of its own.
+
+    https://docs.python.org/3/library/importlib.html?highlight=import_module#importing-a-source-file-directly
+    """
+    module = project.slave_script_path.stem
+    logger.debug(
+        f"Importing module {module} defined by {project.slave_script} which defines slave class {project.slave_class}"
+    )
+    sys.path.append(project.slave_script_path.parent.__fspath__())
+    try:
         spec = spec_from_file_location(module, project.slave_script_path)
         module = module_from_spec(spec)
-        spec.loader.exec_module(module)  # TODO consider supressing if false positive.
-        sys.path.pop()  # TODO may mess up in case of exception
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(project.slave_script_path.parent.__fspath__())
+
+    logger.debug("Module loaded, creating instance of slave")
+    slave = getattr(module, project.slave_class)()
+
+    if getattr(slave, "_guid", guid) is None:
+        slave.guid = guid
+
+    epoch = _source_date_epoch()
+    generation_time = (
+        datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc)
+        if epoch is not None
+        else None
+    )
+
+    logger.debug("Slave instantiated, extracting model description")
+    return extract_model_description(slave, generation_time)
 
-        logger.debug("Module loaded, creating instance of slave")
-        slave = getattr(module, project.slave_class)()
 
-        # except Exception as e:
-        #     raise RuntimeError(
-        #         "Extracting model description from slave failed, an exception was raised during loading and instantiation of the slave"
-        #     ) from e
+def _compile_resources(
+    resources_dir: Path, output_dir: Path
+) -> List[Tuple[str, Path]]:
+    """Compile the scripts of the resources into bytecode files written to the output directory.
 
-        # extract model description
-        archive_md_path = tmpdir / "modelDescription.xml"
-        logger.debug(
-            f"Slave instantiated, extracting model description and writing to {archive_md_path}"
+    Checked hash-based bytecode is used, which remains valid regardless of the timestamps given to the scripts
+    when the FMU is extracted, and which is ignored by the interpreter if a script is modified after the export.
+
+    Returns:
+        the path of each bytecode file relative to the resources directory and the path to which it was written.
+    """
+    cache_tag = sys.implementation.cache_tag
+    if cache_tag is None:
+        raise RuntimeError(
+            "Unable to precompile the resources, the interpreter does not cache bytecode"
         )
-        model_description = extract_model_description(slave)
-        with open(archive_md_path, "wb") as md:
-            md.write(model_description)
 
-        logger.debug(
-            f"Copying temporary archive {tmpdir} to output path {output_path} "
+    compiled = []
+    for path in _files(resources_dir):
+        if path.suffix != ".py":
+            continue
+
+        source = path.relative_to(resources_dir)
+        pyc = source.parent / "__pycache__" / f"{source.stem}.{cache_tag}.pyc"
+        name = pyc.as_posix()
+        py_compile.compile(
+            str(path),
+            cfile=str(output_dir / name),
+            dfile=source.as_posix(),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
         )
-        copytree(tmpdir, output_path)
-
-        return PyfmuArchive(
-            root=output_path,
-            resources_dir=output_path / "resources",
-            slave_configuration_path=output_path / "resources" / "configuration",
-            binaries_dir=output_path / "binaries",
-            wrapper_linux64=output_path / "binaries" / "linux64",
-            wrapper_win64=output_path / "binaries" / "win64",
-            slave_script_path=output_path / "resources" / project.slave_script,
-            model_description=model_description.decode("utf-8"),
-            model_description_path=output_path / "modelDescription.xml",
-            slave_script=project.slave_script,
-            slave_class=project.slave_class,
+        compiled.append((name, output_dir / name))
+
+    return compiled
+
+
+def _write_directory(
+    output_path: Path,
+    resources_dir: Path,
+    configuration: bytes,
+    binaries_dir: Path,
+    model_description: bytes,
+    precompile: bool,
+) -> None:
+    """Write the FMU as a directory, which is populated next to the output path and renamed once complete."""
+
+    staging = Path(
+        mkdtemp(dir=output_path.parent, prefix=f".{output_path.name}.tmp-")
+    )
+    try:
+        copytree(
+            src=resources_dir, dst=staging / "resources", ignore=_ignore_files
         )
+        (staging / "resources" / "slave_configuration.json").write_bytes(
+            configuration
+        )
+        if precompile:
+            _compile_resources(resources_dir, staging / "resources")
+        copytree(src=binaries_dir, dst=staging / "binaries")
+        (staging / "modelDescription.xml").write_bytes(model_description)
+        staging.chmod(0o755)
+        os.replace(staging, output_path)
+    finally:
+        rmtree(staging, ignore_errors=True)
+
+
+# files which are compressed already, and thus stored in the archive as is
+_compressed_suffixes = {
+    ".zip",
+    ".fmu",
+    ".jar",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".7z",
+    ".png",
+    ".jpg",
+    ".jpeg",
+}
+
+# number of bytes of a file which are compressed to estimate whether compressing the file is worthwhile
+_compression_sample_size = 1 << 16
+
+
+def _is_compressible(path: Path) -> bool:
+    """Estimate whether compressing the file reduces its size noticeably, based on compressing its first bytes."""
+    if path.suffix.lower() in _compressed_suffixes:
+        return False
+
+    with open(path, "rb") as f:
+        sample = f.read(_compression_sample_size)
+
+    return len(zlib.compress(sample, 1)) < 0.9 * len(sample)
+
+
+def _write_zip(
+    output_path: Path,
+    resources_dir: Path,
+    configuration: bytes,
+    binaries_dir: Path,
+    model_description: bytes,
+    compresslevel: int,
+    precompile: bool,
+) -> None:
+    """Stream the contents of the FMU into a zip archive.
+
+    The archive is reproducible: entries are written in a fixed order, and every entry has the same
+    timestamp and permissions, regardless of those of the files from which they are created.
+    The timestamp is defined by SOURCE_DATE_EPOCH, or is 1980-01-01 otherwise.
+    """
+    epoch = _source_date_epoch()
+    date_time = (
+        time.gmtime(max(epoch, _zip_epoch))[:6]
+        if epoch is not None
+        else (1980, 1, 1, 0, 0, 0)
+    )
+    compression = ZIP_DEFLATED if compresslevel > 0 else ZIP_STORED
+
+    def entry(name: str, executable=False, compressible=True) -> ZipInfo:
+        info = ZipInfo(name, date_time=date_time)
+        info.create_system = 3
+        info.external_attr = (0o100755 if executable else 0o100644) << 16
+        info.compress_type = compression if compressible else ZIP_STORED
+        try:
+            info.compress_level = compresslevel  # python >= 3.13
+        except AttributeError:
+            info._compresslevel = compresslevel
+        return info
+
+    def add_file(zf: ZipFile, name: str, path: Path, executable=False):
+        info = entry(
+            name,
+            executable=executable,
+            compressible=compression == ZIP_DEFLATED and _is_compressible(path),
+        )
+        with open(path, "rb") as src, zf.open(info, "w") as dst:
+            copyfileobj(src, dst, 1 << 20)
+
+    def add_tree(zf: ZipFile, root: Path, prefix: str, skip: Iterable[str] = ()):
+        for path in _files(root):
+            name = f"{prefix}/{path.relative_to(root).as_posix()}"
+            if name not in skip:
+                add_file(zf, name, path, executable=prefix == "binaries")
+
+    config_name = "resources/slave_configuration.json"
+
+    fd, tmp = mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f, ZipFile(f, "w") as zf:
+            zf.writestr(entry("modelDescription.xml"), model_description)
+            add_tree(zf, binaries_dir, "binaries")
+            zf.writestr(entry(config_name), configuration)
+            add_tree(zf, resources_dir, "resources", skip=[config_name])
+            if precompile:
+                with TemporaryDirectory() as bytecode_dir:
+                    for name, path in _compile_resources(
+                        resources_dir, Path(bytecode_dir)
+                    ):
+                        add_file(zf, f"resources/{name}", path)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, output_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _create_archive(
+    output_path: Path, project: PyfmuProject, model_description: str
+) -> PyfmuArchive:
+    return PyfmuArchive(
+        root=output_path,
+        resources_dir=output_path / "resources",
+        slave_configuration_path=output_path / "resources" / "configuration",
+        binaries_dir=output_path / "binaries",
+        wrapper_linux64=output_path / "binaries" / "linux64",
+        wrapper_win64=output_path / "binaries" / "win64",
+        slave_script_path=output_path / "resources" / project.slave_script,
+        model_description=model_description,
+        model_description_path=output_path / "modelDescription.xml",
+        slave_script=project.slave_script,
+        slave_class=project.slave_class,
+    )
+
+
+class ExportResult:
+    """Outcome of exporting a single project using export_projects."""
+
+    def __init__(
+        self,
+        project_path: Path,
+        output_path: Path,
+        seconds: float,
+        cache_hit: Optional[bool] = None,
+        error: Optional[str] = None,
+    ):
+        self.project_path = project_path
+        self.output_path = output_path
+        self.seconds = seconds
+        self.cache_hit = cache_hit
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        status = "ok" if self.ok else "failed"
+        cache = {None: "", True: ", cache hit", False: ", cache miss"}[self.cache_hit]
+        return f"{self.project_path.name}: {status} in {self.seconds:.2f}s{cache}"
+
+
+def _export_worker(
+    project_path: Path,
+    output_path: Path,
+    compress: bool,
+    compresslevel: int,
+    precompile: bool,
+    overwrite: bool,
+    use_cache: bool,
+    cache_dir: Optional[AnyPath],
+) -> ExportResult:
+    """Export a single project, capturing any exception such that a failing project does not abort the others."""
+    start = perf_counter()
+    try:
+        archive = export_project(
+            project_path,
+            output_path,
+            compress=compress,
+            compresslevel=compresslevel,
+            precompile=precompile,
+            overwrite=overwrite,
+            cache=ExportCache(cache_dir) if use_cache else None,
+        )
+        return ExportResult(
+            project_path, output_path, perf_counter() - start, archive.cache_hit
+        )
+    except Exception:
+        return ExportResult(
+            project_path, output_path, perf_counter() - start, error=format_exc()
+        )
+
+
+def export_projects(
+    projects: Iterable[AnyPath],
+    output_dir: AnyPath,
+    jobs: int = None,
+    compress: bool = False,
+    compresslevel: int = 6,
+    precompile: bool = False,
+    overwrite=True,
+    use_cache=False,
+    cache_dir: AnyPath = None,
+    progress: Callable[[ExportResult, int, int], None] = None,
+) -> List[ExportResult]:
+    """Export several projects concurrently, each project is written to a directory of the same name in the output directory,
+    or to an archive of the same name with the .fmu extension if compressed.
+
+    Each project is exported by a worker process, such that importing the slave modules of different
+    projects does not interfere.
+
+    Args:
+        projects: paths to the projects.
+        output_dir: directory in which the exported FMUs are placed.
+        jobs: number of worker processes, defaults to the number of processors. Using a single job exports the projects in the calling process.
+        compress: see export_project.
+        compresslevel: see export_project.
+        precompile: see export_project.
+        overwrite: see export_project.
+        use_cache: reuse previous exports of unchanged projects, see *ExportCache*.
+        cache_dir: directory of the cache, defaults to that of *ExportCache*.
+        progress: invoked with the result, the number of completed projects and the total number of projects as each project finishes.
+
+    Returns:
+        the result of exporting each project, in the order of the projects.
+    """
+    projects = [Path(p) for p in projects]
+    output_dir = Path(output_dir)
+    jobs = min(jobs or os.cpu_count() or 1, max(len(projects), 1))
+
+    tasks = [
+        (
+            p,
+            output_dir / (f"{p.name}.fmu" if compress else p.name),
+            compress,
+            compresslevel,
+            precompile,
+            overwrite,
+            use_cache,
+            cache_dir,
+        )
+        for p in projects
+    ]
+    results: List[Optional[ExportResult]] = [None] * len(tasks)
+
+    def complete(i: int, result: ExportResult, n_completed: int):
+        results[i] = result
+        if progress is not None:
+            progress(result, n_completed, len(tasks))
+
+    if jobs == 1:
+        for i, task in enumerate(tasks):
+            complete(i, _export_worker(*task), i + 1)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_export_worker, *t): i for i, t in enumerate(tasks)
+        }
+
+        for n, future in enumerate(as_completed(futures), start=1):
+            complete(futures[future], future.result(), n)
+
+    return results
+
+
+def format_export_summary(
+    results: List[ExportResult], seconds: float = None
+) -> str:
+    """Returns a report listing the outcome and duration of exporting each project."""
+    lines = [str(r) for r in sorted(results, key=lambda r: -r.seconds)]
+
+    failed = [r for r in results if not r.ok]
+    hits = sum(1 for r in results if r.cache_hit)
+    misses = sum(1 for r in results if r.cache_hit is False)
+
+    summary = f"exported {len(results) - len(failed)} of {len(results)} projects"
+    if seconds is not None:
+        summary += f" in {seconds:.2f}s"
+    if hits or misses:
+        summary += f", export cache hits: {hits}, misses: {misses}"
+    lines.append(summary)
+
+    for r in failed:
+        lines.append(f"{r.project_path} failed:\n{r.error}")
+
+    return "\n".join(lines)
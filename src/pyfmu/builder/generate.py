@@ -32,6 +32,7 @@ class PyfmuProject:
         slave_script_path: AnyPath,
         project_configuration_path: AnyPath,
         resources_dir: AnyPath,
+        project_configuration: dict = None,
     ):
 
         self.slave_class = slave_class
@@ -41,6 +42,13 @@ class PyfmuProject:
         self.resources_dir = Path(resources_dir)
         self.root = Path(root)
 
+        # options such as the validation policy are passed on to the slave configuration
+        self.project_configuration = (
+            project_configuration
+            if project_configuration is not None
+            else {"slave_class": slave_class, "slave_script": slave_script}
+        )
+
     def __fspath__(self):
         return self.root
 
@@ -112,6 +120,7 @@ class PyfmuProject:
             slave_script_path=slave_script_path,
             project_configuration_path=project_configuration_path,
             resources_dir=resources_dir,
+            project_configuration=project_configuration,
         )
 
         return project
@@ -193,4 +202,5 @@ def generate_project(output_path: AnyPath, slave_class: str) -> PyfmuProject:
             slave_script_path=output / "resources" / slave_script,
             project_configuration_path=output,
             resources_dir=output / "resources",
+            project_configuration=config,
         )
@@ -222,13 +222,9 @@ def is_fmu_archive(path_to_archive: AnyPath) -> bool:
     if not is_zipfile(path_to_archive):
         return False
 
-    td = Path(mkdtemp())
-
-    decompress(path_to_archive, td, format="zip")
-    is_archive = is_fmu_directory(td)
-    rm(td)
-
-    return is_archive
+    # inspect the table of contents rather than extracting the archive
+    with ZipFile(path_to_archive) as zf:
+        return "modelDescription.xml" in zf.namelist()
 
 
 def is_fmu_directory(path_to_directory: AnyPath) -> bool:
@@ -1,13 +1,18 @@
 """Contains functionality for validating FMUs using built-in and third-part checkers."""
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from time import perf_counter
+from typing import List, Optional
 from traceback import format_exc
 
 from fmpy import simulate_fmu
 
+from pyfmu.builder.cache import ValidationCache, hash_file, pyfmu_version
 from pyfmu.builder.utils import (
     system_identifier,
     has_java,
@@ -30,8 +35,29 @@ class ValidationResult:
     def __init__(self):
         self.validation_tools = {}
 
-    def set_result_for(self, tool: str, valid: bool, message=""):
-        self.validation_tools[tool] = {"valid": valid, "message": message}
+    def set_result_for(
+        self,
+        tool: str,
+        valid: bool,
+        message="",
+        seconds: Optional[float] = None,
+        cached=False,
+    ):
+        """Set the outcome of validating the FMU with a tool.
+
+        Args:
+            tool: name of the tool.
+            valid: whether the tool found the FMU to be valid.
+            message: the output of the tool.
+            seconds: wall time spent running the tool.
+            cached: true if the outcome was reused from a previous validation of the FMU.
+        """
+        self.validation_tools[tool] = {
+            "valid": valid,
+            "message": message,
+            "seconds": seconds,
+            "cached": cached,
+        }
 
     def get_result_for(self, tool: str):
         return self.validation_tools[tool]
@@ -44,6 +70,14 @@ class ValidationResult:
 Results of validation:\n
 """
         for tool_name, res in self.validation_tools.items():
+            timing = []
+            if res.get("seconds") is not None:
+                timing.append(f"{res['seconds']:.2f}s")
+            if res.get("cached"):
+                timing.append("cached")
+            if timing:
+                tool_name = f"{tool_name} ({', '.join(timing)})"
+
             report += f"=============== {tool_name} ==============="
             report += "\n" + res["message"] + "\n"
 
@@ -71,7 +105,69 @@ def _try_decode_output(output) -> str:
         return "unable to decode output from program"
 
 
-def validate_fmu(path_to_fmu: AnyPath, tools: List[str]) -> ValidationResult:
+# tools which require the FMU to be an archive
+_archive_tools = {"fmucheck", "vdmcheck", "maestro_v1"}
+
+
+@lru_cache(maxsize=None)
+def _tool_version(tool: str) -> str:
+    """Returns a string identifying the version of a validation tool, used as part of the key of cached results."""
+
+    if tool == "fmpy":
+        import fmpy
+
+        return f"fmpy {fmpy.__version__}, pyfmu {pyfmu_version()}"
+
+    resources = Resources.get()
+    tool_to_path = {
+        "fmucheck": resources.fmuCheck_win64
+        if system_identifier() == "win64"
+        else resources.fmuCheck_linux64,
+        "vdmcheck": resources.VDMCheck2_jar.parent,
+        "maestro_v1": resources.maestro_v1,
+    }
+    path = tool_to_path[tool]
+    return hash_file(path) if path.exists() else "missing"
+
+
+def _run_tool(tool: str, func, path_to_fmu: Path, cache, fmu_hash) -> dict:
+    """Validate the FMU with a single tool, reusing the cached result if possible."""
+
+    start = perf_counter()
+
+    key = None
+    if cache is not None:
+        key = cache.key(fmu_hash, tool, _tool_version(tool))
+        result = cache.fetch(key)
+        if result is not None:
+            return {**result, "seconds": perf_counter() - start, "cached": True}
+
+    result = ValidationResult()
+    try:
+        func(path_to_fmu, result)
+    except Exception:
+        # failures to run the tool, such as java not being installed, say nothing about the FMU and are not cached
+        key = None
+        result.set_result_for(
+            tool,
+            False,
+            f"Validation failed an exception was thrown in Python:\n{format_exc()}",
+        )
+
+    result = {**result[tool], "seconds": perf_counter() - start}
+
+    if key is not None:
+        cache.store(key, result)
+
+    return result
+
+
+def validate_fmu(
+    path_to_fmu: AnyPath,
+    tools: List[str],
+    jobs: int = None,
+    cache: ValidationCache = None,
+) -> ValidationResult:
     """Validate an FMU using the specified tools. The FMU may either be an achive or a folder.
 
     Tools:
@@ -81,6 +177,10 @@ def validate_fmu(path_to_fmu: AnyPath, tools: List[str]) -> ValidationResult:
 
     In the case where the FMU is not already and archive and the tool requires this, it will be compressed
     to a temporary folder. The file is automatically removed afterwards.
+    The archive is created once and shared by every tool, which are run concurrently.
+
+    If a cache is provided, the result of each tool is reused if neither the contents of the FMU
+    nor the version of the tool has changed since it was last validated, see *ValidationCache*.
 
     The result of the validation is an object containing the output of the invidual validation tools for
     the given FMU.
@@ -98,6 +198,9 @@ def validate_fmu(path_to_fmu: AnyPath, tools: List[str]) -> ValidationResult:
 
     Arguments:
         path_to_fmu {str} -- Path to a FMU archive or directory
+        tools {List[str]} -- names of the tools used to validate the FMU
+        jobs {int} -- maximum number of tools run concurrently, defaults to every tool
+        cache {ValidationCache} -- cache of results of previous validations (default: {None})
 
     Keyword Arguments:
         use_fmpy {bool} -- validate using FMPy (default: {True})
@@ -130,16 +233,34 @@ def validate_fmu(path_to_fmu: AnyPath, tools: List[str]) -> ValidationResult:
     val_results = ValidationResult()
     path_to_fmu = Path(path_to_fmu)
 
-    for t in tools:
-        f = tool_to_func[t]
-        try:
-            f(path_to_fmu, val_results)
-        except Exception as e:
-            val_results.set_result_for(
+    if not tools:
+        return val_results
+
+    fmu_hash = hash_file(path_to_fmu) if cache is not None else None
+
+    archive = (
+        TemporaryFMUArchive(path_to_fmu)
+        if _archive_tools.intersection(tools)
+        else nullcontext(path_to_fmu)
+    )
+
+    with archive as path_to_archive, ThreadPoolExecutor(
+        max_workers=jobs or len(tools)
+    ) as executor:
+        futures = {
+            t: executor.submit(
+                _run_tool,
                 t,
-                False,
-                f"Validation failed an exception was thrown in Python:\n{format_exc()}",
+                tool_to_func[t],
+                path_to_archive if t in _archive_tools else path_to_fmu,
+                cache,
+                fmu_hash,
             )
+            for t in tools
+        }
+
+        for t, future in futures.items():
+            val_results.set_result_for(t, **future.result())
 
     return val_results
 
@@ -0,0 +1,7 @@
+from pyfmu.cosim.scenario import (  # noqa: F401
+    CosimConnection,
+    CosimFmu,
+    CosimScenario,
+    CosimVariable,
+)
+from pyfmu.cosim.master import CosimError, CosimMaster, CosimResults  # noqa: F401
@@ -0,0 +1,388 @@
+"""Defines a fixed-step co-simulation master, which executes pyfmu FMUs in the calling interpreter."""
+
+import logging
+import math
+from array import array
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Union
+from zipfile import ZipFile
+
+from pyfmu.cosim.scenario import CosimFmu, CosimScenario
+from pyfmu.fmi2.slaveContext import Fmi2SlaveContext, SlaveHandle
+from pyfmu.fmi2.types import Fmi2Status, Fmi2Status_T, Fmi2Type
+
+logger = logging.getLogger(__name__)
+
+_status_to_level = {
+    Fmi2Status.ok: logging.INFO,
+    Fmi2Status.warning: logging.WARNING,
+    Fmi2Status.discard: logging.WARNING,
+    Fmi2Status.error: logging.ERROR,
+    Fmi2Status.fatal: logging.CRITICAL,
+    Fmi2Status.pending: logging.INFO,
+}
+
+# typecodes of the columns used to record each of the FMI types, strings are recorded in lists
+_type_to_typecode = {"real": "d", "integer": "i", "boolean": "b"}
+
+
+class CosimError(RuntimeError):
+    """Raised if an instance fails during a co-simulation."""
+
+
+class CosimResults:
+    """Values recorded during a co-simulation, stored in columns.
+
+    Each column is an array of the values of a single variable at the times in *time*,
+    and is referred to as 'instance.variable'.
+
+    For example::
+
+        >>> results["a1.s"][-1]
+        1.5
+    """
+
+    def __init__(self, columns: Dict[str, Union[array, list]]):
+        self.time = array("d")
+        self.columns = columns
+
+    def __getitem__(self, name: str) -> Union[array, list]:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+
+class _Instance:
+    """Execution plan of a single instance, created by the master when a simulation is started.
+
+    The outputs of every instance are kept in a flat list of slots. An instance writes the values
+    of the variables it outputs into its *get_slots* and reads its inputs from *set_slots*.
+    """
+
+    __slots__ = (
+        "name",
+        "fmu",
+        "handle",
+        "set_references",
+        "set_slots",
+        "get_references",
+        "get_slots",
+    )
+
+    def __init__(self, name: str, fmu: CosimFmu):
+        self.name = name
+        self.fmu = fmu
+        self.handle: Optional[SlaveHandle] = None
+        self.set_references: List[int] = []
+        self.set_slots: List[int] = []
+        self.get_references: List[int] = []
+        self.get_slots: List[int] = []
+
+
+class CosimMaster:
+    """Fixed-step co-simulation master executing FMUs exported by pyfmu in the calling interpreter.
+
+    Rather than loading the FMUs' shared libraries, the slaves are instantiated directly
+    using a slave context, see *Fmi2SlaveContext*. Each communication step is performed using
+    a single step_exchange call per instance, which sets the inputs, steps and reads the outputs.
+
+    Two orchestration algorithms are supported:
+        * jacobi: every instance is stepped using the outputs of the others from the previous step.
+        * gauss_seidel: instances are stepped in the order of the connections, using the outputs of the preceding instances from the current step.
+
+    For example::
+
+        >>> scenario = CosimScenario.from_maestro("SumOfSines.j2", sine_path=..., adder_path=...)
+        >>> results = CosimMaster(scenario).run(0.0, 10.0)
+        >>> results["a1.s"]
+
+    Args:
+        scenario: the scenario which is simulated.
+        context: the context in which the slaves are instantiated, by default a new context is created for each simulation.
+        logging_on: enable the debug logging of the slaves, messages are forwarded to the logger of this module.
+    """
+
+    def __init__(
+        self,
+        scenario: CosimScenario,
+        context: Fmi2SlaveContext = None,
+        logging_on: bool = False,
+    ):
+        self.scenario = scenario
+        self.context = context
+        self.logging_on = logging_on
+
+    def run(
+        self,
+        start_time: float,
+        stop_time: float,
+        step_size: float = None,
+        algorithm: str = "jacobi",
+    ) -> CosimResults:
+        """Simulate the scenario from the start to the stop time.
+
+        Args:
+            start_time: the start time of the simulation.
+            stop_time: the stop time of the simulation.
+            step_size: the communication step size, defaults to that of the scenario.
+            algorithm: either 'jacobi' or 'gauss_seidel'.
+
+        Raises:
+            CosimError: raised if an instance returns a status other than ok or warning.
+        """
+        if algorithm not in {"jacobi", "gauss_seidel"}:
+            raise ValueError(
+                f"Unrecognized algorithm '{algorithm}', the supported algorithms are 'jacobi' and 'gauss_seidel'"
+            )
+
+        step_size = step_size if step_size is not None else self.scenario.step_size
+        if step_size is None or step_size <= 0:
+            raise ValueError(
+                "A positive step size must be defined by either the scenario or the arguments"
+            )
+
+        context = self.context if self.context is not None else Fmi2SlaveContext()
+        instances, slots, results = self._plan()
+
+        if algorithm == "gauss_seidel":
+            instances = self._order(instances)
+
+        columns = [
+            (results.columns[f"{i}.{v}"], slots[(i, v)])
+            for i, vs in self.scenario.log_variables.items()
+            for v in vs
+        ]
+        values: list = [None] * len(slots)
+
+        def record(time: float):
+            results.time.append(time)
+            for column, slot in columns:
+                column.append(values[slot])
+
+        with TemporaryDirectory() as tmpdir:
+            roots = self._extract(instances, Path(tmpdir))
+
+            try:
+                self._instantiate(context, instances, roots)
+                self._initialize(context, instances, values, start_time, stop_time)
+                record(start_time)
+
+                n_steps = math.floor((stop_time - start_time) / step_size + 1e-9)
+
+                for step in range(n_steps):
+                    time = start_time + step * step_size
+
+                    if algorithm == "jacobi":
+                        inputs = [[values[s] for s in i.set_slots] for i in instances]
+                        for i, i_inputs in zip(instances, inputs):
+                            self._step(context, i, i_inputs, values, time, step_size)
+                    else:
+                        for i in instances:
+                            i_inputs = [values[s] for s in i.set_slots]
+                            self._step(context, i, i_inputs, values, time, step_size)
+
+                    record(start_time + (step + 1) * step_size)
+
+                for i in instances:
+                    _check(context.terminate(i.handle), i, "terminate")
+
+            finally:
+                for i in instances:
+                    if i.handle is not None:
+                        context.free_instance(i.handle)
+                        i.handle = None
+
+        return results
+
+    def _plan(self):
+        """Assign slots to the variables read from the instances and resolve the value references of the variables."""
+        scenario = self.scenario
+        instances = {n: _Instance(n, fmu) for n, fmu in scenario.instances.items()}
+        slots: Dict[tuple, int] = {}
+
+        def slot(instance: str, variable: str) -> int:
+            if (instance, variable) not in slots:
+                slots[(instance, variable)] = len(slots)
+                i = instances[instance]
+                i.get_references.append(i.fmu.variable(variable).value_reference)
+                i.get_slots.append(slots[(instance, variable)])
+            return slots[(instance, variable)]
+
+        for c in scenario.connections:
+            target = instances[c.target_instance]
+            target.set_references.append(
+                target.fmu.variable(c.target_variable).value_reference
+            )
+            target.set_slots.append(slot(c.source_instance, c.source_variable))
+
+        columns = {}
+        for instance, variables in scenario.log_variables.items():
+            for v in variables:
+                slot(instance, v)
+                data_type = instances[instance].fmu.variable(v).data_type
+                columns[f"{instance}.{v}"] = (
+                    array(_type_to_typecode[data_type])
+                    if data_type in _type_to_typecode
+                    else []
+                )
+
+        return list(instances.values()), slots, CosimResults(columns)
+
+    def _order(self, instances: List[_Instance]) -> List[_Instance]:
+        """Order the instances such that sources are stepped before the instances connected to them.
+
+        Instances which are part of an algebraic loop are stepped in the order in which these are declared.
+        """
+        sources = {i.name: set() for i in instances}
+        for c in self.scenario.connections:
+            if c.source_instance != c.target_instance:
+                sources[c.target_instance].add(c.source_instance)
+
+        ordered: List[_Instance] = []
+        remaining = list(instances)
+        while remaining:
+            done = {i.name for i in ordered}
+            ready = [i for i in remaining if sources[i.name] <= done] or remaining[:1]
+            ordered.extend(ready)
+            remaining = [i for i in remaining if i not in ready]
+
+        return ordered
+
+    def _extract(self, instances: List[_Instance], tmpdir: Path) -> Dict[Path, Path]:
+        """Extract every FMU archive once, returning the directory of each FMU."""
+        roots: Dict[Path, Path] = {}
+
+        for i in instances:
+            path = i.fmu.path
+            if path in roots:
+                continue
+
+            if path.is_dir():
+                roots[path] = path
+            else:
+                root = tmpdir / str(len(roots))
+                with ZipFile(path) as zf:
+                    zf.extractall(root)
+                roots[path] = root
+
+            if not (roots[path] / "resources" / "slave_configuration.json").is_file():
+                raise CosimError(
+                    f"The FMU {path} was not exported by pyfmu, only pyfmu FMUs are supported by the master"
+                )
+
+        return roots
+
+    def _instantiate(
+        self,
+        context: Fmi2SlaveContext,
+        instances: List[_Instance],
+        roots: Dict[Path, Path],
+    ) -> None:
+        def log(instance_name, status, category, message):
+            logger.log(
+                _status_to_level.get(status, logging.INFO),
+                "%s [%s] %s",
+                instance_name,
+                category,
+                message,
+            )
+
+        for i in instances:
+            i.handle = context.instantiate(
+                i.name,
+                Fmi2Type.co_simulation,
+                i.fmu.guid,
+                (roots[i.fmu.path] / "resources").as_uri(),
+                log,
+                False,
+                self.logging_on,
+            )
+            if i.handle is None:
+                raise CosimError(f"Instantiation of {i.name} failed")
+
+    def _initialize(
+        self,
+        context: Fmi2SlaveContext,
+        instances: List[_Instance],
+        values: list,
+        start_time: float,
+        stop_time: float,
+    ) -> None:
+        parameters: Dict[str, tuple] = {}
+        for (instance, variable), value in self.scenario.parameters.items():
+            fmu = self.scenario.instances[instance]
+            references, parameter_values = parameters.setdefault(instance, ([], []))
+            references.append(fmu.variable(variable).value_reference)
+            parameter_values.append(value)
+
+        for i in instances:
+            if i.name in parameters:
+                _check(context.set_xxx(i.handle, *parameters[i.name]), i, "set_xxx")
+
+            _check(
+                context.setup_experiment(i.handle, start_time, None, stop_time),
+                i,
+                "setup_experiment",
+            )
+            _check(
+                context.enter_initialization_mode(i.handle),
+                i,
+                "enter_initialization_mode",
+            )
+
+        # propagate the initial outputs along the connections, inputs of which the source has not been read are left unset
+        for i in instances:
+            known = [
+                n for n, s in enumerate(i.set_slots) if values[s] is not None
+            ]
+            if known:
+                references = [i.set_references[n] for n in known]
+                inputs = [values[i.set_slots[n]] for n in known]
+                _check(context.set_xxx(i.handle, references, inputs), i, "set_xxx")
+            self._read(context, i, values)
+
+        for i in instances:
+            _check(
+                context.exit_initialization_mode(i.handle),
+                i,
+                "exit_initialization_mode",
+            )
+            self._read(context, i, values)
+
+    def _read(self, context: Fmi2SlaveContext, i: _Instance, values: list) -> None:
+        outputs, status = context.get_xxx(i.handle, i.get_references)
+        _check(status, i, "get_xxx")
+        for s, v in zip(i.get_slots, outputs):
+            values[s] = v
+
+    def _step(
+        self,
+        context: Fmi2SlaveContext,
+        i: _Instance,
+        inputs: list,
+        values: list,
+        time: float,
+        step_size: float,
+    ) -> None:
+        outputs, status = context.step_exchange(
+            i.handle, i.set_references, inputs, time, step_size, i.get_references
+        )
+        _check(status, i, "do_step")
+        for s, v in zip(i.get_slots, outputs):
+            values[s] = v
+
+
+def _check(status: Fmi2Status_T, instance: _Instance, function: str) -> None:
+    if status not in {Fmi2Status.ok, Fmi2Status.warning}:
+        raise CosimError(
+            f"The instance {instance.name} returned status {status} from {function}"
+        )
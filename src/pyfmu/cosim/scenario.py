@@ -0,0 +1,250 @@
+"""Defines co-simulation scenarios, consisting of FMU instances and the connections between their variables."""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from zipfile import ZipFile
+
+import lxml.etree as ET
+from jinja2 import Template
+
+from pyfmu.fmi2.types import Fmi2Value_T
+from pyfmu.types import AnyPath
+from pyfmu.utils import file_uri_to_path
+
+
+_fmitype_to_type = {
+    "Real": "real",
+    "Integer": "integer",
+    "Boolean": "boolean",
+    "String": "string",
+}
+
+
+class CosimVariable(NamedTuple):
+    """Variable of an FMU as declared by its model description."""
+
+    name: str
+    value_reference: int
+    data_type: str
+    causality: str
+
+
+class CosimFmu:
+    """An FMU taking part in a scenario, either an archive or a directory.
+
+    The model description is read when the object is created, whereas the FMU is only
+    extracted once the scenario is simulated.
+    """
+
+    def __init__(self, path: AnyPath):
+        self.path = Path(path)
+
+        if self.path.is_dir():
+            model_description = (self.path / "modelDescription.xml").read_bytes()
+        else:
+            with ZipFile(self.path) as zf:
+                model_description = zf.read("modelDescription.xml")
+
+        root = ET.fromstring(model_description)
+        self.model_name: str = root.get("modelName")
+        self.guid: str = root.get("guid")
+        self.variables: Dict[str, CosimVariable] = {}
+
+        for sv in root.iter("ScalarVariable"):
+            data_type = next(
+                _fmitype_to_type[e.tag] for e in sv if e.tag in _fmitype_to_type
+            )
+            self.variables[sv.get("name")] = CosimVariable(
+                sv.get("name"),
+                int(sv.get("valueReference")),
+                data_type,
+                sv.get("causality", "local"),
+            )
+
+    def variable(self, name: str) -> CosimVariable:
+        try:
+            return self.variables[name]
+        except KeyError:
+            raise ValueError(
+                f"The FMU {self.path} does not declare a variable named '{name}', declared variables are: {list(self.variables)}"
+            ) from None
+
+
+class CosimConnection(NamedTuple):
+    """Connection from an output of one instance to an input of another."""
+
+    source_instance: str
+    source_variable: str
+    target_instance: str
+    target_variable: str
+
+
+class CosimScenario:
+    """Describes the instances taking part in a co-simulation and how these are connected.
+
+    Args:
+        instances: the FMU of each instance, keyed by the name of the instance.
+        connections: connections between the variables of the instances.
+        log_variables: names of the variables recorded for each instance.
+        parameters: values of variables set before initialization, keyed by the name of the instance and variable.
+        step_size: the step size defined by the scenario, if any.
+    """
+
+    def __init__(
+        self,
+        instances: Dict[str, CosimFmu],
+        connections: List[CosimConnection],
+        log_variables: Dict[str, List[str]] = None,
+        parameters: Dict[Tuple[str, str], Fmi2Value_T] = None,
+        step_size: Optional[float] = None,
+    ):
+        self.instances = instances
+        self.connections = connections
+        self.log_variables = log_variables if log_variables is not None else {}
+        self.parameters = parameters if parameters is not None else {}
+        self.step_size = step_size
+
+        for instance, variable in [
+            *[(c.source_instance, c.source_variable) for c in connections],
+            *[(c.target_instance, c.target_variable) for c in connections],
+            *[(i, v) for i, vs in self.log_variables.items() for v in vs],
+            *self.parameters,
+        ]:
+            if instance not in instances:
+                raise ValueError(
+                    f"The scenario refers to an undefined instance '{instance}'"
+                )
+            instances[instance].variable(variable)
+
+    @staticmethod
+    def from_maestro(
+        path_or_config: Union[AnyPath, dict], **template_values: str
+    ) -> "CosimScenario":
+        """Read a scenario from a Maestro v1 configuration, such as the coe.json files used by the INTO-CPS application.
+
+        Configurations with the .j2 extension are rendered as Jinja templates using the template values first.
+
+        Variables are referred to as '{fmu}.instance.variable' and FMUs by either a file URI or a path,
+        which is resolved relative to the configuration.
+
+        Args:
+            path_or_config: path to the configuration or the parsed configuration.
+            template_values: values used to render a templated configuration, such as the paths of the FMUs.
+
+        Raises:
+            ValueError: raised if the configuration refers to undefined FMUs or variables, or uses a variable step size.
+        """
+        base_dir = Path.cwd()
+
+        if isinstance(path_or_config, dict):
+            config = path_or_config
+        else:
+            path = Path(path_or_config)
+            base_dir = path.parent
+            text = path.read_text(encoding="utf-8")
+            if path.suffix == ".j2":
+                text = Template(text).render(template_values)
+            config = json.loads(text)
+
+        fmus: Dict[str, CosimFmu] = {}
+        for key, location in config["fmus"].items():
+            fmu_path = (
+                Path(file_uri_to_path(location))
+                if location.startswith("file:")
+                else base_dir / location
+            )
+            fmus[key] = CosimFmu(fmu_path)
+
+        instances: Dict[str, CosimFmu] = {}
+
+        def split(name: str) -> Tuple[str, str]:
+            match = re.fullmatch(r"(\{[^}]+\})\.([^.]+)\.(.+)", name)
+            if match is None:
+                raise ValueError(
+                    f"Unable to parse the variable '{name}', variables must be written as {{fmu}}.instance.variable"
+                )
+            fmu, instance, variable = match.groups()
+
+            if fmu not in fmus:
+                raise ValueError(f"The variable '{name}' refers to an undefined FMU")
+
+            if instances.setdefault(instance, fmus[fmu]) is not fmus[fmu]:
+                raise ValueError(
+                    f"The instance '{instance}' is an instance of more than one FMU"
+                )
+
+            return instance, variable
+
+        connections = [
+            CosimConnection(*split(source), *split(target))
+            for source, targets in config.get("connections", {}).items()
+            for target in targets
+        ]
+
+        log_variables: Dict[str, List[str]] = {}
+        for name, variables in config.get("logVariables", {}).items():
+            instance, _ = split(f"{name}.-")
+            log_variables.setdefault(instance, []).extend(variables)
+
+        parameters = {
+            split(name): value for name, value in config.get("parameters", {}).items()
+        }
+
+        algorithm = config.get("algorithm", {})
+        if algorithm.get("type", "fixed-step") != "fixed-step":
+            raise ValueError(
+                f"Unsupported algorithm '{algorithm['type']}', only fixed-step is supported"
+            )
+
+        return CosimScenario(
+            instances, connections, log_variables, parameters, algorithm.get("size")
+        )
+
+    @staticmethod
+    def from_ssd(path: AnyPath) -> "CosimScenario":
+        """Read a scenario from the system structure description, SystemStructure.ssd, of an SSP package.
+
+        The sources of the components are resolved relative to the directory of the description.
+        Every output connector of the components is recorded.
+
+        Raises:
+            ValueError: raised if the description refers to undefined components or variables.
+        """
+        path = Path(path)
+        root = ET.parse(str(path)).getroot()
+
+        def children(element, name: str):
+            return [e for e in element.iter() if ET.QName(e).localname == name]
+
+        instances: Dict[str, CosimFmu] = {}
+        fmus: Dict[str, CosimFmu] = {}
+        log_variables: Dict[str, List[str]] = {}
+
+        for component in children(root, "Component"):
+            name = component.get("name")
+            source = component.get("source")
+
+            # several components may be instances of the same FMU
+            if source not in fmus:
+                fmus[source] = CosimFmu(path.parent / source)
+            instances[name] = fmus[source]
+
+            log_variables[name] = [
+                c.get("name")
+                for c in children(component, "Connector")
+                if c.get("kind") == "output"
+            ]
+
+        connections = [
+            CosimConnection(
+                c.get("startElement"),
+                c.get("startConnector"),
+                c.get("endElement"),
+                c.get("endConnector"),
+            )
+            for c in children(root, "Connection")
+        ]
+
+        return CosimScenario(instances, connections, log_variables)
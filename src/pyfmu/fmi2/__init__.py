@@ -7,4 +7,6 @@ from .types import (  # noqa: F401
     Fmi2Variability,
 )
 from .slave import Fmi2Slave  # noqa: F401
+from .ode import Fmi2OdeSlave  # noqa: F401
+from .ensemble import Fmi2Ensemble  # noqa: F401
 from .slaveContext import Fmi2SlaveContext  # noqa: F401
@@ -0,0 +1,313 @@
+"""Defines the compiled accessor tables used by the slave context to read and write variables of a slave."""
+
+import os
+from array import array
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pyfmu.fmi2.exception import SlaveConfigError
+from pyfmu.fmi2.types import Fmi2ScalarVariable, Fmi2SlaveLike, _type_to_pyType
+
+
+# upper bound on the number of distinct reference vectors for which plans are cached
+_max_cached_plans = 1024
+
+# format characters of the buffers used to exchange values in bulk, see the struct module
+_type_to_buffer_format = {
+    float: "d",
+    int: "i",
+    bool: "i",
+}
+
+# numpy scalars may be coerced to the declared type if their kind matches, see numpy.dtype.kind
+_type_to_numpy_kinds = {
+    float: {"f"},
+    int: {"i", "u"},
+    bool: {"b"},
+    str: {"U"},
+}
+
+
+class Fmi2AccessPlan:
+    """Precompiled sequence of getters, setters and types for a specific vector of value references.
+
+    Plans are created the first time a vector of references is accessed, and reused for
+    every subsequent call using the same vector. This avoids rebuilding lists of
+    attribute names and looking up types on every call to get_xxx and set_xxx.
+    """
+
+    __slots__ = (
+        "references",
+        "attributes",
+        "types",
+        "getters",
+        "setters",
+        "format",
+        "block",
+        "listable",
+    )
+
+    def __init__(
+        self,
+        references: Tuple[int, ...],
+        attributes: List[str],
+        types: List[type],
+        getters: List[Callable[[], object]],
+        setters: List[Callable[[object], None]],
+    ):
+        self.references = references
+        self.attributes = attributes
+        self.types = types
+        self.getters = getters
+        self.setters = setters
+
+        # values of a single non-string type can be exchanged through buffers
+        formats = {_type_to_buffer_format.get(t) for t in types}
+        self.format: Optional[str] = formats.pop() if len(formats) == 1 else None
+
+        # range of value references, in case these are contiguous and ascending
+        self.block: Optional[Tuple[int, int]] = None
+        if references and references == tuple(
+            range(references[0], references[0] + len(references))
+        ):
+            self.block = (references[0], references[0] + len(references))
+
+        # contiguous reals or integers may be listed from a block as is, whereas booleans must be converted
+        self.listable = self.block is not None and (
+            set(types) == {float} or set(types) == {int}
+        )
+
+    def invalid_types(self, values: Sequence[object]) -> List[str]:
+        """Returns a description of every value whose type does not match the declared type of its variable."""
+        return [
+            f"attribute {a} has value: {v}, expected type: {t.__name__}, actual: {type(v)}"
+            for a, t, v in zip(self.attributes, self.types, values)
+            if type(v) is not t
+        ]
+
+    def coerce(self, values: Sequence[object]) -> Optional[List[object]]:
+        """Convert numpy scalars, such as numpy.float64, to the declared types of the variables.
+
+        Returns:
+            the converted values, or None if one or more values can not be converted.
+        """
+        coerced = []
+        for t, v in zip(self.types, values):
+            if type(v) is not t:
+                if (
+                    type(v).__module__ != "numpy"
+                    or getattr(getattr(v, "dtype", None), "kind", None)
+                    not in _type_to_numpy_kinds[t]
+                ):
+                    return None
+                v = t(v)
+            coerced.append(v)
+
+        return coerced if len(coerced) == len(self.types) else None
+
+
+class Fmi2Accessors:
+    """Table of bound getters and setters for every variable of a single slave instance.
+
+    The table is compiled once when the slave is instantiated. Each entry binds the
+    attribute of the variable to the instance, such that reading or writing a variable
+    does not require looking up its name. Reals and integers kept in the array storage
+    of the slave, see get_value_location, are bound directly to their element of the array.
+    """
+
+    def __init__(
+        self,
+        slave: Fmi2SlaveLike,
+        variables: Iterable[Fmi2ScalarVariable],
+        prototype: Optional["Fmi2Accessors"] = None,
+    ):
+        """
+        Args:
+            slave: the instance to which the getters and setters are bound.
+            variables: the variables of the slave.
+            prototype: accessors of the instance the slave was cloned from, see *Fmi2Slave.clone*.
+                The tables describing the variables are shared with the prototype rather than compiled again.
+        """
+        shared = prototype is not None
+
+        self.refs_to_attr: Dict[int, str] = prototype.refs_to_attr if shared else {}
+        self.refs_to_types: Dict[int, type] = prototype.refs_to_types if shared else {}
+        self.refs_to_getters: Dict[int, Callable[[], object]] = {}
+        self.refs_to_setters: Dict[int, Callable[[object], None]] = {}
+        self._plans: Dict[Tuple[int, ...], Fmi2AccessPlan] = {}
+        self._get_value_block = getattr(slave, "get_value_block", None)
+        get_value_location = getattr(slave, "get_value_location", None)
+
+        # arrays of the slave's array storage and the references of the remaining settable variables,
+        # together these make up the state of the variables, see Fmi2SlaveState
+        self.arrays: List[array] = []
+        self.state_references: List[int] = (
+            prototype.state_references if shared else []
+        )
+
+        for v in variables:
+            vref = v.value_reference
+
+            if not shared:
+                self.refs_to_attr[vref] = v.name
+                self.refs_to_types[vref] = _type_to_pyType[v.data_type]
+
+            location = (
+                get_value_location(vref) if get_value_location is not None else None
+            )
+
+            if location is not None:
+                values, offset = location
+
+                if not any(values is a for a in self.arrays):
+                    self.arrays.append(values)
+
+            elif not shared and not _is_read_only(slave, v.name):
+                self.state_references.append(vref)
+
+            if location is not None:
+                # booleans are stored as integers and must be converted when read
+                self.refs_to_getters[vref] = (
+                    partial(_get_boolean, values, offset)
+                    if v.data_type == "boolean"
+                    else partial(values.__getitem__, offset)
+                )
+                self.refs_to_setters[vref] = partial(values.__setitem__, offset)
+            else:
+                self.refs_to_getters[vref] = partial(getattr, slave, v.name)
+                self.refs_to_setters[vref] = partial(setattr, slave, v.name)
+
+    def plan(self, references: Sequence[int]) -> Fmi2AccessPlan:
+        """Returns the plan for the vector of references, compiling it if necessary.
+
+        Raises:
+            KeyError: raised if one or more of the references is not defined by the slave.
+        """
+        key = tuple(references)
+
+        try:
+            return self._plans[key]
+        except KeyError:
+            pass
+
+        plan = Fmi2AccessPlan(
+            references=key,
+            attributes=[self.refs_to_attr[r] for r in key],
+            types=[self.refs_to_types[r] for r in key],
+            getters=[self.refs_to_getters[r] for r in key],
+            setters=[self.refs_to_setters[r] for r in key],
+        )
+
+        if len(self._plans) >= _max_cached_plans:
+            self._plans.clear()
+
+        self._plans[key] = plan
+        return plan
+
+    def block(self, plan: Fmi2AccessPlan) -> Optional[memoryview]:
+        """Returns a view of the slave's memory holding the values of the plan, if the slave exposes one.
+
+        The view is only returned if its format and size matches that of the plan, allowing the values
+        to be exchanged using a single copy.
+        """
+        if plan.block is None or plan.format is None or self._get_value_block is None:
+            return None
+
+        block = self._get_value_block(*plan.block)
+
+        if block is None:
+            return None
+
+        block = memoryview(block)
+
+        if (
+            not block.c_contiguous
+            or block.format != plan.format
+            or block.nbytes != block.itemsize * len(plan.references)
+        ):
+            return None
+
+        return block.cast("B").cast(plan.format)
+
+
+class Fmi2TypeValidation:
+    """Policy defining when the types of values exchanged with a slave are validated.
+
+    Values:
+        * always: validate the values of every call to get_xxx and set_xxx.
+        * first_n: validate during initialization and the first n calls after exit_initialization_mode.
+        * never: never validate, values are passed to the slave and the environment as is.
+
+    The policy may be declared in the slave configuration using the keys "validation_policy"
+    and "validation_calls". The environment variables PYFMU_VALIDATION_POLICY and
+    PYFMU_VALIDATION_CALLS take precedence over the configuration.
+    """
+
+    always = "always"
+    first_n = "first_n"
+    never = "never"
+
+    def __init__(self, policy: str = "always", calls: int = 1000):
+
+        if policy not in {self.always, self.first_n, self.never}:
+            raise SlaveConfigError(
+                f"Unrecognized validation policy: {policy}, valid options are: always, first_n and never"
+            )
+
+        if calls < 0:
+            raise SlaveConfigError(
+                f"The number of validated calls must be non-negative, got: {calls}"
+            )
+
+        self.policy = policy
+        self.calls = calls
+        self.reset()
+
+    @staticmethod
+    def from_configuration(config: dict) -> "Fmi2TypeValidation":
+        """Create the policy declared by a slave configuration, allowing it to be overridden by the environment."""
+        policy = os.environ.get(
+            "PYFMU_VALIDATION_POLICY", config.get("validation_policy", "always")
+        )
+        calls = os.environ.get(
+            "PYFMU_VALIDATION_CALLS", config.get("validation_calls", 1000)
+        )
+
+        try:
+            calls = int(calls)
+        except ValueError as e:
+            raise SlaveConfigError(
+                f"The number of validated calls must be an integer, got: {calls}"
+            ) from e
+
+        return Fmi2TypeValidation(policy, calls)
+
+    def reset(self) -> None:
+        """Validate every call until initialization mode is exited."""
+        self.enabled = self.policy != self.never
+        self._remaining: Optional[int] = None
+
+    def exit_initialization_mode(self) -> None:
+        if self.policy == self.first_n:
+            self._remaining = self.calls
+            self.enabled = self.calls > 0
+
+    def count(self) -> None:
+        """Record a validated call, disabling validation once the allotted number of calls is spent."""
+        if self._remaining is not None:
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self.enabled = False
+
+
+def _get_boolean(values: array, offset: int) -> bool:
+    return bool(values[offset])
+
+
+def _is_read_only(slave: object, name: str) -> bool:
+    """Returns true if the attribute is computed by a property without a setter or on demand, such as an output derived from the inputs."""
+    if name in getattr(slave, "_computed", ()):
+        return True
+
+    attr = getattr(type(slave), name, None)
+    return isinstance(attr, property) and attr.fset is None
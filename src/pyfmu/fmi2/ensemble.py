@@ -0,0 +1,118 @@
+"""Defines the ensemble, running many members of a slave as a single vectorized instance."""
+
+from typing import Iterable, Type, Union
+
+from pyfmu.fmi2.exception import SlaveAttributeError
+from pyfmu.fmi2.slave import Fmi2Slave
+from pyfmu.fmi2.types import Fmi2Status_T
+
+
+class Fmi2Ensemble:
+    """Simulates N members of a slave, such as the samples of a Monte Carlo study, using a single instance.
+
+    Rather than creating an instance per member, each registered variable of a single instance holds a numpy
+    vector with a value for each member, see *Fmi2Slave.enter_ensemble*. A single call to do_step thus advances
+    every member, replacing N calls through the slave context by one. Parameters and inputs may be set
+    for each member individually, and outputs are returned as vectors.
+
+    Only slaves declaring *supports_ensembles* can be run as an ensemble, since their computations
+    must apply elementwise to the vectors.
+
+    Example:
+
+        >>> ensemble = Fmi2Ensemble(Bicycle_Kinematic, 1000)
+        >>> ensemble.set("lf", numpy.random.uniform(0.8, 1.2, 1000))
+        >>> ensemble.enter_initialization_mode()
+        >>> ensemble.exit_initialization_mode()
+        >>> ensemble.do_step(0.0, 0.1)
+        >>> ensemble.get("x")
+        array([...])
+
+    Args:
+        slave_class: class of the slave, constructed using the remaining arguments.
+        n_members: number of members of the ensemble.
+
+    Raises:
+        SlaveAttributeError: raised if the slave does not support ensembles.
+    """
+
+    def __init__(
+        self, slave_class: Type[Fmi2Slave], n_members: int, *args, **kwargs
+    ):
+        if not getattr(slave_class, "supports_ensembles", False):
+            raise SlaveAttributeError(
+                f"The slave {slave_class.__name__} does not support ensembles, see Fmi2Slave.supports_ensembles"
+            )
+
+        if n_members < 1:
+            raise ValueError(
+                f"An ensemble must have at least one member, got {n_members}"
+            )
+
+        self.n_members = n_members
+        self.slave = slave_class(*args, **kwargs)
+        self.slave.enter_ensemble(n_members)
+
+        self._names = {v.name for v in self.slave.variables}
+
+    def get(self, name: str) -> "numpy.ndarray":  # noqa: F821
+        """Returns a copy of the values of a variable, one for each member."""
+        self._check_name(name)
+
+        import numpy as np
+
+        return np.array(getattr(self.slave, name), copy=True)
+
+    def set(self, name: str, values: Union[object, Iterable[object]]) -> None:
+        """Set the value of a variable for each member.
+
+        Args:
+            name: name of the variable.
+            values: a value for each member, or a single value shared by every member.
+        """
+        self._check_name(name)
+
+        import numpy as np
+
+        current = getattr(self.slave, name)
+        values = np.array(values, dtype=getattr(current, "dtype", None))
+        if values.ndim == 0:
+            values = np.full(self.n_members, values)
+        elif values.shape != (self.n_members,):
+            raise ValueError(
+                f"Expected a value for each of the {self.n_members} members of {name}, got an array of shape {values.shape}"
+            )
+
+        setattr(self.slave, name, values)
+        self.slave.invalidate_computed_outputs()
+
+        # slaves that keep state derived from their variables between steps, see Fmi2OdeSlave.variables_changed
+        changed = getattr(self.slave, "variables_changed", None)
+        if changed is not None:
+            changed()
+
+    def setup_experiment(
+        self, start_time: float, stop_time: float = None, tolerance: float = None
+    ) -> Fmi2Status_T:
+        return self.slave.setup_experiment(start_time, stop_time, tolerance)
+
+    def enter_initialization_mode(self) -> Fmi2Status_T:
+        return self.slave.enter_initialization_mode()
+
+    def exit_initialization_mode(self) -> Fmi2Status_T:
+        return self.slave.exit_initialization_mode()
+
+    def do_step(self, current_time: float, step_size: float) -> Fmi2Status_T:
+        """Advance every member of the ensemble by a single step."""
+        status = self.slave.do_step(current_time, step_size, True)
+        self.slave.invalidate_computed_outputs()
+        return status
+
+    def terminate(self) -> Fmi2Status_T:
+        return self.slave.terminate()
+
+    def _check_name(self, name: str) -> None:
+        if name not in self._names:
+            raise SlaveAttributeError(
+                f"The slave does not define a variable named {name}"
+            )
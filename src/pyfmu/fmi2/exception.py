@@ -14,6 +14,11 @@ class SlaveConfigError(SlaveError):
     pass
 
 
+class SlaveProcessError(SlaveError):
+    """Failure to communicate with the worker process hosting a slave."""
+    pass
+
+
 class StartValueError(SlaveError):
     """Unable to determine start value of variable or start value is invalid"""
     pass
@@ -0,0 +1,361 @@
+"""Defines the hosting of slaves in worker processes, which communicate with the context through shared memory."""
+
+import multiprocessing as mp
+import os
+import pickle
+import struct
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pyfmu.fmi2.exception import SlaveConfigError, SlaveProcessError
+from pyfmu.fmi2.types import Fmi2LoggingCallback
+
+# header of each slot, holding the number of bytes in the slot and whether it is the last slot of a message
+_slot_header = struct.Struct("II")
+
+_default_buffer_size = 1 << 20
+_min_slot_size = 1 << 12
+_n_slots = 16
+
+# interval in seconds at which a waiting process checks whether its peer is still alive
+_liveness_interval = 0.5
+
+
+class Fmi2RingBuffer:
+    """Bounded single-producer single-consumer queue of messages, stored as a ring of fixed-size slots in shared memory.
+
+    Two counting semaphores track the number of free and filled slots. The producer and the consumer
+    each keep their own position in the ring, such that no position is shared between the processes.
+    Messages larger than a slot are split across consecutive slots, allowing messages of any size
+    to be sent through a buffer of fixed size.
+    """
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        slot_size: int,
+        free_slots,
+        filled_slots,
+        peer_alive: Callable[[], bool],
+    ):
+        self._buffer = buffer
+        self._slot_size = slot_size
+        self._n_slots = len(buffer) // slot_size
+        self._free_slots = free_slots
+        self._filled_slots = filled_slots
+        self._peer_alive = peer_alive
+        self._position = 0
+
+    def write(self, message: bytes) -> None:
+        message = memoryview(message).cast("B")
+        capacity = self._slot_size - _slot_header.size
+        offset = 0
+
+        while True:
+            chunk = message[offset : offset + capacity]
+            offset += len(chunk)
+            last = offset >= len(message)
+
+            self._wait(self._free_slots)
+            start = self._position * self._slot_size
+            _slot_header.pack_into(self._buffer, start, len(chunk), last)
+            body = start + _slot_header.size
+            self._buffer[body : body + len(chunk)] = chunk
+            self._position = (self._position + 1) % self._n_slots
+            self._filled_slots.release()
+
+            if last:
+                return
+
+    def read(self) -> bytes:
+        chunks: List[bytes] = []
+
+        while True:
+            self._wait(self._filled_slots)
+            start = self._position * self._slot_size
+            size, last = _slot_header.unpack_from(self._buffer, start)
+            body = start + _slot_header.size
+            chunks.append(self._buffer[body : body + size].tobytes())
+            self._position = (self._position + 1) % self._n_slots
+            self._free_slots.release()
+
+            if last:
+                return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    def release(self) -> None:
+        self._buffer.release()
+
+    def _wait(self, semaphore) -> None:
+        while not semaphore.acquire(timeout=_liveness_interval):
+            if not self._peer_alive():
+                raise SlaveProcessError(
+                    "The process at the other end of the buffer has terminated"
+                )
+
+
+class Fmi2RemoteState:
+    """Refers to a state of a slave hosted by a worker process, the state itself is kept by the worker."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: int):
+        self.key = key
+
+
+def _buffer_size(config: dict) -> int:
+    buffer_size = config.get("execution_buffer_size", _default_buffer_size)
+
+    if not isinstance(buffer_size, int) or buffer_size < _n_slots * _min_slot_size:
+        raise SlaveConfigError(
+            f"The execution buffer size must be an integer of at least {_n_slots * _min_slot_size} bytes, got {buffer_size}"
+        )
+
+    return buffer_size
+
+
+def _python_executable() -> str:
+    """Returns the interpreter used to start worker processes.
+
+    When the interpreter is embedded by the wrapper, sys.executable refers to the process hosting the FMU,
+    such as the master, rather than to a Python interpreter.
+    """
+    if Path(sys.executable).name.lower().startswith("python"):
+        return sys.executable
+
+    if sys.platform.startswith("win"):
+        return os.path.join(sys.exec_prefix, "pythonw.exe")
+
+    return os.path.join(
+        sys.exec_prefix, "bin", f"python{sys.version_info[0]}.{sys.version_info[1]}"
+    )
+
+
+def _as_buffer(value) -> Optional[memoryview]:
+    """Returns a view of the value if it is a buffer such as a memoryview, bytearray or array, otherwise None."""
+    if isinstance(value, (bytes, str, int, float, list, tuple)) or value is None:
+        return None
+
+    try:
+        return memoryview(value)
+    except TypeError:
+        return None
+
+
+def _channels(
+    buffer: memoryview, slot_size: int, semaphores: tuple, peer_alive, worker: bool
+) -> Tuple[Fmi2RingBuffer, Fmi2RingBuffer]:
+    """Create the request and response buffers, returning these as the buffers read and written by the process."""
+    half = len(buffer) // 2
+    free_requests, filled_requests, free_responses, filled_responses = semaphores
+
+    requests = Fmi2RingBuffer(
+        buffer[:half], slot_size, free_requests, filled_requests, peer_alive
+    )
+    responses = Fmi2RingBuffer(
+        buffer[half:], slot_size, free_responses, filled_responses, peer_alive
+    )
+    return (requests, responses) if worker else (responses, requests)
+
+
+class Fmi2SlaveProcess:
+    """Hosts a single slave in a worker process, to which the context forwards the FMI calls made on the slave.
+
+    Slaves hosted by different processes do not share an interpreter and thus a GIL, allowing a master
+    to step several instances in parallel. The calls are pickled and passed through ring buffers in
+    shared memory, see *Fmi2RingBuffer*. While waiting for the worker, the calling thread blocks
+    on a semaphore and does not hold the GIL.
+
+    Buffers passed to the calls, such as those of get_xxx_buffer, are copied to the worker
+    and writable buffers are copied back once the call returns. Log messages of the slave are
+    delivered to the logging callback when the call returns.
+
+    Args:
+        instantiate_args: keyword arguments passed to instantiate by the worker, except for the logging callback.
+        logging_callback: callback to which the log messages of the slave are delivered.
+        config: the slave configuration, defining the size of the buffers.
+    """
+
+    def __init__(
+        self,
+        instantiate_args: dict,
+        logging_callback: Fmi2LoggingCallback,
+        config: dict,
+    ):
+        buffer_size = _buffer_size(config)
+        slot_size = buffer_size // _n_slots
+
+        ctx = mp.get_context("spawn")
+        ctx.set_executable(_python_executable())
+
+        self._logging_callback = logging_callback
+        self._shm = SharedMemory(create=True, size=2 * _n_slots * slot_size)
+        process = None
+        channels = ()
+
+        try:
+            semaphores = (
+                ctx.Semaphore(_n_slots),
+                ctx.Semaphore(0),
+                ctx.Semaphore(_n_slots),
+                ctx.Semaphore(0),
+            )
+
+            process = self._process = ctx.Process(
+                target=_serve,
+                args=(self._shm.name, slot_size, semaphores, instantiate_args),
+                name=f"pyfmu-{instantiate_args['instance_name']}",
+                daemon=True,
+            )
+            process.start()
+
+            channels = _channels(
+                self._shm.buf, slot_size, semaphores, process.is_alive, False
+            )
+            self._responses, self._requests = channels
+
+            self.instantiated: bool = self._receive()
+        except BaseException:
+            # the worker is stopped before the memory it is attached to is released
+            if process is not None and process.is_alive():
+                process.terminate()
+                process.join()
+            for c in channels:
+                c.release()
+            self._shm.close()
+            self._shm.unlink()
+            raise
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid
+
+    def call(self, name: str, *args):
+        """Invoke the method of the context hosted by the worker on the slave, returning its result."""
+        sent = []
+        writable: Dict[int, object] = {}
+
+        for i, a in enumerate(args):
+            view = _as_buffer(a)
+            if view is not None:
+                if view.readonly:
+                    a = view.tobytes()
+                else:
+                    writable[i] = view
+                    a = bytearray(view.cast("B"))
+            sent.append(a)
+
+        self._requests.write(
+            pickle.dumps((name, sent, list(writable)), pickle.HIGHEST_PROTOCOL)
+        )
+        result, buffers = self._receive()
+
+        if isinstance(result, SlaveProcessError):
+            raise result
+
+        for i, data in zip(writable, buffers):
+            writable[i].cast("B")[:] = data
+
+        return result
+
+    def close(self) -> None:
+        """Free the slave and stop the worker process."""
+        try:
+            if self._process.is_alive():
+                self.call("free_instance")
+            self._process.join(timeout=5)
+        finally:
+            if self._process.is_alive():
+                self._process.terminate()
+            self._requests.release()
+            self._responses.release()
+            self._shm.close()
+            self._shm.unlink()
+
+    def _receive(self):
+        result, messages = pickle.loads(self._responses.read())
+
+        for m in messages:
+            self._logging_callback(*m)
+
+        return result
+
+
+def _serve(shm_name: str, slot_size: int, semaphores: tuple, instantiate_args: dict):
+    """Entry point of the worker process, which instantiates the slave and serves calls until the slave is freed."""
+    from pyfmu.fmi2.slaveContext import Fmi2SlaveContext
+    from pyfmu.fmi2.state import Fmi2SlaveState
+
+    parent = mp.parent_process()
+    shm = SharedMemory(name=shm_name)
+    requests, responses = _channels(
+        shm.buf, slot_size, semaphores, parent.is_alive, True
+    )
+
+    messages = []
+
+    def reply(result):
+        responses.write(
+            pickle.dumps((result, messages), pickle.HIGHEST_PROTOCOL)
+        )
+        messages.clear()
+
+    # states of the slave referred to by the keys of the remote states held by the environment
+    states: Dict[int, Fmi2SlaveState] = {}
+    keys: Dict[int, int] = {}
+    next_key = 0
+
+    try:
+        context = Fmi2SlaveContext(hosted=True)
+        handle = context.instantiate(
+            **instantiate_args, logging_callback=lambda *m: messages.append(m)
+        )
+        reply(handle is not None)
+
+        while handle is not None:
+            name, args, writable = pickle.loads(requests.read())
+
+            try:
+                args = [
+                    states[a.key] if isinstance(a, Fmi2RemoteState) else a
+                    for a in args
+                ]
+                result = getattr(context, name)(handle, *args)
+            except Exception as e:
+                reply(
+                    (
+                        SlaveProcessError(
+                            f"calling {name} on the slave hosted by the worker process failed: {e}"
+                        ),
+                        [],
+                    )
+                )
+                continue
+
+            if name == "free_instance":
+                reply((result, []))
+                break
+
+            if name == "free_fmu_state" and id(args[0]) in keys:
+                del states[keys.pop(id(args[0]))]
+
+            # replace captured states by references to these
+            if (
+                isinstance(result, tuple)
+                and result
+                and isinstance(result[0], Fmi2SlaveState)
+            ):
+                state = result[0]
+                if id(state) not in keys:
+                    keys[id(state)] = next_key
+                    states[next_key] = state
+                    next_key += 1
+                result = (Fmi2RemoteState(keys[id(state)]), *result[1:])
+
+            reply((result, [args[i] for i in writable]))
+
+    finally:
+        requests.release()
+        responses.release()
+        shm.close()
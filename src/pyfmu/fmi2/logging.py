@@ -1,10 +1,10 @@
 """Defines logging related functionality
 """
-from typing import Iterable, List, Callable, Optional
+from typing import Iterable, List, Callable, Optional, Union, Deque, Dict, Tuple
 from abc import ABC, abstractmethod
-import logging
-from traceback import format_exc, format_stack
+from collections import deque
 
+from pyfmu.fmi2.exception import SlaveConfigError
 from pyfmu.fmi2.types import Fmi2Status, Fmi2Status, Fmi2Status_T, Fmi2LoggingCallback
 
 
@@ -13,6 +13,9 @@ _internal_log_catergory = "pyfmu"
 # default parameter for events
 _default_category = "events"
 
+# a message is either a string or a callable producing it, see Fmi2LoggerBase.log
+Fmi2LogMessage_T = Union[str, Callable[[], str]]
+
 
 # class Fmi2StdLogCats:
 #     """Standard log categories defined in the FMI2 specification.
@@ -285,6 +288,41 @@ _default_category = "events"
 #         pass
 
 
+def _is_warning(msg, category, status) -> bool:
+    return status == Fmi2Status.warning
+
+
+def _is_discard(msg, category, status) -> bool:
+    return status == Fmi2Status.discard
+
+
+def _is_error(msg, category, status) -> bool:
+    return status == Fmi2Status.error
+
+
+def _is_fatal(msg, category, status) -> bool:
+    return status == Fmi2Status.fatal
+
+
+def _is_pending(msg, category, status) -> bool:
+    return status == Fmi2Status.pending
+
+
+def _is_any(msg, category, status) -> bool:
+    return True
+
+
+# predicates of the standard categories, shared by every logger rather than created per instance
+_standard_categories: Dict[str, Callable[[str, str, Fmi2Status_T], bool]] = {
+    "logStatusWarning": _is_warning,
+    "logStatusDiscard": _is_discard,
+    "logStatusError": _is_error,
+    "logStatusFatal": _is_fatal,
+    "logStatusPending": _is_pending,
+    "logAll": _is_any,
+}
+
+
 class Fmi2LoggerBase(ABC):
     """Logger object specific to a given slave instance.
 
@@ -292,21 +330,19 @@ class Fmi2LoggerBase(ABC):
     https://docs.python.org/3/library/logging.html
     """
 
-    _fmi_to_log_categories = {
-        Fmi2Status.ok: logging.INFO,
-        Fmi2Status.warning: logging.WARNING,
-        Fmi2Status.discard: logging.WARNING,
-        Fmi2Status.error: logging.ERROR,
-        Fmi2Status.fatal: logging.CRITICAL,
-    }
-
     def __init__(self,):
         self._category_to_predicates = {}
         self._active_categories = set()
+        self._active_predicates: List[Callable[[str, str, Fmi2Status_T], bool]] = []
         self._log_all = False
 
     def ok(
-        self, msg: str, category: str = None, exc_info=False, stack_info=False,
+        self,
+        msg: Fmi2LogMessage_T,
+        category: str = None,
+        exc_info=False,
+        stack_info=False,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.ok,
@@ -314,15 +350,17 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def warning(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.warning,
@@ -330,15 +368,17 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def discard(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.discard,
@@ -346,15 +386,17 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def error(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.error,
@@ -362,15 +404,17 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def fatal(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.fatal,
@@ -378,15 +422,17 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def pending(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self.log(
             status=Fmi2Status.pending,
@@ -394,32 +440,48 @@ class Fmi2LoggerBase(ABC):
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log(
         self,
         status: Fmi2Status_T,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
+        """Log a message, if it matches one of the active categories.
 
-        if not self._log_all:
-            possible_predicates = [
-                p
-                for c, p in self._category_to_predicates.items()
-                if c in self._active_categories
-            ]
+        Formatting of the message is deferred until it is known that the message is logged.
+        The message may either be a string, which is formatted using %-style formatting if
+        args are provided, or a callable returning the message.
+
+        Examples:
 
-            for p in possible_predicates:
+            >>> logger.ok("state is %s", args=(state,))
+            >>> logger.ok(lambda: f"jacobian is {compute_jacobian()}")
+
+        Note that the predicates of the categories are invoked with the message prior to formatting.
+        """
+
+        if not self._log_all:
+            for p in self._active_predicates:
                 if p(msg, category, status):
                     break
             else:
                 return
 
+        if callable(msg):
+            msg = msg()
+        elif args:
+            msg = msg % args
+
         if exc_info:
+            from traceback import format_exc
+
             msg = f"{msg}\n{format_exc()}"
 
         if stack_info or stack_level:
@@ -430,10 +492,29 @@ class Fmi2LoggerBase(ABC):
 
         self.do_log(status, msg, category)
 
+    def is_enabled(self, status: Fmi2Status_T, category: str = None) -> bool:
+        """Returns true if a message with the specified status and category would be logged.
+
+        This allows slaves to skip computing expensive diagnostics entirely when these are filtered.
+        Predicates are invoked with an empty message.
+        """
+        if self._log_all:
+            return True
+
+        for p in self._active_predicates:
+            if p("", category, status):
+                return True
+
+        return False
+
     @abstractmethod
     def do_log(self, status, msg, category):
         pass
 
+    def flush(self) -> None:
+        """Deliver any messages held back by the logger, by default messages are delivered immediately."""
+        pass
+
     def set_debug_logging(self, logging_on: bool, categories: List[str]):
         """Set the active categories for which messages are passed to the evironment.          
 
@@ -449,17 +530,73 @@ class Fmi2LoggerBase(ABC):
         # special case dictated by fmi specification 2.1.5 p.21
         if logging_on and categories == []:
             self._log_all = True
+        elif logging_on:
+            self._log_all = False
+            self._active_categories = set(categories)
+        elif categories == []:
+            self._log_all = False
+            self._active_categories = set()
         else:
-            self._active_categories = categories
+            self._active_categories = self._active_categories.difference(categories)
+
+        self._update_active_predicates()
 
     def register_new_category(
         self, category: str, predicate: Callable[[str, str, Fmi2Status_T], bool]
     ):
         assert category not in self._category_to_predicates
         self._category_to_predicates[category] = predicate
+        self._update_active_predicates()
+
+    def register_standard_categories(self) -> None:
+        """Register the status categories defined by the FMI specification, along with the logAll category."""
+        assert not self._category_to_predicates.keys() & _standard_categories.keys()
+        self._category_to_predicates.update(_standard_categories)
+        self._update_active_predicates()
+
+    def inherit_categories(self, other: "Fmi2LoggerBase") -> None:
+        """Register every category registered with another logger, such as that of the slave a slave is cloned from."""
+        self._category_to_predicates.update(other._category_to_predicates)
+        self._update_active_predicates()
+
+    def _update_active_predicates(self):
+        """Precompute the predicates of the active categories, such that these need not be looked up for every message."""
+        self._active_predicates = [
+            p
+            for c, p in self._category_to_predicates.items()
+            if c in self._active_categories
+        ]
+
+
+class Fmi2LogOverflow:
+    """Defines what happens when a message is logged while the buffer of a buffered logger is full.
+
+    Values:
+        * drop_oldest: the oldest message in the buffer is discarded to make room for the new message.
+        * block: the buffer is delivered to the environment immediately, before the new message is added.
+        * summarize: the new message is discarded, when the buffer is flushed a single message summarizing the discarded messages is delivered.
+    """
+
+    drop_oldest: str = "drop_oldest"
+    block: str = "block"
+    summarize: str = "summarize"
 
 
 class FMI2CallbackLogger(Fmi2LoggerBase):
+    """Logger passing messages to the logging callback provided by the environment.
+
+    By default every message is passed to the callback as it is logged. Alternatively the logger may buffer
+    messages in a bounded ring buffer, which is delivered in a batch when flush is called.
+    The slave context flushes the buffer when the FMI function currently executing returns,
+    e.g. at the end of do_step or get_xxx.
+
+    Buffering is enabled using the "logging" key of the slave configuration, for example:
+
+        "logging": {"buffer_size": 1024, "overflow": "drop_oldest"}
+
+    see *Fmi2LogOverflow* for the overflow policies.
+    """
+
     def __init__(
         self, instance_name: str, slave_handle: int, callback: Fmi2LoggingCallback,
     ):
@@ -468,9 +605,102 @@ class FMI2CallbackLogger(Fmi2LoggerBase):
         self._callback = callback
         self._slave_handle = slave_handle
         self._instance_name = instance_name
+        self._buffer: Optional[Deque[Tuple[Fmi2Status_T, str, str]]] = None
+        self._buffer_size = 0
+        self._overflow = Fmi2LogOverflow.drop_oldest
+        self._summarized: Dict[Fmi2Status_T, int] = {}
+        self.dropped = 0
+
+    def set_callback(self, callback: Fmi2LoggingCallback) -> None:
+        """Replace the callback to which messages are delivered."""
+        self._callback = callback
+
+    def set_buffering(
+        self, buffer_size: Optional[int], overflow: str = Fmi2LogOverflow.drop_oldest
+    ) -> None:
+        """Enable buffering of messages, or disable it if buffer_size is None.
+
+        Args:
+            buffer_size: maximal number of messages held in the buffer.
+            overflow: policy used when a message is logged while the buffer is full, see *Fmi2LogOverflow*.
+        """
+
+        if overflow not in {
+            Fmi2LogOverflow.drop_oldest,
+            Fmi2LogOverflow.block,
+            Fmi2LogOverflow.summarize,
+        }:
+            raise SlaveConfigError(
+                f"Unrecognized log overflow policy: {overflow}, valid options are: drop_oldest, block and summarize"
+            )
+
+        if buffer_size is not None and buffer_size < 1:
+            raise SlaveConfigError(
+                f"The size of the log buffer must be positive, got: {buffer_size}"
+            )
+
+        self.flush()
+        self._buffer = None if buffer_size is None else deque()
+        self._buffer_size = buffer_size
+        self._overflow = overflow
+
+    def configure(self, config: dict) -> None:
+        """Configure buffering as declared by the "logging" key of a slave configuration, if present."""
+        logging_config = config.get("logging")
+
+        if logging_config is None:
+            return
+
+        try:
+            self.set_buffering(
+                logging_config.get("buffer_size"),
+                logging_config.get("overflow", Fmi2LogOverflow.drop_oldest),
+            )
+        except AttributeError as e:
+            raise SlaveConfigError(
+                f"The logging configuration must be an object, got: {logging_config}"
+            ) from e
 
     def do_log(self, status: Fmi2Status_T, msg: str, category: str):
-        self._callback(self._instance_name, status, category, msg)
+
+        if self._buffer is None:
+            self._callback(self._instance_name, status, category, msg)
+            return
+
+        if len(self._buffer) >= self._buffer_size:
+
+            if self._overflow == Fmi2LogOverflow.block:
+                self.flush()
+            elif self._overflow == Fmi2LogOverflow.drop_oldest:
+                self._buffer.popleft()
+                self.dropped += 1
+            else:
+                self._summarized[status] = self._summarized.get(status, 0) + 1
+                self.dropped += 1
+                return
+
+        self._buffer.append((status, category, msg))
+
+    def flush(self) -> None:
+        """Deliver the buffered messages to the environment in the order these were logged."""
+
+        if not self._buffer and not self._summarized:
+            return
+
+        buffer, self._buffer = self._buffer, deque()
+
+        for status, category, msg in buffer:
+            self._callback(self._instance_name, status, category, msg)
+
+        if self._summarized:
+            summarized, self._summarized = self._summarized, {}
+            counts = ", ".join(f"{n} with status {s}" for s, n in summarized.items())
+            self._callback(
+                self._instance_name,
+                max(summarized),
+                _internal_log_catergory,
+                f"{sum(summarized.values())} messages were dropped since the log buffer was full: {counts}",
+            )
 
 
 class FMI2PrintLogger(Fmi2LoggerBase):
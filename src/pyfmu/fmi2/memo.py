@@ -0,0 +1,117 @@
+"""Defines the memo table holding the outputs computed by the steps of a stateless slave."""
+
+import os
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from pyfmu.fmi2.accessors import Fmi2Accessors, _is_read_only
+from pyfmu.fmi2.exception import SlaveConfigError
+from pyfmu.fmi2.types import Fmi2ScalarVariable
+
+
+class Fmi2StepMemo:
+    """Table mapping the values of the inputs and parameters of a stateless slave to the outputs computed by its step.
+
+    When a step is requested with inputs and parameters for which the outputs are in the table, the outputs
+    are restored rather than computed by the slave, see *Fmi2Slave.stateless*. Outputs computed by properties
+    are not stored, since these are derived from the inputs when read.
+
+    Values:
+        * lru: once the table is full, the entry which was least recently stored or restored is evicted.
+        * fifo: once the table is full, the entry which was stored first is evicted.
+
+    The number of entries and the eviction policy may be declared in the slave configuration using the keys
+    "step_memo_size" and "step_memo_policy". The environment variables PYFMU_STEP_MEMO_SIZE and
+    PYFMU_STEP_MEMO_POLICY take precedence over the configuration. A size of 0, the default, disables the table.
+    """
+
+    lru = "lru"
+    fifo = "fifo"
+
+    __slots__ = ("size", "policy", "table", "inputs", "getters", "setters")
+
+    def __init__(self, size: int, policy: str = "lru"):
+
+        if policy not in {self.lru, self.fifo}:
+            raise SlaveConfigError(
+                f"Unrecognized step memo policy: {policy}, valid options are: lru and fifo"
+            )
+
+        if size < 0:
+            raise SlaveConfigError(
+                f"The size of the step memo must be non-negative, got: {size}"
+            )
+
+        self.size = size
+        self.policy = policy
+        self.table: OrderedDict = OrderedDict()
+        self.inputs = []
+        self.getters = []
+        self.setters = []
+
+    @staticmethod
+    def from_configuration(config: dict) -> Optional["Fmi2StepMemo"]:
+        """Create the table declared by a slave configuration, or None if it is disabled."""
+        policy = os.environ.get(
+            "PYFMU_STEP_MEMO_POLICY", config.get("step_memo_policy", "lru")
+        )
+        size = os.environ.get("PYFMU_STEP_MEMO_SIZE", config.get("step_memo_size", 0))
+
+        try:
+            size = int(size)
+        except ValueError as e:
+            raise SlaveConfigError(
+                f"The size of the step memo must be an integer, got: {size}"
+            ) from e
+
+        memo = Fmi2StepMemo(size, policy)
+        return memo if size > 0 else None
+
+    def bind(
+        self,
+        slave: object,
+        variables: Iterable[Fmi2ScalarVariable],
+        accessors: Fmi2Accessors,
+    ) -> None:
+        """Bind the table to the inputs, parameters and settable outputs of a slave instance."""
+        for v in variables:
+            vref = v.value_reference
+
+            if v.causality in {"input", "parameter"}:
+                self.inputs.append(accessors.refs_to_getters[vref])
+            elif v.causality == "output" and not _is_read_only(slave, v.name):
+                self.getters.append(accessors.refs_to_getters[vref])
+                self.setters.append(accessors.refs_to_setters[vref])
+
+    def key(self) -> Optional[tuple]:
+        """Returns the current values of the inputs and parameters, or None if these can not be used as a key."""
+        key = tuple([g() for g in self.inputs])
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def restore(self, key: tuple) -> bool:
+        """Set the outputs to those stored for the key, returning false if the key is not in the table."""
+        outputs = self.table.get(key)
+
+        if outputs is None:
+            return False
+
+        if self.policy == self.lru:
+            self.table.move_to_end(key)
+
+        for setter, value in zip(self.setters, outputs):
+            setter(value)
+
+        return True
+
+    def store(self, key: tuple) -> None:
+        """Store the current values of the outputs for the key, evicting an entry if the table is full."""
+        self.table[key] = tuple([g() for g in self.getters])
+
+        if len(self.table) > self.size:
+            self.table.popitem(last=False)
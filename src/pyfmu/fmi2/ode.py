@@ -0,0 +1,310 @@
+"""Defines the base class of slaves whose behavior is described by a system of ordinary differential equations."""
+
+from array import array
+from math import inf, isclose
+from typing import Optional
+
+from pyfmu.fmi2.exception import SlaveAttributeError
+from pyfmu.fmi2.logging import Fmi2LoggerBase
+from pyfmu.fmi2.slave import Fmi2Slave
+from pyfmu.fmi2.types import Fmi2Initial_T, Fmi2Status, Fmi2Status_T
+
+# explicit Runge-Kutta methods of scipy.integrate, whose steps advance the states of every member of an ensemble independently
+_explicit_methods = {"RK23", "RK45", "DOP853"}
+
+
+class Fmi2OdeSlave(Fmi2Slave):
+    """Slave whose states are defined by a system of ordinary differential equations, dx/dt = f(t, x), solved using scipy.
+
+    States are registered using register_state and are kept in an array of their own, which is exposed
+    to the slave as a numpy vector, see *state*. Subclasses implement derivatives, reading their inputs
+    and parameters from their attributes, and each step advances the states to the end of the step.
+
+    The solver is kept between steps, such that its steps are independent of the communication points: each
+    step advances the solver past the end of the step and interpolates the states at the end of the step using
+    its dense output. The solver is created again, starting from the states in the state vector, once the
+    environment changes the inputs or states of the slave, see variables_changed, or once a step does not
+    start where the previous one ended. The new solver starts from the step size of the previous one, rather
+    than estimating an initial step size, which would cost additional evaluations of the derivatives.
+    Only the public interface of the solvers of scipy.integrate is used.
+
+    Slaves whose derivatives are vectorized may be run as an ensemble, see *Fmi2Ensemble*, in which case
+    the state is a matrix whose columns hold the states of each member. The states of every member are advanced
+    by a single solver, whose step size is chosen such that the error of every member is within tolerance.
+
+    Example:
+
+        >>> class Decay(Fmi2OdeSlave):
+        ...     def __init__(self):
+        ...         super().__init__("Decay")
+        ...         self.x = 1.0
+        ...         self.register_state("x")
+        ...
+        ...     def derivatives(self, t, x):
+        ...         return -x
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        *args,
+        method: str = "RK45",
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+        max_step: float = inf,
+        vectorized: bool = False,
+        **kwargs,
+    ):
+        """
+        Args:
+            model_name: name of the model, see Fmi2Slave.
+            method: name of the solver in scipy.integrate, such as RK45, DOP853, Radau, BDF or LSODA. Defaults to RK45.
+            rtol: relative tolerance of the solver, replaced by the tolerance passed to setup_experiment. Defaults to 1e-3.
+            atol: absolute tolerance of the solver. Defaults to 1e-6.
+            max_step: largest step taken by the solver. Defaults to no limit.
+            vectorized: whether derivatives accepts a matrix whose columns each hold the states, returning
+                a matrix of derivatives. This allows implicit methods, such as Radau and BDF, to approximate
+                the Jacobian using a single call rather than a call per state. Defaults to False.
+        """
+        super().__init__(model_name, *args, **kwargs)
+
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.vectorized = vectorized
+
+        self._states = array("d")
+        self._x = None
+        self._step_size: Optional[float] = None
+        self._stop_time = inf
+
+        # the solver advancing the states, the interpolant of its last step and the time at which the previous step ended
+        self._solver = None
+        self._dense = None
+        self._time: Optional[float] = None
+
+    @property
+    def state(self) -> "numpy.ndarray":  # noqa: F821
+        """The values of the states in the order in which these are registered.
+
+        The vector shares its memory with the state variables, such that assigning to an element
+        of the vector sets the corresponding variable and vice versa. For an ensemble the state is
+        a matrix with a row for each state and a column for each member.
+        """
+        if self._x is None:
+            import numpy as np
+
+            self._x = np.frombuffer(self._states, dtype=float)
+
+        return self._x
+
+    def register_state(
+        self,
+        attr_name: str,
+        description: str = None,
+        initial: Fmi2Initial_T = "exact",
+    ) -> None:
+        """Register a continuous real output as a state of the system, whose derivative is returned by derivatives.
+
+        States must be registered before the state vector is used, since the vector can not grow while
+        numpy refers to its memory.
+
+        Args:
+            attr_name: name of the attribute holding the state.
+            description: description of the variable. Defaults to None.
+            initial: whether the start value of the state is given by the attribute, "exact", or is calculated
+                during initialization, "calculated". Defaults to "exact".
+        """
+        self._x = None
+
+        try:
+            self._states.append(0.0)
+        except BufferError:
+            raise SlaveAttributeError(
+                f"Unable to register the state {attr_name}, the state vector is referenced by another object"
+            ) from None
+        self._states.pop()
+
+        self._register_variable(
+            attr_name, "real", "output", "continuous", initial, description, "attribute"
+        )
+
+        if not self._storage.add(
+            self,
+            attr_name,
+            "real",
+            self._names_to_variables[attr_name].value_reference,
+            self._states,
+        ):
+            raise SlaveAttributeError(
+                f"Unable to register the state {attr_name}, states must be plain attributes"
+            )
+
+    def derivatives(self, t: float, x: "numpy.ndarray") -> "numpy.ndarray":  # noqa: F821
+        """Returns the derivatives of the states.
+
+        Args:
+            t: the time at which the derivatives are evaluated.
+            x: vector of states ordered like the registered states. If the slave is vectorized, x may instead
+                be a matrix whose columns each hold a vector of states, in which case a matrix must be returned.
+        """
+        raise NotImplementedError()
+
+    def do_step(
+        self, current_time: float, step_size: float, no_set_fmu_state_prior: bool
+    ) -> Fmi2Status_T:
+
+        end = current_time + step_size
+        solver = self._solver
+
+        # communication points computed by the master may differ from the end of the previous step by a rounding error
+        if (
+            solver is None
+            or not isclose(current_time, self._time, rel_tol=1e-9)
+            or end > solver.t_bound
+        ):
+            solver = self._solver = self._create_solver(current_time, end)
+            self._dense = None
+
+        message = None
+        while solver.t < end and solver.status == "running":
+            message = solver.step()
+
+        if solver.status == "failed":
+            self.log_error(
+                f"The solver failed to advance the states from {current_time} to {end}: {message}"
+            )
+            self._solver = None
+            self._step_size = None
+            return Fmi2Status.error
+
+        # the solver may have stepped past the end of the step, the interpolant of a step is created once
+        # since some methods evaluate the derivatives to create it
+        if solver.t == end:
+            y = solver.y
+        else:
+            if self._dense is None or self._dense.t != solver.t:
+                self._dense = solver.dense_output()
+            y = self._dense(end)
+
+        self.state[:] = y.reshape(self.state.shape)
+        self._time = end
+        return Fmi2Status.ok
+
+    def variables_changed(self) -> None:
+        """Discard the solver, such that the next step creates a solver starting from the current states.
+
+        This is invoked by the slave context when the environment sets variables of the slave or restores its
+        state after a step. Code invoking the slave directly must invoke it after changing the slave.
+        """
+        if self._solver is not None:
+            self._step_size = self._solver.step_size or self._step_size
+            self._solver = None
+
+    def _create_solver(self, t0: float, end: float):
+        import scipy.integrate
+
+        try:
+            method = getattr(scipy.integrate, self.method)
+        except AttributeError:
+            raise SlaveAttributeError(
+                f"Unrecognized method: {self.method}, the method must name a solver of scipy.integrate"
+            ) from None
+
+        t_bound = max(self._stop_time, end)
+
+        first_step = self._step_size
+        if first_step is not None:
+            first_step = min(first_step, t_bound - t0) or None
+
+        state = self.state
+        if state.ndim == 1:
+            fun = self.derivatives
+        else:
+            # the solver integrates the states of an ensemble as a single flat vector
+            def fun(t, y):
+                return self.derivatives(t, y.reshape(state.shape)).reshape(-1)
+
+        return method(
+            fun,
+            t0,
+            state.flatten(),
+            t_bound,
+            max_step=self.max_step,
+            rtol=self.rtol,
+            atol=self.atol,
+            vectorized=self.vectorized,
+            first_step=first_step,
+        )
+
+    def enter_ensemble(self, n_members: int) -> None:
+        """Extend the state vector to a matrix with a column for each member, see *Fmi2Slave.enter_ensemble*.
+
+        Raises:
+            SlaveAttributeError: raised if the derivatives are not vectorized or if an implicit method is used,
+                since its Jacobian would couple the states of every member.
+        """
+        if not self.vectorized or self.method not in _explicit_methods:
+            raise SlaveAttributeError(
+                f"Only vectorized slaves using one of the methods {', '.join(sorted(_explicit_methods))} can be run as an ensemble"
+            )
+
+        states = sorted(
+            (offset, name)
+            for name, (values, offset) in self._storage.locations.items()
+            if values is self._states
+        )
+
+        super().enter_ensemble(n_members)
+        self._solver = None
+
+        import numpy as np
+
+        self._x = np.stack([self.__dict__.pop(name) for _, name in states])
+
+        for offset, name in states:
+            vref = self._names_to_variables[name].value_reference
+            self._storage.locations[name] = (self._x, offset)
+            self._storage.refs_to_locations[vref] = (self._x, offset)
+
+    def get_state(self) -> object:
+        """Returns the step size of the solver, such that restoring the state reproduces the steps taken after it.
+
+        The solver is discarded, such that the steps following the capture of the state are taken by
+        a new solver, like those following its restoration.
+        Subclasses with additional hidden state should include this in the state they return.
+        """
+        self.variables_changed()
+        return self._step_size
+
+    def set_state(self, state: object) -> None:
+        self._solver = None
+        self._step_size = state
+
+    def clone(self, logger: Fmi2LoggerBase) -> "Fmi2OdeSlave":
+        # the solver evaluates the derivatives of this slave, the clone creates its own
+        solver, self._solver = self._solver, None
+        try:
+            clone = super().clone(logger)
+        finally:
+            self._solver = solver
+
+        # the vector of the clone must refer to its own array, it is created again when first used
+        clone._x = None
+        return clone
+
+    def setup_experiment(
+        self, start_time: float, stop_time: float = None, tolerance: float = None
+    ) -> Fmi2Status_T:
+        if tolerance is not None:
+            self.rtol = tolerance
+
+        self._stop_time = inf if stop_time is None else stop_time
+        self._solver = None
+        return Fmi2Status.ok
+
+    def reset(self) -> Fmi2Status_T:
+        self._solver = None
+        self._step_size = None
+        return Fmi2Status.ok
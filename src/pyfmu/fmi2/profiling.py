@@ -0,0 +1,158 @@
+"""Defines the profiler recording where time is spent by the FMI calls made on a slave instance."""
+
+import os
+from time import perf_counter_ns
+from typing import Callable, Dict
+
+from pyfmu.fmi2.types import Fmi2LoggingCallback
+
+
+def _bucket(ns: int) -> int:
+    """Returns the index of the histogram bucket of a duration, buckets divide each power of two into four."""
+    if ns < 8:
+        return ns
+
+    n_bits = ns.bit_length()
+    return (n_bits << 2) | ((ns >> (n_bits - 3)) & 3)
+
+
+def _bucket_upper_bound(bucket: int) -> int:
+    """Returns the exclusive upper bound in nanoseconds of the durations held by a histogram bucket."""
+    if bucket < 8:
+        return bucket + 1
+
+    n_bits, quarter = bucket >> 2, bucket & 3
+    return (5 + quarter) << (n_bits - 3)
+
+
+class Fmi2CallStatistics:
+    """Number of calls, durations and number of values transferred by a single function.
+
+    Durations are recorded in a histogram whose buckets are a quarter of a power of two wide,
+    such that percentiles are accurate to within 25 percent regardless of the magnitude of the durations.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns", "values", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.values = 0
+        self.histogram: Dict[int, int] = {}
+
+    def record(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+        bucket = _bucket(ns)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Returns an upper bound in seconds of the duration within which q percent of the calls completed."""
+        if self.count == 0:
+            return 0.0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(_bucket_upper_bound(bucket), self.max_ns) / 1e9
+
+        return self.max_ns / 1e9
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total_ns / 1e9,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max_ns / 1e9,
+            "values": self.values,
+        }
+
+
+class Fmi2Profiler:
+    """Records the FMI calls made on a single slave instance, see *Fmi2SlaveContext.get_statistics*.
+
+    For every FMI function the number of calls, their latency and the number of values transferred are recorded.
+    Separately, the time spent in the methods of the slave, in delivering log messages to the environment
+    and in validating the types of values is recorded.
+
+    Profiling is enabled by setting "profiling" to true in the slave configuration, or by setting the
+    environment variable PYFMU_PROFILE, which takes precedence over the configuration.
+    When the instance is freed, the statistics are appended as a line of JSON to the file named by
+    PYFMU_PROFILE_OUTPUT, or are otherwise logged using the category "profiling".
+    """
+
+    def __init__(self, instance_name: str):
+        self.instance_name = instance_name
+        self.calls: Dict[str, Fmi2CallStatistics] = {}
+        self.slave: Dict[str, Fmi2CallStatistics] = {}
+        self.logging = Fmi2CallStatistics()
+        self.validation = Fmi2CallStatistics()
+
+    @staticmethod
+    def enabled(config: dict) -> bool:
+        """Returns true if profiling is enabled by the environment or by the slave configuration."""
+        profile = os.environ.get("PYFMU_PROFILE")
+
+        if profile is not None:
+            return profile.lower() not in {"", "0", "false", "no", "off"}
+
+        return config.get("profiling", False) is True
+
+    def call(self, name: str) -> Fmi2CallStatistics:
+        """Returns the statistics of an FMI function."""
+        try:
+            return self.calls[name]
+        except KeyError:
+            return self.calls.setdefault(name, Fmi2CallStatistics())
+
+    def record_slave(self, name: str, ns: int) -> None:
+        """Record the duration of a call to a method of the slave."""
+        try:
+            statistics = self.slave[name]
+        except KeyError:
+            statistics = self.slave.setdefault(name, Fmi2CallStatistics())
+        statistics.record(ns)
+
+    def timed_callback(self, callback: Fmi2LoggingCallback) -> Fmi2LoggingCallback:
+        """Returns a logging callback recording the time spent by the environment handling each message."""
+        logging = self.logging
+
+        def timed(instance_name, status, category, message):
+            started = perf_counter_ns()
+            try:
+                callback(instance_name, status, category, message)
+            finally:
+                logging.record(perf_counter_ns() - started)
+
+        return timed
+
+    def to_dict(self) -> dict:
+        """Returns the statistics, durations are in seconds."""
+        return {
+            "instance_name": self.instance_name,
+            "calls": {n: s.to_dict() for n, s in self.calls.items()},
+            "slave": {n: s.to_dict() for n, s in self.slave.items()},
+            "logging": self.logging.to_dict(),
+            "validation": self.validation.to_dict(),
+        }
+
+    def dump(self, log: Callable[[str], None]) -> None:
+        """Write the statistics to the file named by PYFMU_PROFILE_OUTPUT, or pass these to log if it is not set."""
+        import json
+
+        statistics = json.dumps(self.to_dict())
+        path = os.environ.get("PYFMU_PROFILE_OUTPUT")
+
+        if not path:
+            log(statistics)
+            return
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(statistics + "\n")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Literal, Callable
-from uuid import uuid4
+from array import array
+
+from typing import Dict, List, Tuple, Optional, Literal, Callable, Sequence, Union
 from pyfmu.fmi2.exception import SlaveAttributeError
-from pyfmu.fmi2.logging import Fmi2LoggerBase, FMI2PrintLogger
+from pyfmu.fmi2.logging import Fmi2LoggerBase, FMI2PrintLogger, Fmi2LogMessage_T
+from pyfmu.fmi2.storage import (
+    Fmi2ArrayStorage,
+    Fmi2ArrayVariable,
+    Fmi2ComputedVariable,
+)
 
 from pyfmu.fmi2.types import (
     Fmi2Status,
@@ -14,10 +20,29 @@ from pyfmu.fmi2.types import (
     Fmi2Variability_T,
     Fmi2Causality_T,
     Fmi2Initial_T,
+    _check_declaration,
+    _check_start,
+    _must_define_start,
+    _type_to_pyType,
 )
 
+# defaults of register_variables for each causality, matching those of register_input, register_output and register_parameter
+_default_variability = {"parameter": "tunable", "calculatedParameter": "tunable"}
+_default_initial = {"parameter": "exact", "input": None, "independent": None}
+
 
 class Fmi2Slave:
+
+    # create instances by cloning a prototype rather than invoking the constructor, see clone
+    clone_instances = False
+
+    # the variables may hold a vector of values, one for each member of an ensemble, see enter_ensemble
+    supports_ensembles = False
+
+    # the outputs are a function of the inputs and parameters alone, allowing the context to skip
+    # steps when neither has changed since the previous step, see Fmi2SlaveContext
+    stateless = False
+
     def __init__(
         self,
         model_name: str,
@@ -27,6 +52,7 @@ class Fmi2Slave:
         description: str = None,
         logger: Fmi2LoggerBase = None,
         register_standard_log_categories=True,
+        storage: Literal["attribute", "array"] = "attribute",
     ):
         """Constructs a new FMI2 slave
 
@@ -37,6 +63,7 @@ class Fmi2Slave:
             version (str, optional): [description]. Defaults to None.
             description (str, optional): [description]. Defaults to None.
             logger (FMI2SlaveLogger, optional): [description]. Defaults to None.
+            storage: default storage of registered variables, see register_input. Defaults to "attribute".
         """
 
         self.author = author
@@ -44,35 +71,43 @@ class Fmi2Slave:
         self.description = description
         self.model_name = model_name
         self.license = license
-        self.guid = str(uuid4())
+        self._guid: Optional[str] = None
 
         if logger is None:
             logger = FMI2PrintLogger(model_name=model_name)
 
         self._variables: List[Fmi2ScalarVariable] = []
+        self._names_to_variables: Dict[str, Fmi2ScalarVariable] = {}
+        self._refs_to_variables: Dict[int, Fmi2ScalarVariable] = {}
         self._version = version
         self._value_reference_counter = 0
-        self._used_value_references = {}
         self._logger = logger
+        self._storage = Fmi2ArrayStorage()
+        self._default_storage = storage
+
+        # functions computing the outputs evaluated on demand, and their values since they were last invalidated
+        self._computed: Dict[str, Callable[["Fmi2Slave"], Fmi2Value_T]] = {}
+        self._computed_values: Dict[str, Fmi2Value_T] = {}
 
         if register_standard_log_categories:
+            self._logger.register_standard_categories()
 
-            self.register_log_category(
-                "logStatusWarning", lambda m, c, s: c == Fmi2Status.warning
-            )
-            self.register_log_category(
-                "logStatusDiscard", lambda m, c, s: c == Fmi2Status.discard
-            )
-            self.register_log_category(
-                "logStatusError", lambda m, c, s: s == Fmi2Status.error
-            )
-            self.register_log_category(
-                "logStatusFatal", lambda m, c, s: s == Fmi2Status.fatal
-            )
-            self.register_log_category(
-                "logStatusPending", lambda m, c, s: s == Fmi2Status.pending
-            )
-            self.register_log_category("logAll", lambda m, c, s: True)
+    @property
+    def guid(self) -> str:
+        """Globally unique identifier of the model, generated when first read unless assigned by the slave.
+
+        The identifier is only needed when the model description is extracted, thus generating it lazily
+        spares instantiations of the exported slave from importing uuid.
+        """
+        if self._guid is None:
+            from uuid import uuid4
+
+            self._guid = str(uuid4())
+        return self._guid
+
+    @guid.setter
+    def guid(self, guid: str) -> None:
+        self._guid = guid
 
     def register_input(
         self,
@@ -80,6 +115,7 @@ class Fmi2Slave:
         data_type: Literal["real", "integer", "boolean", "string"] = "real",
         variability: Literal["continuous", "discrete"] = "continuous",
         description: str = None,
+        storage: Literal["attribute", "array"] = None,
     ) -> None:
         """Declares a new input of the model.
 
@@ -90,9 +126,13 @@ class Fmi2Slave:
             data_type: the underlying type of the variable. Defaults to "real".
             variability: defines when the variable may change value with respect to time. Defaults to "continuous".
             description: text added to model description, often displayed by simulation environment. Defaults to None.
+            storage: where the value of the variable is kept. Using "attribute" the value is stored as a plain attribute
+                of the slave. Using "array" reals, integers and booleans are stored in typed contiguous arrays, which
+                the slave context reads and writes directly, while the attribute remains accessible as *self.attr_name*.
+                Defaults to the storage passed to the constructor.
         """
         self._register_variable(
-            attr_name, data_type, "input", variability, None, description
+            attr_name, data_type, "input", variability, None, description, storage
         )
 
     def register_output(
@@ -102,27 +142,253 @@ class Fmi2Slave:
         variability: Literal["constant", "discrete", "continuous"] = "continuous",
         initial: Literal["approx", "calculated", "exact"] = "calculated",
         description: str = None,
+        storage: Literal["attribute", "array"] = None,
+        compute: Callable[["Fmi2Slave"], Fmi2Value_T] = None,
     ) -> None:
         """Declares a new output of the model
 
         This is added to the model description as a scalar variable with causality=output.
+        See register_input for a description of the storage argument.
+
+        Outputs which are expensive to compute and may not be read by the environment, such as diagnostic signals,
+        may be computed on demand rather than by do_step. The value is computed when the output is first read
+        and is cached until the next step or until a variable is set, see invalidate_computed_outputs.
+
+        Args:
+            compute: function computing the value of the output from the slave, such as a method of its class.
+                Methods bound to the slave are also accepted. Outputs computed on demand must have initial=calculated
+                and can not be assigned.
         """
 
+        if compute is None:
+            self._register_variable(
+                attr_name,
+                data_type,
+                "output",
+                variability,
+                initial,
+                description,
+                storage,
+            )
+            return
+
+        if initial != "calculated":
+            raise SlaveAttributeError(
+                f"The output {attr_name} is computed on demand and must have initial=calculated, got: {initial}"
+            )
+
+        cls = type(self)
+        defined = next(
+            (c.__dict__[attr_name] for c in cls.__mro__ if attr_name in c.__dict__),
+            None,
+        )
+        if defined is not None and not isinstance(defined, Fmi2ComputedVariable):
+            raise SlaveAttributeError(
+                f"The output {attr_name} is computed on demand, but the class defines an attribute with the same name"
+            )
+
         self._register_variable(
-            attr_name, data_type, "output", variability, initial, description
+            attr_name, data_type, "output", variability, initial, description, "attribute"
         )
 
+        if defined is None:
+            setattr(cls, attr_name, Fmi2ComputedVariable(attr_name))
+
+        # bound methods are unbound, such that clones of the slave compute their own outputs
+        if getattr(compute, "__self__", None) is self:
+            compute = compute.__func__
+
+        self.__dict__.pop(attr_name, None)
+        self._computed[attr_name] = compute
+
+    def invalidate_computed_outputs(self) -> None:
+        """Discard the values of the outputs computed on demand, such that these are computed again when read.
+
+        This is invoked by the slave context after each step and whenever a variable is set.
+        Code invoking the slave directly must invoke it after changing the slave.
+        """
+        self._computed_values.clear()
+
     def register_parameter(
         self,
         attr_name: str,
         data_type: Literal["real", "integer", "boolean", "string"] = "real",
         variability: Literal["fixed", "tunable"] = "tunable",
         description: str = None,
+        storage: Literal["attribute", "array"] = None,
     ) -> None:
 
         self._register_variable(
-            attr_name, data_type, "parameter", variability, "exact", description
+            attr_name,
+            data_type,
+            "parameter",
+            variability,
+            "exact",
+            description,
+            storage,
+        )
+
+    def register_array_input(
+        self,
+        attr_name: str,
+        shape: Union[int, Sequence[int]],
+        data_type: Literal["real", "integer", "boolean"] = "real",
+        variability: Literal["continuous", "discrete"] = "continuous",
+        description: str = None,
+    ) -> List[int]:
+        """Declares an input holding an array of values, such as a 3-vector or the readings of a sensor array.
+
+        Each element is added to the model description as a scalar variable with causality=input, named using
+        the structured naming convention of FMI, such as *u[1]* or *u[2,3]*. Indices start at 1 and elements
+        are ordered row-major, the last index varying fastest, and are assigned consecutive value references.
+
+        The elements are kept in a single array, which the slave reads and writes as a numpy array *self.attr_name*.
+        Assigning to the attribute copies the assigned values into the array. If the attribute holds a value
+        before the variable is registered, this is broadcast to the shape of the array and used as the start value,
+        otherwise the elements start at zero. Booleans are stored as integers, like in FMI.
+
+        Since their value references are contiguous, the slave context exchanges the values of an array variable
+        with the environment using a single copy, see *get_value_block*.
+
+        Example:
+
+            >>> self.acceleration = [0.0, 0.0, -9.81]
+            >>> self.register_array_input("acceleration", 3)
+
+        Args:
+            attr_name: name of the variable.
+            shape: the number of elements, or the shape of a multidimensional array.
+            data_type: the underlying type of the elements. Defaults to "real".
+            variability: defines when the variable may change value with respect to time. Defaults to "continuous".
+            description: text added to the model description of each element. Defaults to None.
+
+        Returns:
+            the value references of the elements, in row-major order.
+        """
+        return self._register_array(
+            attr_name, shape, data_type, "input", variability, None, description
+        )
+
+    def register_array_output(
+        self,
+        attr_name: str,
+        shape: Union[int, Sequence[int]],
+        data_type: Literal["real", "integer", "boolean"] = "real",
+        variability: Literal["constant", "discrete", "continuous"] = "continuous",
+        initial: Literal["approx", "calculated", "exact"] = "calculated",
+        description: str = None,
+    ) -> List[int]:
+        """Declares an output holding an array of values, see register_array_input."""
+        return self._register_array(
+            attr_name, shape, data_type, "output", variability, initial, description
+        )
+
+    def register_array_parameter(
+        self,
+        attr_name: str,
+        shape: Union[int, Sequence[int]],
+        data_type: Literal["real", "integer", "boolean"] = "real",
+        variability: Literal["fixed", "tunable"] = "tunable",
+        description: str = None,
+    ) -> List[int]:
+        """Declares a parameter holding an array of values, see register_array_input."""
+        return self._register_array(
+            attr_name, shape, data_type, "parameter", variability, "exact", description
+        )
+
+    def _register_array(
+        self,
+        attr_name: str,
+        shape: Union[int, Sequence[int]],
+        data_type: Fmi2DataType_T,
+        causality: Fmi2Causality_T,
+        variability: Fmi2Variability_T,
+        initial: Optional[Fmi2Initial_T],
+        description: str = None,
+    ) -> List[int]:
+        """Expose an attribute of the slave as an array variable, registering a scalar variable per element.
+
+        Raises:
+            SlaveAttributeError: raised if the name is already registered, the class defines an attribute with
+                the same name, the shape is empty or the start value can not be broadcast to the shape.
+            InvalidVariableError: raised if the combination of data type, causality, variability and initial is illegal.
+        """
+        if (
+            attr_name in self._names_to_variables
+            or attr_name in self._storage.array_variables
+        ):
+            raise SlaveAttributeError(f"Attribute has already been registered.")
+
+        if data_type == "string":
+            raise SlaveAttributeError(
+                f"The array variable {attr_name} must hold reals, integers or booleans, got: {data_type}"
+            )
+
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        if not shape or any(n < 1 for n in shape):
+            raise SlaveAttributeError(
+                f"The array variable {attr_name} must have at least one element, got the shape: {shape}"
+            )
+
+        defined = next(
+            (
+                c.__dict__[attr_name]
+                for c in type(self).__mro__
+                if attr_name in c.__dict__
+            ),
+            None,
         )
+        if defined is not None and not isinstance(defined, Fmi2ArrayVariable):
+            raise SlaveAttributeError(
+                f"The array variable {attr_name} is stored by the slave, but the class defines an attribute with the same name"
+            )
+
+        _check_declaration(data_type, causality, variability, initial)
+
+        import numpy as np
+
+        pytype = _type_to_pyType[data_type]
+        start = self.__dict__.pop(attr_name, 0)
+
+        try:
+            values = np.broadcast_to(np.asarray(start, dtype=pytype), shape)
+        except (TypeError, ValueError) as e:
+            raise SlaveAttributeError(
+                f"Failed determining start values of the array variable {attr_name} with the shape {shape}: {e}"
+            ) from e
+
+        values = [pytype(v) for v in values.ravel().tolist()]
+        define_start = _must_define_start(causality, variability, initial)
+
+        references = []
+        for index, value in zip(np.ndindex(*shape), values):
+            value_reference = self._acquire_unused_value_reference()
+            name = f"{attr_name}[{','.join(str(i + 1) for i in index)}]"
+            self._add_variable(
+                Fmi2ScalarVariable._from_validated(
+                    name,
+                    data_type,
+                    causality,
+                    variability,
+                    value_reference,
+                    initial,
+                    value if define_start else None,
+                    description,
+                ),
+                "attribute",
+            )
+            references.append(value_reference)
+
+        if defined is None:
+            setattr(type(self), attr_name, Fmi2ArrayVariable(attr_name))
+
+        self._storage.add_array(attr_name, data_type, shape, references, values)
+        return references
+
+    @property
+    def variable_naming_convention(self) -> Literal["flat", "structured"]:
+        """The naming convention of the variables in the model description, structured if the slave has array variables."""
+        return "structured" if self._storage.array_variables else "flat"
 
     def _register_variable(
         self,
@@ -132,6 +398,7 @@ class Fmi2Slave:
         variability: Fmi2Variability_T,
         initial: Optional[Fmi2Initial_T],
         description: str = None,
+        storage: Literal["attribute", "array"] = None,
     ) -> None:
         """Expose an attribute of the slave as an variable of the model.
 
@@ -142,15 +409,27 @@ class Fmi2Slave:
             variability (Fmi2Variability_T): [description]
             initial (Optional[Fmi2Initial_T]): [description]
             description (str, optional): [description]. Defaults to None.
+            storage (str, optional): where the value is kept, see register_input. Defaults to None.
 
         Raises:
             Fmi2SlaveError: raised if a combination of variables are provided which does not
 
         """
 
-        if attr_name in [v.name for v in self.variables]:
+        if (
+            attr_name in self._names_to_variables
+            or attr_name in self._storage.array_variables
+        ):
             raise SlaveAttributeError(f"Attribute has already been registered.")
 
+        if storage is None:
+            storage = self._default_storage
+
+        if storage not in {"attribute", "array"}:
+            raise SlaveAttributeError(
+                f"Unrecognized storage: {storage}, valid options are: attribute and array"
+            )
+
         if initial in {"approx", "exact"} or causality == "input":
             try:
                 start = getattr(self, attr_name)
@@ -172,7 +451,139 @@ class Fmi2Slave:
             start,
             description,
         )
-        self._variables.append(v)
+        self._add_variable(v, storage)
+
+    def register_variables(
+        self,
+        names: Sequence[str],
+        causality: Union[Fmi2Causality_T, Sequence[Fmi2Causality_T]],
+        data_type: Union[Fmi2DataType_T, Sequence[Fmi2DataType_T]] = "real",
+        variability: Union[Fmi2Variability_T, Sequence[Fmi2Variability_T]] = None,
+        initial: Union[Fmi2Initial_T, Sequence[Optional[Fmi2Initial_T]]] = None,
+        descriptions: Sequence[Optional[str]] = None,
+        storage: Literal["attribute", "array"] = None,
+    ) -> List[int]:
+        """Declare a table of variables of the model at once.
+
+        This is equivalent to registering each variable using register_input, register_output and
+        register_parameter, but is considerably faster for models with many variables, such as generated models.
+        Each distinct combination of data type, causality, variability and initial is validated once, rather
+        than once per variable. Either every variable is registered, or none is if the table is invalid.
+
+        Each of the columns may either be a single value shared by every variable, or a sequence with a value per variable.
+
+        Examples:
+
+            >>> self.register_variables([f"x{i}" for i in range(n)], "input")
+            >>> self.register_variables(["y", "on"], "output", ["real", "boolean"], "discrete")
+
+        Args:
+            names: the names of the variables, as well as the attributes holding their values.
+            causality: the causality of the variables.
+            data_type: the data type of the variables. Defaults to "real".
+            variability: the variability of the variables. Defaults to "tunable" for parameters and "continuous" otherwise.
+            initial: the initial of the variables. Defaults to "exact" for parameters, omitted for inputs and "calculated" otherwise.
+            descriptions: the descriptions of the variables. Defaults to None.
+            storage: where the values are kept, see register_input. Defaults to the storage passed to the constructor.
+
+        Returns:
+            the value references assigned to the variables, in the order of the names.
+
+        Raises:
+            SlaveAttributeError: raised if a name is registered twice, or the length of a column does not match that of the names.
+            InvalidVariableError: raised if a combination of data type, causality, variability and initial or a start value is illegal.
+        """
+        names = list(names)
+        n = len(names)
+
+        def column(values, name: str) -> list:
+            if values is None or isinstance(values, str):
+                return [values] * n
+
+            values = list(values)
+            if len(values) != n:
+                raise SlaveAttributeError(
+                    f"The number of {name}, {len(values)}, does not match the number of variables, {n}"
+                )
+            return values
+
+        causalities = column(causality, "causalities")
+        data_types = column(data_type, "data types")
+        variabilities = [
+            v if v is not None else _default_variability.get(c, "continuous")
+            for c, v in zip(causalities, column(variability, "variabilities"))
+        ]
+        initials = [
+            i if i is not None else _default_initial.get(c, "calculated")
+            for c, i in zip(causalities, column(initial, "initials"))
+        ]
+        descriptions = column(descriptions, "descriptions")
+
+        if storage is None:
+            storage = self._default_storage
+
+        if storage not in {"attribute", "array"}:
+            raise SlaveAttributeError(
+                f"Unrecognized storage: {storage}, valid options are: attribute and array"
+            )
+
+        seen = set(self._names_to_variables) | set(self._storage.array_variables)
+        duplicates = [name for name in names if name in seen or seen.add(name)]
+        if duplicates:
+            raise SlaveAttributeError(
+                f"The variables {sorted(set(duplicates))} are declared more than once"
+            )
+
+        # validate each distinct kind of variable once, determining whether it requires a start value
+        kinds = list(zip(data_types, causalities, variabilities, initials))
+        must_define_start = {}
+        for kind in set(kinds):
+            _check_declaration(*kind)
+            must_define_start[kind] = _must_define_start(*kind[1:])
+
+        starts = []
+        for name, kind in zip(names, kinds):
+            if not must_define_start[kind]:
+                starts.append(None)
+                continue
+
+            try:
+                start = getattr(self, name)
+            except Exception as e:
+                raise SlaveAttributeError(
+                    f"""Failed determining a start value for the variable {name}. Ensure that an attribute matching the name of the registered variable has been declared."""
+                ) from e
+
+            if type(start) is not _type_to_pyType[kind[0]]:
+                _check_start(*kind, start)
+            starts.append(start)
+
+        references = []
+        for name, (t, c, v, i), start, description in zip(
+            names, kinds, starts, descriptions
+        ):
+            value_reference = self._acquire_unused_value_reference()
+            self._add_variable(
+                Fmi2ScalarVariable._from_validated(
+                    name, t, c, v, value_reference, i, start, description
+                ),
+                storage,
+            )
+            references.append(value_reference)
+
+        return references
+
+    def _add_variable(
+        self, variable: Fmi2ScalarVariable, storage: Literal["attribute", "array"]
+    ) -> None:
+        self._variables.append(variable)
+        self._names_to_variables[variable.name] = variable
+        self._refs_to_variables[variable.value_reference] = variable
+
+        if storage == "array":
+            self._storage.add(
+                self, variable.name, variable.data_type, variable.value_reference
+            )
 
     def register_log_category(
         self, name: str, predicate: Callable[[str, str, Fmi2Status_T], bool]
@@ -203,6 +614,115 @@ class Fmi2Slave:
     def set_xxx(self, references: List[int], values: List[Fmi2Value_T]) -> Fmi2Status_T:
         raise NotImplementedError()
 
+    def get_value_block(self, start: int, stop: int) -> Optional[memoryview]:
+        """Returns a buffer holding the values of the variables with value references in the range [start, stop).
+
+        Slaves which keep their state in a contiguous array, such as a numpy array, may override this
+        to allow values to be exchanged with the environment using a single copy.
+        The buffer must be writable for values to be set through it.
+        By default a view of the array storage is returned, if every variable in the range is stored there.
+
+        Returns:
+            an object supporting the buffer protocol or None, in which case the variables are accessed individually.
+        """
+        return self._storage.block(start, stop)
+
+    def get_value_location(self, value_reference: int) -> Optional[Tuple[array, int]]:
+        """Returns the array and offset holding the value of a variable, if it is kept in the array storage."""
+        return self._storage.refs_to_locations.get(value_reference)
+
+    def clone(self, logger: Fmi2LoggerBase) -> "Fmi2Slave":
+        """Returns a new instance of the slave, in the state of this instance.
+
+        If *clone_instances* is true, the slave context keeps a freshly constructed instance of the slave
+        as a prototype, from which every subsequent instance of the FMU is cloned rather than constructed.
+        This avoids invoking the constructor, and thereby registering the variables, for every instance.
+
+        By default the attributes of the slave are deep copied, except for the registered variables and
+        the logger. The variables are immutable and are shared by every clone, whereas the logger is replaced
+        by that of the clone. Slaves holding resources that can not be copied, such as open files,
+        should override this to acquire their own.
+
+        Args:
+            logger: the logger of the clone, inheriting the log categories registered by this instance.
+        """
+        from copy import deepcopy
+
+        memo = {
+            id(self._variables): self._variables,
+            id(self._names_to_variables): self._names_to_variables,
+            id(self._refs_to_variables): self._refs_to_variables,
+            id(self._logger): logger,
+        }
+        clone = object.__new__(type(self))
+        clone.__dict__.update(deepcopy(self.__dict__, memo))
+        logger.inherit_categories(self._logger)
+        return clone
+
+    def enter_ensemble(self, n_members: int) -> None:
+        """Replace the value of every real, integer and boolean variable by a numpy vector holding a value for each member of an ensemble.
+
+        This is invoked by *Fmi2Ensemble* on a freshly constructed slave, whose class declares *supports_ensembles*.
+        Such slaves must compute their outputs using numpy operations applying elementwise to these vectors,
+        such that a single call to do_step advances every member. Variables kept in the array storage are moved
+        to the instance dictionary, and variables computed by properties or on demand are left as they are.
+        Slaves with state which is not held by their variables should override this to extend the state
+        by a dimension of size n_members.
+
+        Args:
+            n_members: the number of members of the ensemble.
+
+        Raises:
+            SlaveAttributeError: raised if the slave has array variables, whose shape can not be extended.
+        """
+        if self._storage.array_variables:
+            raise SlaveAttributeError(
+                f"Slaves with array variables can not be run as an ensemble, got: {', '.join(self._storage.array_variables)}"
+            )
+
+        import numpy as np
+
+        for v in self._variables:
+            if (
+                v.data_type == "string"
+                or v.name in self._computed
+                or isinstance(getattr(type(self), v.name, None), property)
+            ):
+                continue
+
+            try:
+                value = getattr(self, v.name)
+            except AttributeError:
+                value = 0
+
+            self._storage.remove(v.name, v.value_reference)
+            setattr(
+                self,
+                v.name,
+                np.full(n_members, value, dtype=_type_to_pyType[v.data_type]),
+            )
+
+    def get_state(self) -> object:
+        """Returns the state of the slave which is not held by its registered variables.
+
+        The values of the registered variables are captured by the slave context when the environment
+        requests the state of the FMU, see fmi2GetFMUstate. Slaves with additional state, such as
+        the internal state of a solver or a random number generator, should override this and set_state.
+        The returned object must be a copy which is not modified by subsequent steps, and must be picklable
+        for the state to be serialized.
+
+        Returns:
+            the hidden state of the slave, by default None.
+        """
+        return None
+
+    def set_state(self, state: object) -> None:
+        """Restore the hidden state of the slave, as returned by a previous call to get_state.
+
+        This is invoked after the values of the registered variables have been restored.
+        """
+        pass
+
     def setup_experiment(
         self, start_time: float, stop_time: float = None, tolerance: float = None
     ) -> Fmi2Status_T:
@@ -259,11 +779,16 @@ class Fmi2Slave:
             vr = self._value_reference_counter
             self._value_reference_counter += 1
 
-            if vr not in self._used_value_references:
+            if vr not in self._refs_to_variables:
                 return vr
 
     def log_ok(
-        self, msg: str, category: str = None, exc_info=False, stack_info=False,
+        self,
+        msg: Fmi2LogMessage_T,
+        category: str = None,
+        exc_info=False,
+        stack_info=False,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.ok,
@@ -271,15 +796,17 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log_warning(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.warning,
@@ -287,15 +814,17 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log_discard(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.discard,
@@ -303,15 +832,17 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log_error(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.error,
@@ -319,15 +850,17 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log_fatal(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.fatal,
@@ -335,15 +868,17 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def log_pending(
         self,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
         self._log(
             status=Fmi2Status.pending,
@@ -351,16 +886,18 @@ class Fmi2Slave:
             category=category,
             exc_info=exc_info,
             stack_info=stack_info,
+            args=args,
         )
 
     def _log(
         self,
         status: Fmi2Status_T,
-        msg: str,
+        msg: Fmi2LogMessage_T,
         category: str = None,
         exc_info=False,
         stack_info=False,
         stack_level: float = None,
+        args: tuple = (),
     ):
 
         self._logger.log(
@@ -370,8 +907,21 @@ class Fmi2Slave:
             exc_info=exc_info,
             stack_info=stack_info,
             stack_level=stack_level,
+            args=args,
         )
 
+    def is_log_enabled(self, status: Fmi2Status_T, category: str = None) -> bool:
+        """Returns true if a message with the specified status and category is passed to the environment.
+
+        Useful for skipping the computation of expensive diagnostics which would otherwise be discarded.
+
+        Examples:
+
+            >>> if self.is_log_enabled(Fmi2Status.ok, "diagnostics"):
+            ...     self.log_ok(f"condition number: {np.linalg.cond(self.A)}", "diagnostics")
+        """
+        return self._logger.is_enabled(status, category)
+
     @property
     def log_categories(self) -> List[str]:
         """List of available log categories.
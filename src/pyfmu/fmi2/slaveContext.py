@@ -1,12 +1,14 @@
 from __future__ import annotations
-from typing import Dict, Tuple, Union, List, Callable, Optional
+from typing import TYPE_CHECKING, Dict, Tuple, Union, List, Callable, Optional
+from array import array
 import importlib
-import logging
 from pathlib import Path
-import json
 import sys
-import multiprocessing as mp
-import os
+import struct
+import threading
+from time import perf_counter_ns
+import weakref
+from functools import partial, wraps
 
 from pyfmu.fmi2.types import (
     Fmi2Status_T,
@@ -19,13 +21,157 @@ from pyfmu.fmi2.types import (
     Fmi2DataType_T,
 )
 from pyfmu.fmi2.logging import FMI2CallbackLogger
+from pyfmu.fmi2.exception import SlaveConfigError
+from pyfmu.fmi2.accessors import Fmi2Accessors, Fmi2TypeValidation
+from pyfmu.fmi2.state import Fmi2SlaveState
+from pyfmu.fmi2.memo import Fmi2StepMemo
+from pyfmu.fmi2.profiling import Fmi2Profiler
 from pyfmu.utils import file_uri_to_path
 
+if TYPE_CHECKING:
+    from pyfmu.fmi2.isolation import Fmi2SlaveProcess
+
 
 SlaveHandle = int
 Fmi2Value = Union[float, int, bool, str]
 
 
+class Fmi2SlaveRecord:
+    """State associated with a single slave instance managed by the context."""
+
+    __slots__ = (
+        "slave",
+        "logger",
+        "accessors",
+        "validation",
+        "last_state",
+        "process",
+        "profiler",
+        "lock",
+        "stateless",
+        "memo",
+        "dirty",
+        "outputs",
+        "computed",
+        "notify",
+    )
+
+    def __init__(
+        self,
+        slave: Optional[Fmi2SlaveLike],
+        logger: FMI2CallbackLogger,
+        accessors: Optional[Fmi2Accessors],
+        validation: Optional[Fmi2TypeValidation],
+        process: Optional[Fmi2SlaveProcess] = None,
+        profiler: Optional[Fmi2Profiler] = None,
+        stateless: bool = False,
+        memo: Optional[Fmi2StepMemo] = None,
+    ):
+        self.slave = slave
+        self.logger = logger
+        self.accessors = accessors
+        self.validation = validation
+
+        # records the calls made on the slave if profiling is enabled, see Fmi2Profiler
+        self.profiler = profiler
+
+        # the worker process hosting the slave, in which case the remaining fields are unused
+        self.process = process
+
+        # held while an FMI function is invoked on the slave, reentrant since functions such as step_exchange are composed of others
+        self.lock = threading.RLock()
+
+        # the most recent snapshot of the slave, with which the next snapshot may share unchanged arrays
+        self.last_state: Optional[weakref.ref] = None
+
+        # steps of stateless slaves are skipped unless the slave has changed since its previous step,
+        # the values read from these in between are cached per plan, see Fmi2Slave.stateless
+        self.stateless = stateless
+        self.memo = memo
+        self.dirty = True
+        self.outputs: Dict[object, List[Fmi2Value_T]] = {}
+
+        # values of the outputs computed on demand, if the slave has any, see Fmi2Slave.register_output
+        self.computed: Optional[dict] = (
+            getattr(slave, "_computed_values", None)
+            if getattr(slave, "_computed", None)
+            else None
+        )
+
+        # invoked when a slave that tracks its changes is changed after a step, see Fmi2OdeSlave.variables_changed
+        self.notify: Optional[Callable[[], None]] = getattr(
+            slave, "variables_changed", None
+        )
+
+    def changed(self) -> None:
+        """Record that the variables or state of the slave may have changed, invalidating the cached values."""
+        if self.computed:
+            self.computed.clear()
+
+        if not self.dirty:
+            self.dirty = True
+            self.outputs.clear()
+
+            if self.notify is not None:
+                self.notify()
+
+
+def _per_instance(method=None, *, failed: Callable[[], object] = None):
+    """Serialize the calls made on an instance using the lock of its record.
+
+    Calls made on slaves hosted by a worker process are forwarded to the worker, see *Fmi2SlaveProcess*.
+    The duration of the call is recorded if the instance is profiled.
+
+    Calls made on an instance which is freed, including one freed while the call waited for its lock,
+    are not invoked and return the result of failed, by default the error status. Once the lock is held,
+    the instance can not be freed until the call returns.
+    """
+    if method is None:
+        return partial(_per_instance, failed=failed)
+
+    name = method.__name__
+    signature = None
+
+    @wraps(method)
+    def call(self, handle: SlaveHandle, *args, **kwargs):
+        record = self._records[handle]
+
+        if record is None:
+            return Fmi2Status.error if failed is None else failed()
+
+        with record.lock:
+            # the instance may have been freed, and its handle reused by another, while waiting for the lock
+            if self._records[handle] is not record:
+                return Fmi2Status.error if failed is None else failed()
+
+            if record.process is None:
+                profiler = record.profiler
+
+                if profiler is None:
+                    return method(self, handle, *args, **kwargs)
+
+                started = perf_counter_ns()
+                try:
+                    return method(self, handle, *args, **kwargs)
+                finally:
+                    profiler.call(name).record(perf_counter_ns() - started)
+
+            if kwargs:
+                nonlocal signature
+                if signature is None:
+                    import inspect
+
+                    signature = inspect.signature(method)
+
+                bound = signature.bind(self, handle, *args, **kwargs)
+                bound.apply_defaults()
+                args = list(bound.arguments.values())[2:]
+
+            return record.process.call(name, *args)
+
+    return call
+
+
 class Fmi2SlaveContext:
     """Provides functionality to instantiate and invoke FMI-related methods on slaves.
     
@@ -43,6 +189,15 @@ class Fmi2SlaveContext:
 
     The mapping between indices and variable names is automatically made by the context during instantiation
      and is made possible by reading the model description.
+
+    The mapping is compiled into a table of getters and setters bound to the instance, see *Fmi2Accessors*.
+    Outputs registered with a compute function are evaluated when read and cached until the next step
+    or until a variable is set, see *Fmi2Slave.register_output*.
+    The elements of array variables, such as *u[1]*, are bound to the array holding the variable rather
+    than to an attribute, see *Fmi2Slave.register_array_input*. Contiguous ranges of reals or integers kept
+    in arrays are read and written using a single copy, both by get_xxx and set_xxx and by their buffer variants.
+    The getters, setters and types for a specific vector of value references are cached as a plan,
+    such that repeated calls using the same references do not rebuild these.
     
     .. note::
         The FMI specification does not define how the FMU archive should be extracted and states that a FMU may be executed 
@@ -57,6 +212,10 @@ class Fmi2SlaveContext:
     The handle is passed to the environment which can subsequently use it to access a specific slave
     by providing it as an argument when invoking FMI-related methods.
 
+    The handle is the index of the slave's slot in a table of records, see *Fmi2SlaveRecord*, which holds
+    the slave and its logger, accessors and validation policy. Handles of freed slaves are kept in a free list
+    and are reused by subsequent instantiations, such that allocating, looking up and freeing a handle are O(1).
+
     ------------
     Status Codes
     ------------
@@ -64,6 +223,84 @@ class Fmi2SlaveContext:
     Dut to the FMI's close ties to the C language, integer status codes are used by slaves to communicate the 
     outcome of their operation to the environment. This is in contrast to Python's exception-based fault handling.
 
+    -------
+    Logging
+    -------
+
+    Each slave is assigned a logger which passes its messages to the logging callback of the environment.
+    If the slave configuration enables buffering, see *FMI2CallbackLogger*, messages are held back and
+    delivered in a batch when the FMI function currently being invoked returns.
+
+    ---------
+    FMU State
+    ---------
+
+    The state of a slave may be captured and restored, allowing masters to reject and redo a step.
+    A snapshot consists of the registered variables of the slave and the hidden state returned by its
+    *get_state* method, see *Fmi2SlaveState*. Snapshots are opaque to the environment, which refers to
+    them through the object returned by get_fmu_state.
+
+    -------
+    Startup
+    -------
+
+    The configuration and class of a slave are cached per resources directory, such that only the first
+    instantiation of an FMU reads its configuration and imports its script. Modules needed by few slaves,
+    such as those used to host slaves in worker processes, are imported once these are first needed.
+    FMUs exported with precompiled bytecode spare the interpreter from compiling the scripts, see *export_project*.
+
+    ----------
+    Prototypes
+    ----------
+
+    Slaves that set *clone_instances* are constructed once per GUID, slave class and values of visible and logging_on.
+    A clone of the first instance is kept as a prototype, from which every subsequent instance is cloned, see *Fmi2Slave.clone*.
+    Clones share the variables of the prototype and the tables of their accessors, allocating only their own state.
+
+    ---------
+    Profiling
+    ---------
+
+    The calls made on a slave may be profiled by setting *profiling* in the slave configuration or the environment
+    variable PYFMU_PROFILE, see *Fmi2Profiler*. The statistics are returned by get_statistics and are written
+    when the slave is freed. Slaves which are not profiled pay for a single comparison per call.
+
+    ----------------
+    Stateless Slaves
+    ----------------
+
+    Slaves that set *stateless* declare that their outputs are a function of their inputs and parameters alone.
+    The context skips the steps of such slaves unless a variable has been set, or the slave has been reset
+    or restored, since the previous step. Values read from the slave are cached until it changes.
+    Optionally, the outputs computed by the steps are kept in a table keyed by the values of the inputs
+    and parameters, whose size and eviction policy are set by *step_memo_size* and *step_memo_policy*,
+    such that steps revisiting previous inputs are not computed again, see *Fmi2StepMemo*.
+
+    -----------------
+    Process Isolation
+    -----------------
+
+    By default every slave is executed by the interpreter of the context, and thus shares its GIL with every other slave.
+    A slave whose configuration sets *execution_mode* to *process* is instead hosted by a worker process,
+    to which every FMI call made on the slave is forwarded, see *Fmi2SlaveProcess*. Slaves hosted by
+    different processes run in parallel if the master calls these from different threads.
+    The size in bytes of the buffers used to communicate with the worker is set by *execution_buffer_size*.
+
+    -------------
+    Thread Safety
+    -------------
+
+    The context may be invoked concurrently by several threads of the environment:
+        * Each instance has its own record and lock. The calls made on an instance are serialized by its lock,
+          whereas calls made on different instances do not wait for each other.
+        * Instantiating and freeing instances is safe while other instances are being invoked.
+          Freeing an instance waits for the calls in progress on that instance to return.
+        * State shared between slaves, such as module level variables of their scripts, is not guarded by the context.
+
+    Slaves executed by the interpreter of the context only execute in parallel on free-threaded builds of CPython,
+    otherwise their execution is serialized by the GIL. Slaves hosted by worker processes execute
+    in parallel regardless, since the calling thread does not hold the GIL while waiting for the worker.
+
     ----------
     Validation
     ----------
@@ -72,8 +309,13 @@ class Fmi2SlaveContext:
     Data from the FMI interface is assumed to be correct and will not be validated. On the contrary, the presumption is that data
     from the slave may be erroneous and will be validated.
 
+    The types of the values exchanged through get_xxx and set_xxx are validated according to a policy,
+    see *Fmi2TypeValidation*. Numpy scalars, such as numpy.float64, are converted to the declared type
+    of the variable while validation is enabled.
+
     """
 
+    @_per_instance
     def do_step(
         self,
         handle: SlaveHandle,
@@ -92,97 +334,334 @@ class Fmi2SlaveContext:
         Returns:
             Fmi2Status_T: [description]
         """
-        return self._call_slave_method(
+        record = self._records[handle]
+
+        if not record.stateless:
+            status = self._call_slave_method(
+                handle, "do_step", args=(current_time, step_size, no_set_state_prior)
+            )
+            if record.computed:
+                record.computed.clear()
+
+            # the slave is notified of the changes made after a successful step
+            if record.notify is not None and status in {
+                Fmi2Status.ok,
+                Fmi2Status.warning,
+            }:
+                record.dirty = False
+            return status
+
+        if not record.dirty:
+            return Fmi2Status.ok
+
+        memo = record.memo
+        key = None
+
+        if memo is not None:
+            key = memo.key()
+
+            if key is not None and memo.restore(key):
+                record.dirty = False
+                return Fmi2Status.ok
+
+        status = self._call_slave_method(
             handle, "do_step", args=(current_time, step_size, no_set_state_prior)
         )
 
+        if record.computed:
+            record.computed.clear()
+
+        if status in {Fmi2Status.ok, Fmi2Status.warning}:
+            record.dirty = False
+
+            if key is not None:
+                memo.store(key)
+
+        return status
+
+    @_per_instance(failed=lambda: ([], Fmi2Status.error))
+    def step_exchange(
+        self,
+        handle: SlaveHandle,
+        set_references: List[int],
+        set_values: List[Fmi2Value],
+        current_time: float,
+        step_size: float,
+        get_references: List[int],
+        no_set_state_prior: bool = False,
+    ) -> Tuple[List[Fmi2Value], Fmi2Status_T]:
+        """Set the inputs, step and read the outputs of the slave specified by the handle in a single call.
+
+        This is equivalent to calling set_xxx, do_step and get_xxx in sequence, but requires only
+        a single round trip from the environment per communication step.
+        The step is not performed if setting the inputs fails, likewise the outputs are not read
+        if the step fails.
+
+        Returns:
+            the values of the variables referred to by get_references and the most severe status of the calls.
+        """
+        status = self.set_xxx(handle, set_references, set_values)
+
+        if status not in {Fmi2Status.ok, Fmi2Status.warning}:
+            return ([], status)
+
+        step_status = self.do_step(
+            handle, current_time, step_size, no_set_state_prior
+        )
+        status = max(status, step_status)
+
+        if step_status not in {Fmi2Status.ok, Fmi2Status.warning, Fmi2Status.discard}:
+            return ([], status)
+
+        values, get_status = self.get_xxx(handle, get_references)
+        return (values, max(status, get_status))
+
+    @_per_instance
+    def step_exchange_buffer(
+        self,
+        handle: SlaveHandle,
+        set_references: memoryview,
+        set_values: memoryview,
+        current_time: float,
+        step_size: float,
+        no_set_state_prior: bool,
+        get_references: memoryview,
+        get_values: memoryview,
+    ) -> Fmi2Status_T:
+        """Buffer based variant of step_exchange, see set_xxx_buffer and get_xxx_buffer.
+
+        The outputs are written into get_values in place. This is the entry point used by the
+        wrapper's pyfmuStepExchange function.
+        """
+        status = self.set_xxx_buffer(handle, set_references, set_values)
+
+        if status not in {Fmi2Status.ok, Fmi2Status.warning}:
+            return status
+
+        step_status = self.do_step(
+            handle, current_time, step_size, no_set_state_prior
+        )
+        status = max(status, step_status)
+
+        if step_status not in {Fmi2Status.ok, Fmi2Status.warning, Fmi2Status.discard}:
+            return status
+
+        return max(status, self.get_xxx_buffer(handle, get_references, get_values))
+
+    @_per_instance
     def enter_initialization_mode(self, handle: SlaveHandle,) -> Fmi2Status_T:
+        self._records[handle].changed()
         return self._call_slave_method(handle, "enter_initialization_mode")
 
+    @_per_instance
     def exit_initialization_mode(self, handle: SlaveHandle,) -> Fmi2Status_T:
-        return self._call_slave_method(handle, "exit_initialization_mode")
+        record = self._records[handle]
+        record.changed()
+        status = self._call_slave_method(handle, "exit_initialization_mode")
+        record.validation.exit_initialization_mode()
+        return status
 
     def free_instance(self, handle: SlaveHandle):
 
-        assert handle in self._slaves
-        assert handle in self._loggers
+        record = self._records[handle]
+        assert record is not None
 
-        self._loggers[handle].ok(
-            f"Removing slave with handle {handle}, current number of slaves is {len(self._slaves)}",
-            category="slave_manager",
-        )
+        logger = record.logger
 
-        logger = self._loggers[handle]
+        # wait for calls made on the slave by other threads to return
+        with record.lock:
+            # another thread freed the instance while waiting for the lock
+            if self._records[handle] is not record:
+                return
 
-        try:
-            del self._slaves[handle]
-            del self._loggers[handle]
-        except Exception:
-            self._loggers[handle].error(
-                "Unable to free slave instance, an exception was raised",
+            logger.ok(
+                "Removing slave with handle %s, current number of slaves is %s",
                 category="slave_manager",
-                exc_info=True,
+                args=(handle, self._n_slaves),
             )
-            return
 
-        assert handle not in self._slaves
-        assert handle not in self._loggers
+            if record.process is not None:
+                record.process.close()
+
+            if record.profiler is not None:
+                record.profiler.dump(
+                    lambda statistics: logger.do_log(
+                        Fmi2Status.ok, statistics, "profiling"
+                    )
+                )
+
+            self._release_handle(handle)
 
         logger.ok(
-            f"Slave succesfully removed, number of slaves after is {len(self._slaves)}",
+            "Slave succesfully removed, number of slaves after is %s",
             category="slave_manager",
+            args=(self._n_slaves,),
         )
+        logger.flush()
+
+    @_per_instance(failed=lambda: None)
+    def get_statistics(self, handle: SlaveHandle) -> Optional[dict]:
+        """Returns the statistics recorded by the profiler of the slave, or None if the slave is not profiled.
 
+        The statistics hold the number of calls, latency and values transferred by each FMI function, along with
+        the time spent in the methods of the slave, in delivering log messages and in validation, see *Fmi2Profiler*.
+        """
+        profiler = self._records[handle].profiler
+        return None if profiler is None else profiler.to_dict()
+
+    @_per_instance(failed=lambda: ([], Fmi2Status.error))
     def get_xxx(
         self, handle: SlaveHandle, references: List[int]
     ) -> Tuple[List[Fmi2Value], Fmi2Status_T]:
         """Read variables of the slave specified by the handle.
         """
+        record = self._records[handle]
+        profiler = record.profiler
+
         try:
 
-            attributes = [self._slave_to_refs_to_attr[handle][i] for i in references]
-            values = [getattr(self._slaves[handle], a) for a in attributes]
+            plan = record.accessors.plan(references)
 
-            invalid_type_variables = [
-                f"attribute {self._get_attr_for_vref(handle, vref)} has value: {values[idx]}, expected type: {self._get_type_for_vref(handle, vref).__name__}, actual: {type(values[idx])}"
-                for idx, vref in enumerate(references)
-                if type(values[idx]) != self._get_type_for_vref(handle, vref)
-            ]
+            cache = record.stateless and not record.dirty
 
-            if invalid_type_variables != []:
-                self._loggers[handle].error(
-                    f"One or more of the variables read from the slave has an incorrect type: {invalid_type_variables}",
-                    category="slave_manager",
-                )
-                return ([], Fmi2Status.error)
+            if cache:
+                values = record.outputs.get(plan)
+
+                if values is not None:
+                    if profiler is not None:
+                        profiler.call("get_xxx").values += len(values)
+                    return (list(values), Fmi2Status.ok)
+
+            block = record.accessors.block(plan) if plan.listable else None
+            values = (
+                block.tolist() if block is not None else [g() for g in plan.getters]
+            )
 
-            # self._loggers[handle].ok(
+            validation = record.validation
+            if validation.enabled:
+                started = perf_counter_ns() if profiler is not None else 0
+                validation.count()
+
+                if list(map(type, values)) != plan.types:
+                    coerced = plan.coerce(values)
+
+                    if coerced is None:
+                        record.logger.error(
+                            f"One or more of the variables read from the slave has an incorrect type: {plan.invalid_types(values)}",
+                            category="slave_manager",
+                        )
+                        return ([], Fmi2Status.error)
+
+                    values = coerced
+
+                if profiler is not None:
+                    profiler.validation.record(perf_counter_ns() - started)
+
+            if profiler is not None:
+                profiler.call("get_xxx").values += len(values)
+
+            if cache:
+                record.outputs[plan] = values
+                values = list(values)
+
+            # record.logger.ok(
             #     f"references {references} with names {attributes} has values {values}",
             #     category="slave_manager",
             # )
 
             return (values, Fmi2Status.ok)
         except Exception:
-            self._loggers[handle].error(
+            record.logger.error(
                 msg=f"writing a variable of the slave failed",
                 category="slave_manager",
                 exc_info=True,
             )
             return ([], Fmi2Status.error)
+        finally:
+            record.logger.flush()
+
+    @_per_instance
+    def get_xxx_buffer(
+        self, handle: SlaveHandle, references: memoryview, values: memoryview
+    ) -> Fmi2Status_T:
+        """Read variables of the slave directly into a buffer owned by the caller.
 
-    def __init__(self):
+        Contrary to get_xxx the values are written into the buffer in place rather than returned as a list.
+        If the references form a contiguous range and the slave exposes the memory holding these,
+        see *Fmi2Slave.get_value_block*, the values are copied using a single copy.
 
-        self._slaves: Dict[SlaveHandle, Fmi2SlaveLike] = {}
-        self._slave_to_refs_to_attr: Dict[SlaveHandle, Dict[int, str]] = {}
-        self._slave_to_refs_to_types: Dict[
-            SlaveHandle, Dict[int, Union[float, int, bool, str]]
-        ] = {}
-        self._loggers: Dict[SlaveHandle, FMI2CallbackLogger] = {}
+        Args:
+            references: buffer of unsigned integers, typically a view of the value references passed to fmi2GetXXX.
+            values: writable buffer of doubles for reals or integers for integers and booleans.
+        """
+        record = self._records[handle]
+
+        try:
+            accessors = record.accessors
+            plan = accessors.plan(_buffer_to_references(references))
+
+            if not plan.references:
+                return Fmi2Status.ok
+
+            if plan.format is None:
+                record.logger.error(
+                    f"Variables: {plan.attributes} can not be read into a buffer, only variables of a single type of either real, integer and boolean are supported",
+                    category="slave_manager",
+                )
+                return Fmi2Status.error
+
+            if record.profiler is not None:
+                record.profiler.call("get_xxx_buffer").values += len(plan.references)
+
+            block = accessors.block(plan)
+
+            if block is not None:
+                memoryview(values).cast("B").cast(plan.format)[:] = block
+                return Fmi2Status.ok
+
+            slave_values, status = self.get_xxx(handle, plan.references)
+
+            if status not in {Fmi2Status.ok, Fmi2Status.warning}:
+                return status
+
+            struct.pack_into(
+                f"{len(slave_values)}{plan.format}", values, 0, *slave_values
+            )
+            return status
+
+        except Exception:
+            record.logger.error(
+                msg=f"reading variables of the slave into a buffer failed",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return Fmi2Status.error
+        finally:
+            record.logger.flush()
+
+    def __init__(self, hosted: bool = False):
+        """
+        Args:
+            hosted: true if the context runs in a worker process hosting a single slave,
+                in which case the slave is always executed in the interpreter of the context.
+        """
+
+        self._hosted = hosted
+
+        # guards the table of records, the records themselves are guarded by their own locks
+        self._handles_lock = threading.Lock()
+
+        # slots reserved for slaves awaiting instantiation hold None
+        self._records: List[Optional[Fmi2SlaveRecord]] = []
+        self._free_handles: List[SlaveHandle] = []
+        self._n_slaves = 0
         self._log_calls_to_slave = False
-        self._awaiting_instantiation_handles = set()
 
-        if "win" in sys.platform:
-            mp.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+        # configuration and class of the slaves, keyed by the URI of their resources directory
+        self._slave_classes: Dict[str, Tuple[dict, Optional[type]]] = {}
+
+        # instances from which slaves opting in to cloning are created, and their accessors
+        self._prototypes: Dict[tuple, Tuple[Fmi2SlaveLike, Fmi2Accessors]] = {}
 
     def instantiate(
         self,
@@ -202,6 +681,9 @@ class Fmi2SlaveContext:
             3. The object is instantiated and stored in the manager.
             4. A handle to the instance is returned to the FMI interface.
 
+        The first two steps are only performed by the first instantiation of an FMU, see *_resolve_slave*.
+        Slaves opting in to cloning are cloned from a prototype rather than constructed in the third step.
+
         Args:
             instance_name: identifier of the slave instance
             type: [description]
@@ -215,19 +697,9 @@ class Fmi2SlaveContext:
             SlaveHandle: [description]
         """
 
-        # get a unused handle which is not currently in use
-        # Note that some operation in CPython such imports will release the GIL
-        def get_free_handle() -> SlaveHandle:
-            i = 0
-            while i in self._slaves or i in self._awaiting_instantiation_handles:
-                i += 1
-            return i
-
-        handle = get_free_handle()
-
-        self._awaiting_instantiation_handles.add(handle)
+        # reserve the slot immediately, since some operations in CPython such as imports will release the GIL
+        handle = self._acquire_handle()
 
-        assert handle not in self._slaves
         assert logging_callback is not None
 
         logger = FMI2CallbackLogger(
@@ -235,87 +707,218 @@ class Fmi2SlaveContext:
         )
 
         logger.ok(
-            f"Creating instance of FMU with name {instance_name}, fmu_type: {fmu_type}, guid: {guid}, resources_uri {resources_uri}, logging_callback: {logging_callback}, visible: {visible}, logging_on: {logging_on}",
+            "Creating instance of FMU with name %s, fmu_type: %s, guid: %s, resources_uri %s, logging_callback: %s, visible: %s, logging_on: %s",
             category="slave_manager",
+            args=(
+                instance_name,
+                fmu_type,
+                guid,
+                resources_uri,
+                logging_callback,
+                visible,
+                logging_on,
+            ),
         )
 
         if fmu_type is not Fmi2Type.co_simulation:
+            self._release_handle(handle)
             raise NotImplementedError("Currently, only co-simulation is supported.")
 
         try:
-            url_path = file_uri_to_path(resources_uri)
-
-            if not str(url_path) in sys.path:
-                sys.path.append(str(url_path))
+            config, slave_class = self._resolve_slave(resources_uri, logger)
+
+            logger.configure(config)
+
+            profiler = None
+            if slave_class is not None and Fmi2Profiler.enabled(config):
+                profiler = Fmi2Profiler(instance_name)
+                logger.set_callback(profiler.timed_callback(logging_callback))
+
+            if slave_class is None:
+                return self._instantiate_process(
+                    handle,
+                    logger,
+                    config,
+                    {
+                        "instance_name": instance_name,
+                        "fmu_type": fmu_type,
+                        "guid": guid,
+                        "resources_uri": resources_uri,
+                        "visible": visible,
+                        "logging_on": logging_on,
+                    },
+                    logging_callback,
+                )
 
-            # read configuration
-            config_path = url_path / "slave_configuration.json"
-            logger.ok(f"Reading configuration {config_path}", category="slave_manager")
-            config = None
-            with open(config_path, "r") as f:
-                config = json.load(f)
+            key = (guid, slave_class, visible, logging_on)
+            prototype = self._prototypes.get(key)
 
-            slave_module = Path(config["slave_script"]).stem
-            slave_class = config["slave_class"]
+            if prototype is not None:
+                prototype_slave, prototype_accessors = prototype
+                instance: Fmi2SlaveLike = prototype_slave.clone(logger)
+                accessors = Fmi2Accessors(
+                    instance, instance.variables, prototype_accessors
+                )
+            else:
+                kwargs = {
+                    "logger": logger,
+                    "visible": visible,
+                    "logging_on": logging_on,
+                }
+                instance = slave_class(**kwargs)
+
+                logger.ok(
+                    "compiling accessors mapping value references to the variables of the slave",
+                    category="slave_manager",
+                )
+                accessors = Fmi2Accessors(instance, instance.variables)
+
+                if getattr(slave_class, "clone_instances", False):
+                    prototype_slave = instance.clone(logger)
+                    self._prototypes[key] = (
+                        prototype_slave,
+                        Fmi2Accessors(
+                            prototype_slave, prototype_slave.variables, accessors
+                        ),
+                    )
+
+            stateless = getattr(slave_class, "stateless", False) is True
+            memo = Fmi2StepMemo.from_configuration(config) if stateless else None
+
+            if memo is not None:
+                memo.bind(instance, instance.variables, accessors)
+
+            self._insert_record(
+                handle,
+                Fmi2SlaveRecord(
+                    slave=instance,
+                    logger=logger,
+                    accessors=accessors,
+                    validation=Fmi2TypeValidation.from_configuration(config),
+                    profiler=profiler,
+                    stateless=stateless,
+                    memo=memo,
+                ),
+            )
 
             logger.ok(
-                msg=f"Configuration loaded, instantiating slave class {slave_class} defined in script {config['slave_script']}",
+                "An slave object has been instantiated successfully and assigned the handle: %s",
                 category="slave_manager",
+                args=(handle,),
             )
 
-            # instantiate object
-            kwargs = {"logger": logger, "visible": visible, "logging_on": logging_on}
-            instance: Fmi2SlaveLike = getattr(
-                importlib.import_module(slave_module), slave_class
-            )(**kwargs)
+            return handle
 
-            logger.ok(
-                "creating mapping from value references to their names and data types",
+        except Exception:
+            logger.error(
+                f"Instantiation failed an exception was raised",
                 category="slave_manager",
+                exc_info=True,
             )
+            self._release_handle(handle)
+            return None
+        finally:
+            logger.flush()
 
-            self._slave_to_refs_to_attr[handle] = {
-                v.value_reference: v.name for v in instance.variables
-            }
+    def _resolve_slave(
+        self, resources_uri: str, logger: FMI2CallbackLogger
+    ) -> Tuple[dict, Optional[type]]:
+        """Returns the configuration of the slave and the class it is an instance of.
 
-            self._slave_to_refs_to_types[handle] = {
-                v.value_reference: {
-                    "real": float,
-                    "integer": int,
-                    "boolean": bool,
-                    "string": str,
-                }[v.data_type]
-                for v in instance.variables
-            }
+        Both are resolved by the first instantiation of an FMU and reused by subsequent instantiations,
+        which thus neither read the configuration nor import the script again.
+        The class is None if the slave is hosted by a worker process, in which case the worker resolves it.
+        """
+        resolved = self._slave_classes.get(resources_uri)
 
-            assert handle not in self._slaves
-            assert handle not in self._loggers
+        if resolved is not None:
+            return resolved
 
-            self._slaves[handle] = instance
-            self._loggers[handle] = logger
-            self._awaiting_instantiation_handles.remove(handle)
+        import json
 
-            logger.ok(
-                f"An slave object has been instantiated successfully and assigned the handle: {handle}",
-                category="slave_manager",
+        url_path = file_uri_to_path(resources_uri)
+        config_path = url_path / "slave_configuration.json"
+        logger.ok(
+            "Reading configuration %s", category="slave_manager", args=(config_path,)
+        )
+
+        with open(config_path, "r") as f:
+            config = json.load(f)
+
+        execution_mode = config.get("execution_mode", "interpreter")
+        if execution_mode not in {"interpreter", "process"}:
+            raise SlaveConfigError(
+                f"Unrecognized execution mode '{execution_mode}', the supported modes are 'interpreter' and 'process'"
             )
 
-            return handle
+        slave_class = None
 
-        except Exception:
-            logger.error(
-                f"Instantiation failed an exception was raised",
+        if execution_mode == "interpreter" or self._hosted:
+            if not str(url_path) in sys.path:
+                sys.path.append(str(url_path))
+
+            logger.ok(
+                msg="Configuration loaded, importing slave class %s defined in script %s",
                 category="slave_manager",
-                exc_info=True,
+                args=(config["slave_class"], config["slave_script"]),
             )
+
+            slave_module = importlib.import_module(Path(config["slave_script"]).stem)
+            slave_class = getattr(slave_module, config["slave_class"])
+
+        self._slave_classes[resources_uri] = (config, slave_class)
+        return (config, slave_class)
+
+    def _instantiate_process(
+        self,
+        handle: SlaveHandle,
+        logger: FMI2CallbackLogger,
+        config: dict,
+        instantiate_args: dict,
+        logging_callback: Fmi2LoggingCallback,
+    ) -> Optional[SlaveHandle]:
+        """Instantiate the slave in a worker process."""
+        from pyfmu.fmi2.isolation import Fmi2SlaveProcess
+
+        logger.ok("Starting worker process hosting the slave", category="slave_manager")
+
+        process = Fmi2SlaveProcess(instantiate_args, logging_callback, config)
+
+        if not process.instantiated:
+            process.close()
+            self._release_handle(handle)
             return None
 
+        self._insert_record(
+            handle,
+            Fmi2SlaveRecord(
+                slave=None,
+                logger=logger,
+                accessors=None,
+                validation=None,
+                process=process,
+            ),
+        )
+
+        logger.ok(
+            "The slave has been instantiated by worker process %s and assigned the handle: %s",
+            category="slave_manager",
+            args=(process.pid, handle),
+        )
+        return handle
+
+    @_per_instance
     def reset(self, handle: SlaveHandle) -> Fmi2Status_T:
+        record = self._records[handle]
+        record.validation.reset()
+        record.changed()
         return self._call_slave_method(handle, "reset")
 
+    @_per_instance
     def terminate(self, handle: SlaveHandle) -> Fmi2Status_T:
         return self._call_slave_method(handle, "terminate")
 
+    @_per_instance
     def setup_experiment(
         self,
         handle: SlaveHandle,
@@ -323,10 +926,12 @@ class Fmi2SlaveContext:
         tolerance: float = None,
         stop_time: float = None,
     ) -> Fmi2Status_T:
+        self._records[handle].changed()
         return self._call_slave_method(
-            handle, "setup_experiment", args=(start_time, tolerance, stop_time)
+            handle, "setup_experiment", args=(start_time, stop_time, tolerance)
         )
 
+    @_per_instance
     def set_xxx(
         self, handle: SlaveHandle, references: List[int], values: List[Fmi2Value]
     ) -> Fmi2Status_T:
@@ -341,37 +946,280 @@ class Fmi2SlaveContext:
             Fmi2Status_T: [description]
         """
 
+        record = self._records[handle]
+        profiler = record.profiler
+
         a = None
         v = None
         try:
-            attributes = [self._slave_to_refs_to_attr[handle][i] for i in references]
+            plan = record.accessors.plan(references)
+
+            validation = record.validation
+            if validation.enabled:
+                started = perf_counter_ns() if profiler is not None else 0
+                validation.count()
+
+                if list(map(type, values)) != plan.types:
+                    coerced = plan.coerce(values)
+
+                    if coerced is None:
+                        record.logger.error(
+                            f"One or more of the variables received from the envrionment has an incorrect type: {plan.invalid_types(values)}",
+                            category="slave_manager",
+                        )
+                        return Fmi2Status.error
+
+                    values = coerced
+
+                if profiler is not None:
+                    profiler.validation.record(perf_counter_ns() - started)
+
+            if profiler is not None:
+                profiler.call("set_xxx").values += len(plan.references)
+
+            if record.computed:
+                record.computed.clear()
+
+            block = record.accessors.block(plan) if plan.listable else None
+
+            if block is not None and not block.readonly:
+                values = memoryview(array(plan.format, values))
+
+                if not record.dirty and block != values:
+                    record.changed()
+                block[:] = values
+                return Fmi2Status.ok
+
+            # setting a slave to its current values does not invalidate its previous step
+            if not record.dirty and [g() for g in plan.getters] != list(values):
+                record.changed()
+
+            for a, setter, v in zip(plan.attributes, plan.setters, values):
+                setter(v)
+
+            return Fmi2Status.ok
+
+        except Exception:
+
+            record.logger.error(
+                msg=f"Failed setting variable: {a} to the value: {v}. Ensure that the slave defines a attribute a matching name.",
+                exc_info=True,
+            )
+            return Fmi2Status.error
+        finally:
+            record.logger.flush()
+
+    @_per_instance
+    def set_xxx_buffer(
+        self, handle: SlaveHandle, references: memoryview, values: memoryview
+    ) -> Fmi2Status_T:
+        """Set variables of the slave from a buffer owned by the caller.
+
+        If the references form a contiguous range and the slave exposes a writable view of the memory
+        holding these, see *Fmi2Slave.get_value_block*, the values are copied using a single copy.
+
+        Args:
+            references: buffer of unsigned integers, typically a view of the value references passed to fmi2SetXXX.
+            values: buffer of doubles for reals or integers for integers and booleans.
+        """
+        record = self._records[handle]
+
+        try:
+            accessors = record.accessors
+            plan = accessors.plan(_buffer_to_references(references))
 
-            invalid_type_variables = [
-                f"attribute {self._get_attr_for_vref(handle, vref)} has value: {values[idx]}, expected type: {self._get_type_for_vref(handle, vref).__name__}, actual: {type(values[idx])}"
-                for idx, vref in enumerate(references)
-                if type(values[idx]) != self._get_type_for_vref(handle, vref)
-            ]
+            if not plan.references:
+                return Fmi2Status.ok
 
-            if invalid_type_variables != []:
-                self._loggers[handle].error(
-                    f"One or more of the variables received from the envrionment has an incorrect type: {invalid_type_variables}",
+            if plan.format is None:
+                record.logger.error(
+                    f"Variables: {plan.attributes} can not be set from a buffer, only variables of a single type of either real, integer and boolean are supported",
                     category="slave_manager",
                 )
                 return Fmi2Status.error
 
-            for a, v in zip(attributes, values):
-                setattr(self._slaves[handle], a, v)
+            if record.profiler is not None:
+                record.profiler.call("set_xxx_buffer").values += len(plan.references)
+
+            values = memoryview(values).cast("B").cast(plan.format)
+            block = accessors.block(plan)
+
+            if block is not None and not block.readonly:
+                if record.computed:
+                    record.computed.clear()
+
+                if not record.dirty and block != values:
+                    record.changed()
+                block[:] = values
+                return Fmi2Status.ok
+
+            values = values.tolist()
 
+            # booleans are represented as integers by the FMI interface
+            if plan.types[0] is bool:
+                values = [v != 0 for v in values]
+
+            return self.set_xxx(handle, plan.references, values)
+
+        except Exception:
+            record.logger.error(
+                msg=f"setting variables of the slave from a buffer failed",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return Fmi2Status.error
+        finally:
+            record.logger.flush()
+
+    @_per_instance(failed=lambda: (None, Fmi2Status.error))
+    def get_fmu_state(
+        self, handle: SlaveHandle, state: Optional[Fmi2SlaveState] = None
+    ) -> Tuple[Optional[Fmi2SlaveState], Fmi2Status_T]:
+        """Capture the state of the slave.
+
+        Args:
+            state: a previously captured state, which is overwritten rather than allocating a new one.
+
+        Returns:
+            the captured state, or None if the state could not be captured.
+        """
+        record = self._records[handle]
+
+        try:
+            previous = state
+
+            if previous is None and record.last_state is not None:
+                previous = record.last_state()
+
+            snapshot = Fmi2SlaveState.capture(
+                record.slave, record.accessors, previous
+            )
+
+            if state is not None:
+                state.update(snapshot)
+                snapshot = state
+
+            record.last_state = weakref.ref(snapshot)
+            return (snapshot, Fmi2Status.ok)
+
+        except Exception:
+            record.logger.error(
+                "capturing the state of the slave failed",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return (None, Fmi2Status.error)
+        finally:
+            record.logger.flush()
+
+    @_per_instance
+    def set_fmu_state(
+        self, handle: SlaveHandle, state: Fmi2SlaveState
+    ) -> Fmi2Status_T:
+        """Restore the slave to a previously captured state."""
+        record = self._records[handle]
+
+        try:
+            record.changed()
+            state.restore(record.slave, record.accessors)
             return Fmi2Status.ok
+        except Exception:
+            record.logger.error(
+                "restoring the state of the slave failed",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return Fmi2Status.error
+        finally:
+            record.logger.flush()
+
+    @_per_instance
+    def free_fmu_state(
+        self, handle: SlaveHandle, state: Fmi2SlaveState
+    ) -> Fmi2Status_T:
+        """Release a state, the state is disposed once the environment no longer references it."""
+        record = self._records[handle]
+
+        if record.last_state is not None and record.last_state() is state:
+            record.last_state = None
+
+        return Fmi2Status.ok
 
+    @_per_instance(failed=lambda: (0, Fmi2Status.error))
+    def serialized_fmu_state_size(
+        self, handle: SlaveHandle, state: Fmi2SlaveState
+    ) -> Tuple[int, Fmi2Status_T]:
+        """Returns the number of bytes required to store the serialized state."""
+        record = self._records[handle]
+
+        try:
+            return (len(state.serialize()), Fmi2Status.ok)
         except Exception:
+            record.logger.error(
+                "serializing the state of the slave failed, ensure that the state returned by get_state can be pickled",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return (0, Fmi2Status.error)
+        finally:
+            record.logger.flush()
 
-            self._loggers[handle].error(
-                msg=f"Failed setting variable: {a} to the value: {v}. Ensure that the slave defines a attribute a matching name.",
+    @_per_instance
+    def serialize_fmu_state(
+        self, handle: SlaveHandle, state: Fmi2SlaveState, data: memoryview
+    ) -> Fmi2Status_T:
+        """Write the serialized state into a buffer owned by the caller.
+
+        Args:
+            data: writable buffer, at least serialized_fmu_state_size bytes long.
+        """
+        record = self._records[handle]
+
+        try:
+            serialized = state.serialize()
+            data = memoryview(data).cast("B")
+
+            if len(data) < len(serialized):
+                record.logger.error(
+                    "The buffer of %s bytes is too small to hold the serialized state of %s bytes",
+                    category="slave_manager",
+                    args=(len(data), len(serialized)),
+                )
+                return Fmi2Status.error
+
+            data[: len(serialized)] = serialized
+            return Fmi2Status.ok
+
+        except Exception:
+            record.logger.error(
+                "serializing the state of the slave failed",
+                category="slave_manager",
                 exc_info=True,
             )
             return Fmi2Status.error
+        finally:
+            record.logger.flush()
+
+    @_per_instance(failed=lambda: (None, Fmi2Status.error))
+    def deserialize_fmu_state(
+        self, handle: SlaveHandle, data: memoryview
+    ) -> Tuple[Optional[Fmi2SlaveState], Fmi2Status_T]:
+        """Create a state from its serialized representation, see serialize_fmu_state."""
+        record = self._records[handle]
+
+        try:
+            return (Fmi2SlaveState.deserialize(data), Fmi2Status.ok)
+        except Exception:
+            record.logger.error(
+                "deserializing the state of the slave failed",
+                category="slave_manager",
+                exc_info=True,
+            )
+            return (None, Fmi2Status.error)
+        finally:
+            record.logger.flush()
 
+    @_per_instance
     def set_debug_logging(
         self, handle: SlaveHandle, categories: list[str], logging_on: bool
     ) -> Fmi2Status_T:
@@ -381,20 +1229,27 @@ class Fmi2SlaveContext:
 
     def _call_slave_method(self, handle: SlaveHandle, fname: str, args=(), kwargs={}):
 
-        assert handle in self._slaves
-        assert hasattr(self._slaves[handle], fname)
+        record = self._records[handle]
+        assert hasattr(record.slave, fname)
 
         try:
 
             if self._log_calls_to_slave:
-                self._loggers[handle].ok(
-                    f"calling slave's {fname} method", category="slave_manager"
+                record.logger.ok(
+                    "calling slave's %s method", category="slave_manager", args=(fname,)
                 )
 
-            status = getattr(self._slaves[handle], fname)(*args, **kwargs)
+            profiler = record.profiler
+
+            if profiler is None:
+                status = getattr(record.slave, fname)(*args, **kwargs)
+            else:
+                started = perf_counter_ns()
+                status = getattr(record.slave, fname)(*args, **kwargs)
+                profiler.record_slave(fname, perf_counter_ns() - started)
 
             if status not in range(Fmi2Status.ok, Fmi2Status.pending + 1):
-                self._loggers[handle].error(
+                record.logger.error(
                     f"call to slave's {fname} returned an invalid status code: {status}",
                     category="slave_manager",
                 )
@@ -403,17 +1258,54 @@ class Fmi2SlaveContext:
             return status
 
         except Exception:
-            self._loggers[handle].error(
+            record.logger.error(
                 msg=f"call to slave's {fname} raised an exception",
                 exc_info=True,
                 category="slave_manager",
             )
             return Fmi2Status.error
+        finally:
+            record.logger.flush()
 
     def _get_type_for_vref(
         self, handle: SlaveHandle, vref: int
     ) -> Union[float, int, bool, str]:
-        return self._slave_to_refs_to_types[handle][vref]
+        return self._records[handle].accessors.refs_to_types[vref]
 
     def _get_attr_for_vref(self, handle: SlaveHandle, vref: int) -> str:
-        return self._slave_to_refs_to_attr[handle][vref]
+        return self._records[handle].accessors.refs_to_attr[vref]
+
+    def _acquire_handle(self) -> SlaveHandle:
+        """Reserve a free slot in the table of records, reusing the slots of freed slaves if possible."""
+        with self._handles_lock:
+            if self._free_handles:
+                return self._free_handles.pop()
+
+            self._records.append(None)
+            return len(self._records) - 1
+
+    def _insert_record(self, handle: SlaveHandle, record: Fmi2SlaveRecord) -> None:
+        """Fill the slot reserved by _acquire_handle with the record of an instantiated slave."""
+        with self._handles_lock:
+            assert self._records[handle] is None
+            self._records[handle] = record
+            self._n_slaves += 1
+
+    def _release_handle(self, handle: SlaveHandle) -> None:
+        """Release the slot and all state associated with the slave, making the handle available for reuse."""
+        with self._handles_lock:
+            if self._records[handle] is not None:
+                self._n_slaves -= 1
+
+            self._records[handle] = None
+            self._free_handles.append(handle)
+
+
+def _buffer_to_references(references: memoryview) -> List[int]:
+    """Convert a buffer of unsigned integers, such as a view of a C array of value references, to a list."""
+    references = memoryview(references)
+
+    if references.format != "I":
+        references = references.cast("B").cast("I")
+
+    return references.tolist()
@@ -0,0 +1,184 @@
+"""Defines snapshots of the state of a slave, used to implement fmi2GetFMUstate, fmi2SetFMUstate and the serialization of these."""
+
+from array import array
+from copy import deepcopy
+from typing import List, Optional, Tuple
+
+from pyfmu.fmi2.accessors import Fmi2Accessors
+
+
+def _is_ndarray(value: object) -> bool:
+    return type(value).__module__ == "numpy" and hasattr(value, "__array_interface__")
+
+
+# types of values which can not be modified in place, and thus are held by snapshots as is
+_immutable_types = {float, int, bool, str, bytes, type(None)}
+
+
+def _copy(value):
+    """Copy a value which may be modified in place, such as a list or dict, such that the snapshot is not modified by the slave."""
+    if type(value) in _immutable_types:
+        return value
+
+    return value.copy() if _is_ndarray(value) else deepcopy(value)
+
+
+def _share_or_copy(value, previous):
+    """Copy a mutable array, sharing the copy held by the previous snapshot if the contents are unchanged.
+
+    Arrays that do not change between snapshots, such as parameters or a rarely updated lookup table,
+    are thus copied once, rather than once per snapshot.
+    """
+    if (
+        previous is not None
+        and type(previous) is type(value)
+        and getattr(previous, "dtype", None) == getattr(value, "dtype", None)
+    ):
+        try:
+            if memoryview(previous) == memoryview(value):
+                return previous
+        except (TypeError, ValueError, NotImplementedError):
+            pass
+
+    return value.copy() if _is_ndarray(value) else value[:]
+
+
+class Fmi2SlaveState:
+    """Snapshot of the state of a slave instance.
+
+    The snapshot consists of:
+        * a copy of the arrays holding variables kept in array storage, see *Fmi2ArrayStorage*.
+        * the values of the remaining registered variables, with the exception of those computed by read-only properties.
+          Values which may be modified in place, such as lists and dicts, are deep copied.
+        * the hidden state returned by the slave's get_state method, if any.
+
+    Numpy arrays and storage arrays are copied, unless these are unchanged since the previous snapshot
+    of the slave, in which case the copy is shared between the two snapshots.
+
+    The serialized representation of the snapshot is computed once and cached, such that the size
+    of the serialized state is known without serializing it again.
+    """
+
+    __slots__ = (
+        "references",
+        "arrays",
+        "values",
+        "hidden",
+        "_serialized",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        references: Tuple[int, ...],
+        arrays: List[array],
+        values: list,
+        hidden: object = None,
+    ):
+        self.references = references
+        self.arrays = arrays
+        self.values = values
+        self.hidden = hidden
+        self._serialized: Optional[bytes] = None
+
+    @staticmethod
+    def capture(
+        slave: object,
+        accessors: Fmi2Accessors,
+        previous: Optional["Fmi2SlaveState"] = None,
+    ) -> "Fmi2SlaveState":
+        """Take a snapshot of the slave, sharing unchanged arrays with the previous snapshot if provided."""
+
+        if previous is not None and (
+            previous.references != tuple(accessors.state_references)
+            or len(previous.arrays) != len(accessors.arrays)
+        ):
+            previous = None
+
+        arrays = [
+            _share_or_copy(a, previous.arrays[i] if previous else None)
+            for i, a in enumerate(accessors.arrays)
+        ]
+
+        values = []
+        for i, r in enumerate(accessors.state_references):
+            v = accessors.refs_to_getters[r]()
+
+            if _is_ndarray(v):
+                v = _share_or_copy(v, previous.values[i] if previous else None)
+            elif type(v) not in _immutable_types:
+                v = deepcopy(v)
+
+            values.append(v)
+
+        get_state = getattr(slave, "get_state", None)
+        hidden = get_state() if get_state is not None else None
+
+        return Fmi2SlaveState(
+            tuple(accessors.state_references), arrays, values, hidden
+        )
+
+    def restore(self, slave: object, accessors: Fmi2Accessors) -> None:
+        """Set the state of the slave to that of the snapshot.
+
+        Raises:
+            ValueError: raised if the snapshot was taken of a slave with different variables.
+        """
+
+        if self.references != tuple(accessors.state_references) or [
+            (a.typecode, len(a)) for a in self.arrays
+        ] != [(a.typecode, len(a)) for a in accessors.arrays]:
+            raise ValueError(
+                "The state does not match the variables of the slave, it may have been captured from a different model"
+            )
+
+        for a, saved in zip(accessors.arrays, self.arrays):
+            memoryview(a)[:] = memoryview(saved)
+
+        for r, v in zip(self.references, self.values):
+            # copy mutable values such that the snapshot is not modified by subsequent steps
+            accessors.refs_to_setters[r](_copy(v))
+
+        set_state = getattr(slave, "set_state", None)
+        if set_state is not None:
+            set_state(self.hidden)
+
+    def update(self, other: "Fmi2SlaveState") -> None:
+        """Overwrite the snapshot with the contents of another, used when the environment reuses a state."""
+        self.references = other.references
+        self.arrays = other.arrays
+        self.values = other.values
+        self.hidden = other.hidden
+        self._serialized = other._serialized
+
+    def serialize(self) -> bytes:
+        """Returns the binary representation of the snapshot, computing it on the first call."""
+
+        if self._serialized is None:
+            import pickle
+
+            self._serialized = pickle.dumps(
+                (
+                    self.references,
+                    [(a.typecode, a.tobytes()) for a in self.arrays],
+                    self.values,
+                    self.hidden,
+                ),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+        return self._serialized
+
+    @staticmethod
+    def deserialize(data: bytes) -> "Fmi2SlaveState":
+        """Create a snapshot from its binary representation, see serialize."""
+        import pickle
+
+        data = bytes(data)
+        references, arrays, values, hidden = pickle.loads(data)
+
+        state = Fmi2SlaveState(
+            references, [array(t, b) for t, b in arrays], values, hidden
+        )
+        state._serialized = data
+        return state
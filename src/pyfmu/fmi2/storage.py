@@ -0,0 +1,297 @@
+"""Defines array-backed storage of the variables of a slave, of array variables and of outputs computed on demand."""
+
+from array import array
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from pyfmu.fmi2.types import Fmi2DataType_T
+
+
+# typecodes of the arrays used to store each of the FMI types, booleans are stored as integers like in FMI
+_type_to_typecode: Dict[Fmi2DataType_T, str] = {
+    "real": "d",
+    "integer": "i",
+    "boolean": "i",
+}
+
+_type_to_default = {
+    "real": 0.0,
+    "integer": 0,
+    "boolean": False,
+}
+
+
+class Fmi2StorageVariable:
+    """Descriptor exposing a variable kept in the array storage of a slave as a plain attribute.
+
+    The descriptor is installed on the class of the slave, allowing code such as *self.y = 1.0* to
+    read and write the array. Instances which do not keep the variable in their storage fall back
+    to storing it in the instance dictionary.
+    """
+
+    __slots__ = ("name", "boolean")
+
+    def __init__(self, name: str, boolean: bool):
+        self.name = name
+        self.boolean = boolean
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        storage: Optional[Fmi2ArrayStorage] = obj.__dict__.get("_storage")
+
+        try:
+            values, offset = storage.locations[self.name]
+        except (AttributeError, KeyError):
+            try:
+                return obj.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(
+                    f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+                ) from None
+
+        return bool(values[offset]) if self.boolean else values[offset]
+
+    def __set__(self, obj, value):
+        storage: Optional[Fmi2ArrayStorage] = obj.__dict__.get("_storage")
+
+        try:
+            values, offset = storage.locations[self.name]
+        except (AttributeError, KeyError):
+            obj.__dict__[self.name] = value
+            return
+
+        values[offset] = value
+
+
+class Fmi2ArrayVariable:
+    """Descriptor exposing an array variable as a numpy array sharing its memory with the array storage of a slave.
+
+    Assigning to the attribute copies the assigned values into the array, such that *self.u = [1.0, 2.0, 3.0]*
+    sets each of the elements, see *Fmi2Slave.register_array_input*. Instances which do not keep the
+    variable in their storage fall back to storing it in the instance dictionary.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        storage: Optional[Fmi2ArrayStorage] = obj.__dict__.get("_storage")
+
+        try:
+            return storage.view(self.name)
+        except (AttributeError, KeyError):
+            try:
+                return obj.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(
+                    f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+                ) from None
+
+    def __set__(self, obj, value):
+        storage: Optional[Fmi2ArrayStorage] = obj.__dict__.get("_storage")
+
+        try:
+            view = storage.view(self.name)
+        except (AttributeError, KeyError):
+            obj.__dict__[self.name] = value
+            return
+
+        view[...] = value
+
+
+class Fmi2ComputedVariable:
+    """Descriptor exposing an output whose value is computed when it is first read, see *Fmi2Slave.register_output*.
+
+    The value is cached by the instance until its computed outputs are invalidated, which the slave context does
+    whenever a step is taken or a variable is set. Instances which do not compute the variable fall back
+    to storing it in the instance dictionary.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        d = obj.__dict__
+
+        try:
+            return d["_computed_values"][self.name]
+        except KeyError:
+            pass
+
+        try:
+            compute: Callable[[object], object] = d["_computed"][self.name]
+        except KeyError:
+            try:
+                return d[self.name]
+            except KeyError:
+                raise AttributeError(
+                    f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+                ) from None
+
+        value = d["_computed_values"][self.name] = compute(obj)
+        return value
+
+    def __set__(self, obj, value):
+        if self.name in obj.__dict__.get("_computed", ()):
+            raise AttributeError(
+                f"The output {self.name} is computed when read and can not be assigned"
+            )
+
+        obj.__dict__[self.name] = value
+
+
+class Fmi2ArrayStorage:
+    """Keeps the real, integer and boolean variables of a slave in typed contiguous arrays.
+
+    Each type is stored in a separate array, in the order in which the variables are registered.
+    Since value references are assigned in the same order, consecutive variables of the same type
+    occupy a contiguous block of the array, which may be exchanged with the environment using a
+    single copy.
+    """
+
+    def __init__(self):
+        self.arrays: Dict[Fmi2DataType_T, array] = {
+            t: array(c) for t, c in _type_to_typecode.items()
+        }
+        self.locations: Dict[str, Tuple[array, int]] = {}
+        self.refs_to_locations: Dict[int, Tuple[array, int]] = {}
+
+        # arrays and shapes of the array variables, and the numpy views of these created when first read
+        self.array_variables: Dict[str, Tuple[array, Tuple[int, ...]]] = {}
+        self.views: Dict[str, "numpy.ndarray"] = {}  # noqa: F821
+
+    def __getstate__(self) -> dict:
+        # views can not be copied along with the arrays they refer to, copies create their own when first read
+        state = self.__dict__.copy()
+        state["views"] = {}
+        return state
+
+    def add(
+        self,
+        slave: object,
+        name: str,
+        data_type: Fmi2DataType_T,
+        value_reference: int,
+        values: Optional[array] = None,
+    ) -> bool:
+        """Move the attribute of the slave into the storage.
+
+        The current value of the attribute, if any, is used as its initial value.
+
+        Args:
+            values: array to which the variable is appended, rather than the array of its type.
+                This allows a group of variables, such as the states of an ODE, to be kept in an array of their own.
+
+        Returns:
+            true if the variable is stored in the array, false if it can not be stored, for
+            instance if it is computed by a property or is not a real, integer or boolean.
+        """
+        if data_type not in _type_to_typecode:
+            return False
+
+        cls = type(slave)
+
+        for c in cls.__mro__:
+            if name in c.__dict__:
+                if not isinstance(c.__dict__[name], Fmi2StorageVariable):
+                    return False
+                break
+        else:
+            setattr(cls, name, Fmi2StorageVariable(name, data_type == "boolean"))
+
+        if values is None:
+            values = self.arrays[data_type]
+        elif values.typecode != _type_to_typecode[data_type]:
+            return False
+
+        value = slave.__dict__.pop(name, _type_to_default[data_type])
+        offset = len(values)
+        values.append(value)
+
+        self.locations[name] = (values, offset)
+        self.refs_to_locations[value_reference] = (values, offset)
+        return True
+
+    def add_array(
+        self,
+        name: str,
+        data_type: Fmi2DataType_T,
+        shape: Tuple[int, ...],
+        value_references: Iterable[int],
+        values: Iterable[object],
+    ) -> None:
+        """Keep an array variable in an array of its own, whose elements are stored in row-major order.
+
+        Args:
+            shape: shape of the numpy array through which the variable is read, see view.
+            value_references: value references of the elements, in row-major order.
+            values: initial values of the elements, in row-major order.
+        """
+        elements = array(_type_to_typecode[data_type], values)
+        self.array_variables[name] = (elements, shape)
+        self.views.pop(name, None)
+
+        for offset, vref in enumerate(value_references):
+            self.refs_to_locations[vref] = (elements, offset)
+
+    def view(self, name: str) -> "numpy.ndarray":  # noqa: F821
+        """Returns a numpy array sharing its memory with the elements of an array variable.
+
+        Raises:
+            KeyError: raised if the storage does not keep an array variable of that name.
+        """
+        try:
+            return self.views[name]
+        except KeyError:
+            pass
+
+        elements, shape = self.array_variables[name]
+
+        import numpy as np
+
+        view = np.frombuffer(elements, dtype=elements.typecode).reshape(shape)
+        self.views[name] = view
+        return view
+
+    def remove(self, name: str, value_reference: int) -> None:
+        """Stop keeping the variable in the storage, subsequent assignments are stored in the instance dictionary."""
+        self.locations.pop(name, None)
+        self.refs_to_locations.pop(value_reference, None)
+
+    def block(self, start: int, stop: int) -> Optional[memoryview]:
+        """Returns a view of the values of the value references in the range [start, stop), if these are contiguous."""
+        try:
+            values, first = self.refs_to_locations[start]
+            last_values, last = self.refs_to_locations[stop - 1]
+        except KeyError:
+            return None
+
+        n = stop - start
+
+        if last_values is not values or last - first != n - 1:
+            return None
+
+        # every reference in between must be stored in the same array at consecutive offsets,
+        # which holds by construction for the elements of an array variable, see add_array
+        if not any(values is elements for elements, _ in self.array_variables.values()):
+            for i in range(1, n - 1):
+                location = self.refs_to_locations.get(start + i)
+                if (
+                    location is None
+                    or location[0] is not values
+                    or location[1] != first + i
+                ):
+                    return None
+
+        return memoryview(values)[first : first + n]
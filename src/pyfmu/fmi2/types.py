@@ -160,6 +160,78 @@ _type_to_pyType: Dict[Fmi2DataType_T, Fmi2Value_T] = {
 }
 
 
+def _must_define_start(
+    causality: Fmi2Causality_T,
+    variability: Fmi2Variability_T,
+    initial: Optional[Fmi2Initial_T],
+) -> bool:
+    """Returns true if a variable must define a start value, see fmi2 spec p.56."""
+    return (
+        initial in {"exact", "approx"}
+        or causality in {"input", "parameter"}
+        or variability in {"constant"}
+    )
+
+
+def _check_declaration(
+    data_type: Fmi2DataType_T,
+    causality: Fmi2Causality_T,
+    variability: Fmi2Variability_T,
+    initial: Optional[Fmi2Initial_T],
+) -> None:
+    """Validate the combination of data type, causality, variability and initial of a variable.
+
+    Raises:
+        InvalidVariableError: raised if the combination is illegal.
+    """
+    if data_type not in _type_to_pyType:
+        raise InvalidVariableError(
+            f"Unrecognized data type: {data_type}, valid options are: real, integer, boolean and string"
+        )
+
+    # validate combinations of causality and variability
+    if (causality, variability) not in _causality_and_variability_to_initial:
+        raise InvalidVariableError(
+            f"Illegal combination of causality: {causality} and variability: {variability}"
+        )
+
+    # validate initial value for combination of causality and variability
+    if initial not in _causality_and_variability_to_initial[(causality, variability)]:
+        raise InvalidVariableError(
+            f"Initial: {initial}, is illegal for combination of causality: {causality} and variability: {variability}"
+        )
+
+    assert _must_define_start(causality, variability, initial) != (
+        initial == "calculated" or causality == "independent"
+    )
+
+
+def _check_start(
+    data_type: Fmi2DataType_T,
+    causality: Fmi2Causality_T,
+    variability: Fmi2Variability_T,
+    initial: Optional[Fmi2Initial_T],
+    start: Optional[Fmi2Value_T],
+) -> None:
+    """Validate the start value of a variable, whose declaration is valid.
+
+    Raises:
+        InvalidVariableError: raised if a start value is missing, not allowed or of the wrong type.
+    """
+    must_define_start = _must_define_start(causality, variability, initial)
+
+    if (start_defined := start is not None) ^ must_define_start:
+        s = "must be defined" if not start_defined else "may not be defined"
+        raise InvalidVariableError(
+            f"Start values {s} for this combination of variability: {variability}, causality: {causality} and initial: {initial}"
+        )
+
+    if must_define_start and type(start) is not _type_to_pyType[data_type]:
+        raise InvalidVariableError(
+            f"Start value: {start} of type: {type(start)}, and declared data type: {data_type} are not compatible."
+        )
+
+
 class Fmi2ScalarVariable:
     """Represents an variable as defined by the FMI2 specification.
 
@@ -174,6 +246,17 @@ class Fmi2ScalarVariable:
     
     """
 
+    __slots__ = (
+        "name",
+        "data_type",
+        "causality",
+        "initial",
+        "variability",
+        "description",
+        "start",
+        "value_reference",
+    )
+
     def __init__(
         self,
         name: str,
@@ -199,46 +282,8 @@ class Fmi2ScalarVariable:
 
         """
 
-        # validate combinations of causality and variability
-        if (causality, variability) not in _causality_and_variability_to_initial:
-            raise InvalidVariableError(
-                f"Illegal combination of causality: {causality} and variability: {variability}"
-            )
-
-        # validate initial value for combination of causality and variability
-        if (
-            initial
-            not in _causality_and_variability_to_initial[(causality, variability)]
-        ):
-            raise InvalidVariableError(
-                f"Initial: {initial}, is illegal for combination of causality: {causality} and variability: {variability}"
-            )
-
-        # validate start value for combination of causality, variability and initial
-        # see fmi2 spec p.56
-        must_define_start = (
-            initial in {"exact", "approx"}
-            or causality in {"input", "parameter"}
-            or variability in {"constant"}
-        )
-        assert must_define_start != (
-            initial == "calculated" or causality == "independent"
-        )
-
-        if (start_defined := start is not None) ^ must_define_start:
-            s = "must be defined" if not start_defined else "may not be defined"
-            raise InvalidVariableError(
-                f"Start values {s} for this combination of variability: {variability}, causality: {causality} and initial: {initial}"
-            )
-
-        if (
-            must_define_start
-            and start is not None
-            and type(start) is not (expected := _type_to_pyType[data_type])
-        ):
-            raise InvalidVariableError(
-                f"Start value: {start} of type: {type(start)}, and declared data type: {data_type} are not compatible."
-            )
+        _check_declaration(data_type, causality, variability, initial)
+        _check_start(data_type, causality, variability, initial, start)
 
         self.name = name
         self.data_type: Fmi2DataType_T = data_type
@@ -249,6 +294,30 @@ class Fmi2ScalarVariable:
         self.start = start
         self.value_reference = value_reference
 
+    @classmethod
+    def _from_validated(
+        cls,
+        name: str,
+        data_type: Fmi2DataType_T,
+        causality: Fmi2Causality_T,
+        variability: Fmi2Variability_T,
+        value_reference: int,
+        initial: Optional[Fmi2Initial_T],
+        start: Optional[Fmi2Value_T],
+        description: Optional[str],
+    ) -> "Fmi2ScalarVariable":
+        """Create a variable whose declaration has already been validated, see *Fmi2Slave.register_variables*."""
+        v = cls.__new__(cls)
+        v.name = name
+        v.data_type = data_type
+        v.causality = causality
+        v.initial = initial
+        v.variability = variability
+        v.description = description
+        v.start = start
+        v.value_reference = value_reference
+        return v
+
     def __str__(self) -> str:
         return self.__repr__()
 
@@ -2,11 +2,17 @@ import argparse
 import sys
 from os.path import join, dirname, realpath, normpath
 import logging
+from time import perf_counter
 
 logger = logging.getLogger(__file__)
 
 from pyfmu.builder.generate import generate_project
-from pyfmu.builder.export import export_project
+from pyfmu.builder.cache import ExportCache
+from pyfmu.builder.export import (
+    export_project,
+    export_projects,
+    format_export_summary,
+)
 from pyfmu.builder.validate import validate_fmu
 
 
@@ -33,14 +39,49 @@ def config_export_subprogram(subparsers: argparse.ArgumentParser) -> None:
     parser_export = subparsers.add_parser("export", help="Export project as FMU.",)
 
     parser_export.add_argument(
-        "--project", "-p", required=True, help="path to Python project"
+        "--project",
+        "-p",
+        required=True,
+        nargs="+",
+        help="path to Python project, several projects may be exported at once",
     )
 
     parser_export.add_argument(
         "--output",
         "-o",
         required=True,
-        help="Path to which the exported archive is written",
+        help="Path to which the exported archive is written. If several projects are exported, this is the directory in which these are placed.",
+    )
+
+    parser_export.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of projects exported concurrently, 0 uses every processor",
+    )
+
+    parser_export.add_argument(
+        "--compress",
+        "-c",
+        action="store_true",
+        help="write the FMU as a zip archive rather than as a directory",
+    )
+
+    parser_export.add_argument(
+        "--compression-level",
+        dest="compression_level",
+        type=int,
+        default=6,
+        choices=range(10),
+        metavar="{0..9}",
+        help="level of compression used for archives, from 0 (none) to 9 (best)",
+    )
+
+    parser_export.add_argument(
+        "--precompile",
+        action="store_true",
+        help="ship the scripts of the project compiled to bytecode for the interpreter running the export, reducing the startup time of the FMU",
     )
 
     parser_export.add_argument(
@@ -50,6 +91,19 @@ def config_export_subprogram(subparsers: argparse.ArgumentParser) -> None:
         help="allow overwriting of existing files",
     )
 
+    parser_export.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse previous exports of the project if neither the project nor pyfmu has changed",
+    )
+
+    parser_export.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=None,
+        help="directory in which exports are cached, defaults to PYFMU_CACHE_DIR or ~/.cache/pyfmu",
+    )
+
 
 def config_validate_subprogram(subparsers: argparse.ArgumentParser) -> None:
 
@@ -83,11 +137,48 @@ def handle_generate(args):
 
 def handle_export(args):
 
-    project_path = args.project
+    use_cache = args.cache or args.cache_dir is not None
+
+    if len(args.project) == 1 and args.jobs == 1:
+        project_path = args.project[0]
+
+        archive_path = args.output
+
+        cache = ExportCache(args.cache_dir) if use_cache else None
 
-    archive_path = args.output
+        export_project(
+            project_path,
+            archive_path,
+            compress=args.compress,
+            compresslevel=args.compression_level,
+            precompile=args.precompile,
+            cache=cache,
+        )
+
+        if cache is not None:
+            print(cache.summary())
+
+        return
+
+    def report_progress(result, n_completed, n_total):
+        print(f"[{n_completed}/{n_total}] {result}")
+
+    start = perf_counter()
+    results = export_projects(
+        args.project,
+        args.output,
+        jobs=args.jobs or None,
+        compress=args.compress,
+        compresslevel=args.compression_level,
+        precompile=args.precompile,
+        use_cache=use_cache,
+        cache_dir=args.cache_dir,
+        progress=report_progress,
+    )
+    print(format_export_summary(results, perf_counter() - start))
 
-    export_project(project_path, archive_path, compress=False)
+    if not all(r.ok for r in results):
+        raise RuntimeError("One or more projects failed to export")
 
 
 def handle_validate(args):
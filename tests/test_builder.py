@@ -1,11 +1,21 @@
+import sys
 from pathlib import Path
-from importlib.util import module_from_spec, spec_from_file_location
+from shutil import copytree
+from zipfile import ZipFile
+from importlib.util import (
+    MAGIC_NUMBER,
+    module_from_spec,
+    source_hash,
+    spec_from_file_location,
+)
 
 
 import pytest
 
-from pyfmu.builder.export import export_project
+from pyfmu.builder.cache import ExportCache, ValidationCache
+from pyfmu.builder.export import export_project, export_projects
 from pyfmu.builder.generate import generate_project
+from pyfmu.builder.validate import validate_fmu
 
 from .utils import get_example_project
 
@@ -47,3 +57,143 @@ class TestExport:
         assert (output_path / "binaries" / "win64" / "pyfmu.dll").is_file()
         assert (output_path / "binaries" / "linux64" / "pyfmu.so").is_file()
         assert (output_path / "resources" / "adder.py").is_file()
+
+    def test_export_skips_bytecode(self, tmpdir):
+
+        tmpdir = Path(tmpdir)
+        project = tmpdir / "project"
+        copytree(get_example_project("Adder"), project)
+
+        # bytecode is written to the resources when the slave is imported by the export
+        pycache = project / "resources" / "__pycache__"
+        pycache.mkdir()
+        (pycache / "stale.pyc").write_bytes(b"")
+
+        export_project(project, tmpdir / "Adder", compress=False)
+        export_project(project, tmpdir / "Adder.fmu", compress=True)
+
+        assert not (tmpdir / "Adder" / "resources" / "__pycache__").exists()
+        with ZipFile(tmpdir / "Adder.fmu") as zf:
+            assert not any("__pycache__" in n for n in zf.namelist())
+
+    def test_export_compressed(self, tmpdir, monkeypatch):
+
+        tmpdir = Path(tmpdir)
+        project = get_example_project("Adder")
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1600000000")
+
+        a = export_project(project, tmpdir / "a.fmu", compress=True)
+        b = export_project(
+            project, tmpdir / "b.fmu", compress=True, compresslevel=9
+        )
+
+        with ZipFile(tmpdir / "a.fmu") as za, ZipFile(tmpdir / "b.fmu") as zb:
+            names = za.namelist()
+            assert names[0] == "modelDescription.xml"
+            assert {
+                "binaries/win64/pyfmu.dll",
+                "binaries/linux64/pyfmu.so",
+                "resources/adder.py",
+                "resources/slave_configuration.json",
+            } <= set(names)
+            assert names == zb.namelist()
+
+            # entries are identical regardless of when and from where they are written
+            assert len({i.date_time for i in za.infolist()}) == 1
+            for name in names:
+                assert za.read(name) == zb.read(name)
+
+            assert za.read("modelDescription.xml").decode() == a.model_description
+            assert 'generationDateAndTime="2020-09-13T12:26:40Z"' in a.model_description
+
+        # exporting the project again yields the same archive
+        export_project(project, tmpdir / "c.fmu", compress=True)
+        assert (tmpdir / "a.fmu").read_bytes() == (tmpdir / "c.fmu").read_bytes()
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_export_precompiled(self, tmpdir, compress):
+
+        tmpdir = Path(tmpdir)
+        output_path = tmpdir / ("Adder.fmu" if compress else "Adder")
+        pyc = f"resources/__pycache__/adder.{sys.implementation.cache_tag}.pyc"
+
+        export_project(
+            get_example_project("Adder"), output_path, compress, precompile=True
+        )
+
+        if compress:
+            with ZipFile(output_path) as zf:
+                zf.extractall(tmpdir / "extracted")
+            output_path = tmpdir / "extracted"
+
+        # checked hash-based bytecode, see PEP 552
+        header = (output_path / pyc).read_bytes()[:16]
+        assert header[:4] == MAGIC_NUMBER
+        assert int.from_bytes(header[4:8], "little") == 0b11
+        assert header[8:16] == source_hash(
+            (output_path / "resources" / "adder.py").read_bytes()
+        )
+
+    def test_export_cache(self, tmpdir):
+
+        tmpdir = Path(tmpdir)
+        cache = ExportCache(tmpdir / "cache")
+        project = get_example_project("Adder")
+
+        first = export_project(project, tmpdir / "a", compress=False, cache=cache)
+        second = export_project(project, tmpdir / "b", compress=False, cache=cache)
+
+        assert (first.cache_hit, second.cache_hit) == (False, True)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second.model_description == first.model_description
+
+        md_a = tmpdir / "a" / "modelDescription.xml"
+        md_b = tmpdir / "b" / "modelDescription.xml"
+        assert md_a.read_bytes() == md_b.read_bytes()
+        assert (tmpdir / "b" / "resources" / "adder.py").is_file()
+
+    def test_export_projects(self, tmpdir):
+
+        tmpdir = Path(tmpdir)
+        projects = [
+            get_example_project(n) for n in ["Adder", "ConstantSignalGenerator"]
+        ]
+        completed = []
+
+        results = export_projects(
+            projects,
+            tmpdir,
+            jobs=2,
+            progress=lambda r, n, total: completed.append((n, total)),
+        )
+
+        assert [r.project_path for r in results] == projects
+        assert all(r.ok for r in results)
+        assert sorted(completed) == [(1, 2), (2, 2)]
+
+        for p in projects:
+            assert (tmpdir / p.name / "modelDescription.xml").is_file()
+
+
+class TestValidate:
+    def test_validation_cache(self, tmpdir):
+
+        tmpdir = Path(tmpdir)
+        cache = ValidationCache(tmpdir / "cache")
+        archive = export_project(
+            get_example_project("Adder"), tmpdir / "Adder", compress=False
+        )
+
+        first = validate_fmu(archive.root, ["fmpy"], cache=cache)
+        second = validate_fmu(archive.root, ["fmpy"], cache=cache)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert not first["fmpy"]["cached"] and second["fmpy"]["cached"]
+        assert second["fmpy"]["valid"] == first["fmpy"]["valid"]
+        assert second["fmpy"]["message"] == first["fmpy"]["message"]
+        assert "fmpy (" in first.get_report()
+
+        # modifying the FMU invalidates the cached result
+        (archive.resources_dir / "adder.py").write_text("invalid")
+        validate_fmu(archive.root, ["fmpy"], cache=cache)
+        assert cache.misses == 2
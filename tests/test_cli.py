@@ -36,3 +36,28 @@ def test_export(tmpdir):
         == 0
     )
 
+
+def test_export_multiple(tmpdir):
+    tmpdir = Path(tmpdir)
+
+    projects = [str((tmpdir / name).absolute()) for name in ["A", "B"]]
+    export_dir = tmpdir / "exported"
+
+    for name, path in zip(["A", "B"], projects):
+        assert (
+            subprocess.run(
+                ["pyfmu", "generate", "--name", name, "--output", path]
+            ).returncode
+            == 0
+        )
+
+    assert (
+        subprocess.run(
+            ["pyfmu", "export", "--jobs", "2", "--project", *projects]
+            + ["--output", str(export_dir)]
+        ).returncode
+        == 0
+    )
+
+    assert (export_dir / "A" / "modelDescription.xml").is_file()
+    assert (export_dir / "B" / "modelDescription.xml").is_file()
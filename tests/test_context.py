@@ -1,5 +1,10 @@
 # from test.example_finder import ExampleArchive
+import json
+import math
 import os
+import sys
+import threading
+from array import array
 
 import pytest
 
@@ -72,4 +77,985 @@ class TestSlaveManager:
             assert mgr.set_xxx(h1, references=[3], values=[0]) is Fmi2Status.error
             assert mgr.set_xxx(h2, references=[3], values=[0]) is Fmi2Status.error
 
-    pass
+    def test_handles_are_reused(self):
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            def instantiate():
+                return mgr.instantiate(
+                    instance_name="a",
+                    fmu_type=Fmi2Type.co_simulation,
+                    guid="",
+                    resources_uri=a.resources_dir.as_uri(),
+                    logging_callback=callback,
+                    logging_on=True,
+                    visible=True,
+                )
+
+            h1, h2, h3 = instantiate(), instantiate(), instantiate()
+            assert (h1, h2, h3) == (0, 1, 2)
+
+            mgr.free_instance(h2)
+            assert mgr._records[h2] is None
+            assert instantiate() == h2
+
+            # failed instantiations release their handle
+            missing = (a.resources_dir / "missing").as_uri()
+            assert (
+                mgr.instantiate(
+                    "b", Fmi2Type.co_simulation, "", missing, callback, True, True
+                )
+                is None
+            )
+            assert instantiate() == 3
+            assert len(mgr._records) == 4
+
+    def test_configuration_and_class_are_resolved_once(self):
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            def instantiate(context):
+                return context.instantiate(
+                    "a",
+                    Fmi2Type.co_simulation,
+                    "",
+                    a.resources_dir.as_uri(),
+                    callback,
+                    False,
+                    False,
+                )
+
+            assert instantiate(mgr) is not None
+
+            # subsequent instantiations neither read the configuration nor import the script
+            (a.resources_dir / "slave_configuration.json").unlink()
+            assert instantiate(mgr) is not None
+            assert instantiate(Fmi2SlaveContext()) is None
+
+    def test_concurrent_instances(self):
+        mgr = Fmi2SlaveContext()
+        errors = []
+
+        with ExampleArchive("Adder") as a:
+
+            def run(i: int):
+                try:
+                    h = mgr.instantiate(
+                        instance_name=f"a{i}",
+                        fmu_type=Fmi2Type.co_simulation,
+                        guid="",
+                        resources_uri=a.resources_dir.as_uri(),
+                        logging_callback=callback,
+                        logging_on=False,
+                        visible=False,
+                    )
+                    for n in range(200):
+                        assert mgr.set_xxx(h, [0, 1], [float(i), float(n)]) == Fmi2Status.ok
+                        assert mgr.do_step(h, n, 1.0, False) == Fmi2Status.ok
+                        assert mgr.get_xxx(h, [2]) == ([float(i + n)], Fmi2Status.ok)
+                    mgr.free_instance(h)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert errors == []
+        assert mgr._n_slaves == 0
+        assert sorted(mgr._free_handles) == list(range(len(mgr._records)))
+
+    def test_calls_waiting_on_a_freed_instance(self):
+        mgr = Fmi2SlaveContext()
+        results = []
+
+        with ExampleArchive("Adder") as a:
+
+            def instantiate():
+                return mgr.instantiate(
+                    instance_name="a",
+                    fmu_type=Fmi2Type.co_simulation,
+                    guid="",
+                    resources_uri=a.resources_dir.as_uri(),
+                    logging_callback=callback,
+                    logging_on=False,
+                    visible=False,
+                )
+
+            h = instantiate()
+            record = mgr._records[h]
+
+            with record.lock:
+                waiting = threading.Thread(
+                    target=lambda: results.append(mgr.get_xxx(h, [2]))
+                )
+                waiting.start()
+                waiting.join(0.1)
+
+                # the handle is reused by another instance before the waiting call acquires the lock
+                mgr.free_instance(h)
+                assert instantiate() == h
+
+            waiting.join()
+
+        assert results == [([], Fmi2Status.error)]
+        assert mgr._records[h] is not record
+        assert mgr.get_xxx(h, [2]) == ([0.0], Fmi2Status.ok)
+
+    def test_accessor_plans_are_reused(self):
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            h = mgr.instantiate(
+                instance_name="a",
+                fmu_type=Fmi2Type.co_simulation,
+                guid="",
+                resources_uri=a.resources_dir.as_uri(),
+                logging_callback=callback,
+                logging_on=True,
+                visible=True,
+            )
+
+            assert mgr.set_xxx(h, references=[0, 1], values=[1.0, 2.0]) is Fmi2Status.ok
+            plan = mgr._records[h].accessors.plan([0, 1])
+            assert mgr.set_xxx(h, references=[0, 1], values=[3.0, 4.0]) is Fmi2Status.ok
+            assert mgr._records[h].accessors.plan((0, 1)) is plan
+
+            val, status = mgr.get_xxx(h, references=[2, 0])
+            assert status is Fmi2Status.ok and val == [7.0, 3.0]
+
+            # unknown value reference
+            val, status = mgr.get_xxx(h, references=[42])
+            assert status is Fmi2Status.error
+
+    def test_validation_policy(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+
+        monkeypatch.setenv("PYFMU_VALIDATION_POLICY", "first_n")
+        monkeypatch.setenv("PYFMU_VALIDATION_CALLS", "1")
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            h = mgr.instantiate(
+                instance_name="a",
+                fmu_type=Fmi2Type.co_simulation,
+                guid="",
+                resources_uri=a.resources_dir.as_uri(),
+                logging_callback=callback,
+                logging_on=True,
+                visible=True,
+            )
+
+            # numpy scalars are converted to the declared type
+            values = [np.float64(1.0), np.float64(2.0)]
+            assert mgr.set_xxx(h, references=[0, 1], values=values) is Fmi2Status.ok
+            assert type(mgr._records[h].slave.a) is float
+
+            # validated until initialization is done
+            assert mgr.set_xxx(h, references=[0], values=[1]) is Fmi2Status.error
+            assert mgr.exit_initialization_mode(h) is Fmi2Status.ok
+            assert mgr.set_xxx(h, references=[0], values=[1]) is Fmi2Status.error
+
+            # the single validated call has been spent
+            assert mgr.set_xxx(h, references=[0], values=[1]) is Fmi2Status.ok
+
+    def test_buffers(self):
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            h = mgr.instantiate(
+                instance_name="a",
+                fmu_type=Fmi2Type.co_simulation,
+                guid="",
+                resources_uri=a.resources_dir.as_uri(),
+                logging_callback=callback,
+                logging_on=True,
+                visible=True,
+            )
+
+            references = memoryview(array("I", [0, 1])).cast("B")
+            values = memoryview(array("d", [1.0, 2.0])).cast("B")
+            assert mgr.set_xxx_buffer(h, references, values) is Fmi2Status.ok
+
+            out = array("d", [0.0, 0.0, 0.0])
+            references = memoryview(array("I", [0, 1, 2])).cast("B")
+            status = mgr.get_xxx_buffer(h, references, memoryview(out).cast("B"))
+            assert status is Fmi2Status.ok
+            assert out.tolist() == [1.0, 2.0, 3.0]
+
+    def test_step_exchange(self):
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+
+            h = mgr.instantiate(
+                instance_name="a",
+                fmu_type=Fmi2Type.co_simulation,
+                guid="",
+                resources_uri=a.resources_dir.as_uri(),
+                logging_callback=callback,
+                logging_on=True,
+                visible=True,
+            )
+
+            values, status = mgr.step_exchange(h, [0, 1], [1.0, 2.0], 0.0, 1.0, [2])
+            assert (values, status) == ([3.0], Fmi2Status.ok)
+
+            # a failure to set the inputs prevents the step
+            values, status = mgr.step_exchange(h, [0], ["1.0"], 1.0, 1.0, [2])
+            assert (values, status) == ([], Fmi2Status.error)
+
+            out = array("d", [0.0])
+            status = mgr.step_exchange_buffer(
+                h,
+                memoryview(array("I", [0, 1])).cast("B"),
+                memoryview(array("d", [3.0, 4.0])).cast("B"),
+                1.0,
+                1.0,
+                False,
+                memoryview(array("I", [2])).cast("B"),
+                memoryview(out).cast("B"),
+            )
+            assert status == Fmi2Status.ok
+            assert out.tolist() == [7.0]
+
+
+class TestProfiling:
+    def test_statistics(self, tmp_path, monkeypatch):
+        output = tmp_path / "profile.jsonl"
+        monkeypatch.setenv("PYFMU_PROFILE", "1")
+        monkeypatch.setenv("PYFMU_PROFILE_OUTPUT", str(output))
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+            messages = []
+            h = mgr.instantiate(
+                "a",
+                Fmi2Type.co_simulation,
+                "",
+                a.resources_dir.as_uri(),
+                lambda *m: messages.append(m),
+                False,
+                False,
+            )
+
+            for n in range(10):
+                _, status = mgr.step_exchange(h, [0, 1], [1.0, float(n)], n, 1.0, [2])
+                assert status is Fmi2Status.ok
+            assert mgr.set_debug_logging(h, [], True) is Fmi2Status.ok
+            mgr._records[h].logger.ok("message")
+
+            statistics = mgr.get_statistics(h)
+            n_messages = len(messages)
+            mgr.free_instance(h)
+            assert mgr.get_statistics(h) is None
+
+        calls = statistics["calls"]
+        assert calls["step_exchange"]["count"] == 10
+        assert calls["do_step"]["count"] == 10
+        assert (calls["set_xxx"]["values"], calls["get_xxx"]["values"]) == (20, 10)
+
+        do_step = calls["do_step"]
+        assert 0 < do_step["p50"] <= do_step["p99"] <= do_step["max"]
+        assert statistics["slave"]["do_step"]["count"] == 10
+        assert statistics["validation"]["count"] == 20
+        assert statistics["logging"]["count"] == n_messages == 1
+
+        dumped = json.loads(output.read_text())
+        assert dumped["calls"]["do_step"]["count"] == 10
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.delenv("PYFMU_PROFILE", raising=False)
+        mgr = Fmi2SlaveContext()
+
+        with ExampleArchive("Adder") as a:
+            h = mgr.instantiate(
+                "a",
+                Fmi2Type.co_simulation,
+                "",
+                a.resources_dir.as_uri(),
+                callback,
+                False,
+                False,
+            )
+            assert mgr.get_statistics(h) is None
+
+
+def write_resources(resources_dir, slave_class: str, source: str, **configuration):
+    """Write a slave script and its configuration to a resources directory, returning its uri."""
+    resources_dir.mkdir(parents=True, exist_ok=True)
+    script = f"{slave_class.lower()}.py"
+    (resources_dir / script).write_text(source)
+    (resources_dir / "slave_configuration.json").write_text(
+        json.dumps(
+            {"slave_class": slave_class, "slave_script": script, **configuration}
+        )
+    )
+    return resources_dir.as_uri()
+
+
+_array_storage_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class ArrayStorage(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="ArrayStorage", storage="array", *args, **kwargs)
+
+        self.a = 1.0
+        self.b = 2.0
+        self.n = 3
+        self.on = True
+        self.register_input("a")
+        self.register_input("b")
+        self.register_input("n", "integer", "discrete")
+        self.register_input("on", "boolean", "discrete")
+        self.register_output("s", storage="attribute")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.s = self.a + self.b if self.on else 0.0
+        self.n += 1
+        return Fmi2Status.ok
+'''
+
+
+class TestArrayStorage:
+    def test_attributes_are_backed_by_arrays(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+
+        h = mgr.instantiate(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(
+                tmp_path, "ArrayStorage", _array_storage_slave
+            ),
+            logging_callback=callback,
+            logging_on=True,
+            visible=True,
+        )
+
+        slave = mgr._records[h].slave
+        assert "a" not in vars(slave)
+        assert slave.get_value_block(0, 2).tolist() == [1.0, 2.0]
+        assert slave.get_value_block(0, 4) is None
+
+        assert mgr.get_xxx(h, [0, 1, 2, 3]) == ([1.0, 2.0, 3, True], Fmi2Status.ok)
+
+        # values set through the buffer are visible to the slave's attributes
+        references = memoryview(array("I", [0, 1])).cast("B")
+        values = memoryview(array("d", [4.0, 5.0])).cast("B")
+        assert mgr.set_xxx_buffer(h, references, values) is Fmi2Status.ok
+        assert (slave.a, slave.b) == (4.0, 5.0)
+
+        assert mgr.set_xxx(h, [3], [False]) == Fmi2Status.ok
+        assert slave.on is False
+
+        assert mgr.do_step(h, 0.0, 1.0, False) == Fmi2Status.ok
+        assert mgr.get_xxx(h, [2, 4]) == ([4, 0.0], Fmi2Status.ok)
+
+        assert mgr.set_xxx(h, [3], [True]) == Fmi2Status.ok
+        assert mgr.do_step(h, 1.0, 1.0, False) == Fmi2Status.ok
+        assert mgr.get_xxx(h, [4]) == ([9.0], Fmi2Status.ok)
+
+
+_array_variable_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class ArrayVariables(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="ArrayVariables", *args, **kwargs)
+
+        self.register_array_input("u", 100)
+        self.register_array_output("y", 100)
+        self.register_array_output("above", 2, "boolean", "discrete")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.y = 2.0 * self.u
+        self.above = [self.y.sum() > 0.0, self.y.max() > 100.0]
+        return Fmi2Status.ok
+'''
+
+
+class TestArrayVariables:
+    def test_ranges_are_exchanged_as_blocks(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+
+        h = mgr.instantiate(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(
+                tmp_path, "ArrayVariables", _array_variable_slave
+            ),
+            logging_callback=callback,
+            logging_on=True,
+            visible=True,
+        )
+
+        slave = mgr._records[h].slave
+        inputs, outputs = list(range(100)), list(range(100, 200))
+
+        assert mgr.set_xxx(h, inputs, [float(i) for i in range(100)]) == Fmi2Status.ok
+        assert slave.u[99] == 99.0
+
+        state, _ = mgr.get_fmu_state(h)
+        assert mgr.do_step(h, 0.0, 1.0, False) == Fmi2Status.ok
+        assert mgr.get_xxx(h, outputs) == (
+            [2.0 * i for i in range(100)],
+            Fmi2Status.ok,
+        )
+        assert mgr.get_xxx(h, [101, 200, 201]) == ([2.0, True, True], Fmi2Status.ok)
+
+        # values set through the buffer are visible to the slave's arrays
+        references = memoryview(array("I", range(10, 20))).cast("B")
+        values = memoryview(array("d", [-1.0] * 10)).cast("B")
+        assert mgr.set_xxx_buffer(h, references, values) is Fmi2Status.ok
+        assert slave.u[10:20].tolist() == [-1.0] * 10
+
+        read = array("d", [0.0] * 100)
+        references = memoryview(array("I", outputs)).cast("B")
+        assert mgr.set_fmu_state(h, state) is Fmi2Status.ok
+        assert mgr.do_step(h, 0.0, 1.0, False) == Fmi2Status.ok
+        assert mgr.get_xxx_buffer(h, references, memoryview(read).cast("B")) is (
+            Fmi2Status.ok
+        )
+        assert read[99] == 198.0
+
+        # values of the wrong type are rejected rather than copied into the array
+        assert mgr.set_xxx(h, [0, 1], [1, 2.0]) == Fmi2Status.error
+
+
+_logging_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class Chatty(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Chatty", *args, **kwargs)
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        for i in range(5):
+            self.log_ok("step %s message %s", args=(current_time, i))
+        return Fmi2Status.ok
+'''
+
+
+class TestBufferedLogging:
+    def test_messages_are_delivered_when_calls_return(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        messages = []
+
+        def collect(instance_name, status, category, message):
+            messages.append(message)
+
+        h = mgr.instantiate(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(
+                tmp_path,
+                "Chatty",
+                _logging_slave,
+                logging={"buffer_size": 3, "overflow": "drop_oldest"},
+            ),
+            logging_callback=collect,
+            logging_on=True,
+            visible=True,
+        )
+        assert h is not None
+
+        mgr.set_debug_logging(h, [], True)
+        messages.clear()
+
+        assert mgr.do_step(h, 0.0, 1.0, False) == Fmi2Status.ok
+        assert messages == [f"step 0.0 message {i}" for i in range(2, 5)]
+        assert mgr._records[h].logger.dropped == 2
+
+
+_prototyped_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+constructed = 0
+
+
+class Prototyped(Fmi2Slave):
+
+    clone_instances = True
+
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Prototyped", storage="array", *args, **kwargs)
+        global constructed
+        constructed += 1
+
+        self.a = 1.0
+        self.history = []
+        self.register_input("a")
+        self.register_output("s", storage="attribute")
+        self.register_log_category("custom", lambda m, c, s: c == "custom")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.history.append(self.a)
+        self.s = sum(self.history)
+        return Fmi2Status.ok
+'''
+
+
+class TestPrototypes:
+    def test_instances_are_cloned(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        uri = write_resources(tmp_path, "Prototyped", _prototyped_slave)
+
+        h1, h2, h3 = [
+            mgr.instantiate(
+                f"p{i}", Fmi2Type.co_simulation, "guid", uri, callback, False, False
+            )
+            for i in range(3)
+        ]
+        assert sys.modules["prototyped"].constructed == 1
+
+        s1, s2 = mgr._records[h1].slave, mgr._records[h2].slave
+        assert s1.variables is s2.variables
+        assert (
+            mgr._records[h2].accessors.refs_to_attr
+            is mgr._records[h3].accessors.refs_to_attr
+        )
+
+        # clones do not share their state
+        assert mgr.set_xxx(h1, [0], [2.0]) is Fmi2Status.ok
+        assert mgr.do_step(h1, 0.0, 1.0, False) is Fmi2Status.ok
+        assert mgr.do_step(h2, 0.0, 1.0, False) is Fmi2Status.ok
+        assert mgr.get_xxx(h1, [0, 1]) == ([2.0, 2.0], Fmi2Status.ok)
+        assert mgr.get_xxx(h2, [0, 1]) == ([1.0, 1.0], Fmi2Status.ok)
+        assert mgr.get_xxx(h3, [0]) == ([1.0], Fmi2Status.ok)
+
+        # log categories registered by the constructor are available to clones
+        assert mgr.set_debug_logging(h2, ["custom"], True) is Fmi2Status.ok
+
+        # instances of another model are constructed
+        other = mgr.instantiate(
+            "q", Fmi2Type.co_simulation, "other", uri, callback, False, False
+        )
+        assert other is not None
+        assert sys.modules["prototyped"].constructed == 2
+
+
+_stateless_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class Stateless(Fmi2Slave):
+
+    stateless = True
+
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Stateless", *args, **kwargs)
+
+        self.u = 0.0
+        self.k = 2.0
+        self.steps = 0
+        self.register_input("u")
+        self.register_parameter("k")
+        self.register_output("y")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.steps += 1
+        self.y = self.k * self.u
+        return Fmi2Status.ok
+'''
+
+
+class TestStateless:
+    def instantiate(self, mgr, tmp_path, **configuration):
+        uri = write_resources(tmp_path, "Stateless", _stateless_slave, **configuration)
+        h = mgr.instantiate(
+            "s", Fmi2Type.co_simulation, "", uri, callback, False, False
+        )
+        return h, mgr._records[h].slave if h is not None else None
+
+    def test_unchanged_steps_are_skipped(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h, slave = self.instantiate(mgr, tmp_path)
+
+        assert mgr.step_exchange(h, [0], [1.0], 0.0, 1.0, [2]) == (
+            [2.0],
+            Fmi2Status.ok,
+        )
+        assert slave.steps == 1
+
+        # setting the current values does not invalidate the step
+        for t in range(1, 4):
+            assert mgr.step_exchange(h, [0], [1.0], t, 1.0, [2]) == (
+                [2.0],
+                Fmi2Status.ok,
+            )
+        assert slave.steps == 1
+
+        assert mgr.set_xxx(h, [1], [3.0]) is Fmi2Status.ok
+        assert mgr.do_step(h, 4.0, 1.0, False) is Fmi2Status.ok
+        assert mgr.get_xxx(h, [2]) == ([3.0], Fmi2Status.ok)
+        assert slave.steps == 2
+
+        # values are cached until the slave changes
+        slave.y = 10.0
+        assert mgr.get_xxx(h, [2]) == ([3.0], Fmi2Status.ok)
+        assert mgr.reset(h) is Fmi2Status.ok
+        assert mgr.get_xxx(h, [2]) == ([10.0], Fmi2Status.ok)
+
+    @pytest.mark.parametrize("policy,steps", [("lru", 3), ("fifo", 4)])
+    def test_memo(self, tmp_path, policy, steps):
+        mgr = Fmi2SlaveContext()
+        h, slave = self.instantiate(
+            mgr, tmp_path, step_memo_size=2, step_memo_policy=policy
+        )
+
+        # the third input evicts the first under fifo, and the second under lru
+        outputs = []
+        for t, u in enumerate([1.0, 2.0, 1.0, 3.0, 1.0]):
+            values, status = mgr.step_exchange(h, [0], [u], t, 1.0, [2])
+            assert status is Fmi2Status.ok
+            outputs.append(values[0])
+
+        assert outputs == [2.0, 4.0, 2.0, 6.0, 2.0]
+        assert slave.steps == steps
+
+    def test_invalid_memo_configuration(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h, _ = self.instantiate(
+            mgr, tmp_path, step_memo_size=2, step_memo_policy="lfu"
+        )
+        assert h is None
+
+
+_computed_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class Computed(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Computed", *args, **kwargs)
+
+        self.u = 1.0
+        self.x = 0.0
+        self.computed = 0
+        self.register_input("u")
+        self.register_output("x")
+        self.register_output("diagnostic", compute=self.compute_diagnostic)
+
+    def compute_diagnostic(self):
+        self.computed += 1
+        return self.x * 10
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.x += self.u
+        return Fmi2Status.ok
+'''
+
+
+class TestComputedOutputs:
+    def test_outputs_are_computed_when_read(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        uri = write_resources(tmp_path, "Computed", _computed_slave)
+        h = mgr.instantiate(
+            "c", Fmi2Type.co_simulation, "", uri, callback, False, False
+        )
+        slave = mgr._records[h].slave
+
+        for t in range(3):
+            assert mgr.step_exchange(h, [0], [1.0], t, 1.0, [1]) == (
+                [float(t + 1)],
+                Fmi2Status.ok,
+            )
+        assert slave.computed == 0
+
+        # the value is cached until the next step or until a variable is set
+        assert mgr.get_xxx(h, [2]) == ([30.0], Fmi2Status.ok)
+        assert mgr.get_xxx(h, [1, 2]) == ([3.0, 30.0], Fmi2Status.ok)
+        assert slave.computed == 1
+
+        assert mgr.do_step(h, 3.0, 1.0, False) is Fmi2Status.ok
+        assert mgr.get_xxx(h, [2]) == ([40.0], Fmi2Status.ok)
+        assert mgr.set_xxx(h, [1], [0.0]) is Fmi2Status.ok
+        assert mgr.get_xxx(h, [2]) == ([0.0], Fmi2Status.ok)
+        assert slave.computed == 3
+
+        # computed outputs are not part of the state
+        state, status = mgr.get_fmu_state(h)
+        assert status is Fmi2Status.ok
+        assert mgr.set_fmu_state(h, state) is Fmi2Status.ok
+
+
+
+_ode_slave = '''
+from pyfmu.fmi2 import Fmi2OdeSlave
+
+
+class Decay(Fmi2OdeSlave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__("Decay", rtol=1e-8, atol=1e-10, *args, **kwargs)
+
+        self.k = 1.0
+        self.x = 1.0
+        self.register_input("k")
+        self.register_state("x")
+
+    def derivatives(self, t, x):
+        return -self.k * x
+'''
+
+
+class TestOdeSlave:
+    def test_solver_is_created_again_after_changes(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        uri = write_resources(tmp_path, "Decay", _ode_slave)
+        h = mgr.instantiate(
+            "d", Fmi2Type.co_simulation, "", uri, callback, False, False
+        )
+        slave = mgr._records[h].slave
+
+        for i in range(10):
+            assert mgr.do_step(h, i * 0.1, 0.1, False) is Fmi2Status.ok
+        solver = slave._solver
+
+        # setting an input to its current value keeps the solver
+        assert mgr.set_xxx(h, [0], [1.0]) is Fmi2Status.ok
+        assert mgr.do_step(h, 1.0, 1.0, False) is Fmi2Status.ok
+        assert slave._solver is solver
+
+        assert mgr.set_xxx(h, [0], [2.0]) is Fmi2Status.ok
+        assert mgr.do_step(h, 2.0, 1.0, False) is Fmi2Status.ok
+        assert slave._solver is not solver
+        [x], _ = mgr.get_xxx(h, [1])
+        assert x == pytest.approx(math.exp(-4), rel=1e-6)
+
+_stateful_slave = '''
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class Stateful(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Stateful", *args, **kwargs)
+
+        self.x = 0.0
+        self.y = 0.0
+        self.steps = 0
+        self.register_output("x", "real", "continuous", "exact", storage="array")
+        self.register_output("y", "real", "continuous", "exact")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.x += step_size
+        self.y = self.x * 2
+        self.steps += 1
+        return Fmi2Status.ok
+
+    def get_state(self):
+        return self.steps
+
+    def set_state(self, state):
+        self.steps = state
+'''
+
+
+class TestFmuState:
+    def instantiate(self, mgr, tmp_path):
+        return mgr.instantiate(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(tmp_path, "Stateful", _stateful_slave),
+            logging_callback=callback,
+            logging_on=True,
+            visible=True,
+        )
+
+    def test_get_and_set_state(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h = self.instantiate(mgr, tmp_path)
+        slave = mgr._records[h].slave
+
+        mgr.do_step(h, 0.0, 1.0, False)
+        state, status = mgr.get_fmu_state(h)
+        assert status == Fmi2Status.ok
+
+        mgr.do_step(h, 1.0, 1.0, False)
+        assert mgr.get_xxx(h, [0, 1]) == ([2.0, 4.0], Fmi2Status.ok)
+
+        assert mgr.set_fmu_state(h, state) == Fmi2Status.ok
+        assert mgr.get_xxx(h, [0, 1]) == ([1.0, 2.0], Fmi2Status.ok)
+        assert slave.steps == 1
+
+        # overwriting an existing state updates it in place
+        mgr.do_step(h, 1.0, 1.0, False)
+        assert mgr.get_fmu_state(h, state) == (state, Fmi2Status.ok)
+        assert state.values == [4.0] and state.hidden == 2
+
+        assert mgr.free_fmu_state(h, state) == Fmi2Status.ok
+
+    def test_mutable_values_are_copied(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h = self.instantiate(mgr, tmp_path)
+        slave = mgr._records[h].slave
+
+        # variables of slaves which are not validated may hold mutable values, such as lists
+        slave.y = [1.0, 2.0]
+        state, _ = mgr.get_fmu_state(h)
+
+        slave.y.append(3.0)
+        assert mgr.set_fmu_state(h, state) == Fmi2Status.ok
+        assert slave.y == [1.0, 2.0]
+
+        # the restored value is a copy, which the slave may modify without changing the state
+        slave.y.append(4.0)
+        assert mgr.set_fmu_state(h, state) == Fmi2Status.ok
+        assert slave.y == [1.0, 2.0]
+
+    def test_unchanged_arrays_are_shared(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h = self.instantiate(mgr, tmp_path)
+
+        s1, _ = mgr.get_fmu_state(h)
+        s2, _ = mgr.get_fmu_state(h)
+        assert s1.arrays[0] is s2.arrays[0]
+
+        mgr.do_step(h, 0.0, 1.0, False)
+        s3, _ = mgr.get_fmu_state(h)
+        assert s3.arrays[0] is not s2.arrays[0]
+        assert s2.arrays[0].tolist() == [0.0]
+
+    def test_serialization(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        h = self.instantiate(mgr, tmp_path)
+
+        mgr.do_step(h, 0.0, 1.0, False)
+        state, _ = mgr.get_fmu_state(h)
+
+        size, status = mgr.serialized_fmu_state_size(h, state)
+        assert status == Fmi2Status.ok
+
+        # too small buffers are rejected
+        data = bytearray(size)
+        assert mgr.serialize_fmu_state(h, state, data[:-1]) == Fmi2Status.error
+        assert mgr.serialize_fmu_state(h, state, data) == Fmi2Status.ok
+
+        mgr.do_step(h, 1.0, 1.0, False)
+        deserialized, status = mgr.deserialize_fmu_state(h, memoryview(data))
+        assert status == Fmi2Status.ok
+
+        assert mgr.set_fmu_state(h, deserialized) == Fmi2Status.ok
+        assert mgr.get_xxx(h, [0, 1]) == ([1.0, 2.0], Fmi2Status.ok)
+        assert mgr._records[h].slave.steps == 1
+
+
+_isolated_slave = '''
+import os
+
+from pyfmu.fmi2 import Fmi2Slave, Fmi2Status
+
+
+class Isolated(Fmi2Slave):
+    def __init__(self, visible=False, logging_on=False, *args, **kwargs):
+        super().__init__(model_name="Isolated", *args, **kwargs)
+
+        self.x = 0.0
+        self.pid = os.getpid()
+        self.text = ""
+        self.register_input("x")
+        self.register_output("pid", "integer", "discrete", "exact")
+        self.register_output("text", "string", "discrete", "exact")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.x += step_size
+        self.text = "x" * 100000
+        self.log_ok("stepped to %s", args=(self.x,))
+        return Fmi2Status.ok
+'''
+
+
+class TestProcessIsolation:
+    def test_calls_are_forwarded_to_worker(self, tmp_path):
+        mgr = Fmi2SlaveContext()
+        messages = []
+
+        h = mgr.instantiate(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(
+                tmp_path,
+                "Isolated",
+                _isolated_slave,
+                execution_mode="process",
+                execution_buffer_size=1 << 16,
+            ),
+            logging_callback=lambda *m: messages.append(m[-1]),
+            logging_on=True,
+            visible=True,
+        )
+        assert h is not None
+
+        try:
+            [pid], status = mgr.get_xxx(h, [1])
+            assert status == Fmi2Status.ok and pid != os.getpid()
+
+            mgr.set_debug_logging(h, [], True)
+            assert mgr.set_xxx(h, references=[0], values=[1.0]) == Fmi2Status.ok
+            assert mgr.do_step(h, 0.0, 0.5, False) == Fmi2Status.ok
+            assert messages[-1] == "stepped to 1.5"
+
+            # messages larger than the buffer are split across its slots
+            values, status = mgr.get_xxx(h, [2])
+            assert values == ["x" * 100000]
+
+            out = array("d", [0.0])
+            references = memoryview(array("I", [0])).cast("B")
+            assert mgr.get_xxx_buffer(h, references, out) == Fmi2Status.ok
+            assert out.tolist() == [1.5]
+
+            state, status = mgr.get_fmu_state(h)
+            assert status == Fmi2Status.ok
+            mgr.do_step(h, 0.5, 0.5, False)
+            assert mgr.set_fmu_state(h, state) == Fmi2Status.ok
+            assert mgr.get_xxx(h, [0]) == ([1.5], Fmi2Status.ok)
+            assert mgr.free_fmu_state(h, state) == Fmi2Status.ok
+        finally:
+            process = mgr._records[h].process
+            mgr.free_instance(h)
+
+        assert not process._process.is_alive()
+
+    def test_worker_is_stopped_if_starting_fails(self, tmp_path, monkeypatch):
+        from multiprocessing.shared_memory import SharedMemory
+
+        from pyfmu.fmi2.isolation import Fmi2SlaveProcess
+
+        started = []
+
+        def fail(self):
+            started.append(self)
+            raise RuntimeError("the worker did not respond")
+
+        monkeypatch.setattr(Fmi2SlaveProcess, "_receive", fail)
+
+        instantiate_args = dict(
+            instance_name="a",
+            fmu_type=Fmi2Type.co_simulation,
+            guid="",
+            resources_uri=write_resources(tmp_path, "Isolated", _isolated_slave),
+            visible=False,
+            logging_on=False,
+        )
+        with pytest.raises(RuntimeError):
+            Fmi2SlaveProcess(instantiate_args, callback, {})
+
+        [process] = started
+        assert not process._process.is_alive()
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=process._shm.name)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from pyfmu.fmi2 import Fmi2Ensemble, Fmi2OdeSlave, Fmi2Slave, Fmi2Status
+from pyfmu.fmi2.exception import SlaveAttributeError
+
+
+class Gain(Fmi2Slave):
+    supports_ensembles = True
+
+    def __init__(self):
+        super().__init__("Gain", storage="array")
+
+        self.u = 1.0
+        self.k = 2
+        self.label = "gain"
+        self.register_input("u")
+        self.register_parameter("k", "integer")
+        self.register_parameter("label", "string")
+        self.register_output("y")
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.y = self.k * self.u
+        return Fmi2Status.ok
+
+
+class Decay(Fmi2OdeSlave):
+    supports_ensembles = True
+
+    def __init__(self, vectorized=True):
+        super().__init__("Decay", rtol=1e-8, atol=1e-10, vectorized=vectorized)
+
+        self.k = 1.0
+        self.x = 1.0
+        self.z = 2.0
+        self.register_parameter("k")
+        self.register_state("x")
+        self.register_state("z")
+
+    def derivatives(self, t, x):
+        return -self.k * x
+
+
+def test_members_are_vectorized():
+    ensemble = Fmi2Ensemble(Gain, 3)
+    ensemble.set("u", [1.0, 2.0, 3.0])
+
+    assert ensemble.do_step(0.0, 1.0) == Fmi2Status.ok
+    assert ensemble.get("y").tolist() == [2.0, 4.0, 6.0]
+    assert ensemble.get("k").dtype == int
+    assert ensemble.get("label") == "gain"
+
+    # scalars are shared by every member
+    ensemble.set("k", 3)
+    ensemble.do_step(1.0, 1.0)
+    assert ensemble.get("y").tolist() == [3.0, 6.0, 9.0]
+
+    with pytest.raises(ValueError):
+        ensemble.set("u", [1.0, 2.0])
+
+    with pytest.raises(SlaveAttributeError):
+        ensemble.get("w")
+
+
+def test_ode_members():
+    k = np.array([0.5, 1.0, 2.0])
+    ensemble = Fmi2Ensemble(Decay, 3)
+    ensemble.set("k", k)
+    ensemble.set("z", [1.0, 2.0, 3.0])
+
+    for i in range(10):
+        assert ensemble.do_step(i * 0.1, 0.1) == Fmi2Status.ok
+
+    assert ensemble.get("x") == pytest.approx(np.exp(-k), rel=1e-6)
+    assert ensemble.get("z") == pytest.approx([1.0, 2.0, 3.0] * np.exp(-k), rel=1e-6)
+    assert ensemble.slave.state.shape == (2, 3)
+
+
+def test_unsupported():
+    class Scalar(Gain):
+        supports_ensembles = False
+
+    with pytest.raises(SlaveAttributeError):
+        Fmi2Ensemble(Scalar, 3)
+
+    with pytest.raises(SlaveAttributeError):
+        Fmi2Ensemble(Decay, 3, vectorized=False)
@@ -0,0 +1,128 @@
+import pytest
+
+from pyfmu.fmi2.exception import SlaveConfigError
+from pyfmu.fmi2.logging import FMI2CallbackLogger
+from pyfmu.fmi2.types import Fmi2Status
+
+
+def create_logger():
+    messages = []
+
+    def callback(instance_name, status, category, message):
+        messages.append((status, category, message))
+
+    logger = FMI2CallbackLogger("a", 0, callback)
+    logger.register_new_category(
+        "logStatusError", lambda m, c, s: s == Fmi2Status.error
+    )
+    logger.register_new_category("gui", lambda m, c, s: c == "gui")
+
+    return logger, messages
+
+
+class TestLogger:
+    def test_deferred_formatting(self):
+        logger, messages = create_logger()
+        logger.set_debug_logging(True, ["logStatusError"])
+
+        def expensive():
+            raise AssertionError("message of a filtered log call was formatted")
+
+        logger.ok(expensive, category="gui")
+        logger.ok("%s", category="gui", args=(object(),))
+        assert messages == []
+
+        logger.error(lambda: "computed")
+        logger.error("%s + %s", args=(1, 2))
+        assert messages == [
+            (Fmi2Status.error, "info", "computed"),
+            (Fmi2Status.error, "info", "1 + 2"),
+        ]
+
+    def test_is_enabled(self):
+        logger, _ = create_logger()
+        assert not logger.is_enabled(Fmi2Status.error)
+
+        logger.set_debug_logging(True, ["gui"])
+        assert logger.is_enabled(Fmi2Status.ok, "gui")
+        assert not logger.is_enabled(Fmi2Status.error, "events")
+
+        logger.set_debug_logging(False, ["gui"])
+        assert not logger.is_enabled(Fmi2Status.ok, "gui")
+
+        logger.set_debug_logging(True, [])
+        assert logger.is_enabled(Fmi2Status.ok, "events")
+
+    def test_standard_categories(self):
+        logger = FMI2CallbackLogger("a", 0, lambda *m: None)
+        logger.register_standard_categories()
+
+        logger.set_debug_logging(True, ["logStatusWarning"])
+        assert logger.is_enabled(Fmi2Status.warning, "events")
+        assert not logger.is_enabled(Fmi2Status.error, "events")
+
+        logger.set_debug_logging(True, ["logAll"])
+        assert logger.is_enabled(Fmi2Status.ok, "events")
+
+
+class TestBufferedLogger:
+    def test_messages_are_delivered_on_flush(self):
+        logger, messages = create_logger()
+        logger.set_debug_logging(True, [])
+        logger.set_buffering(2)
+
+        logger.ok("a")
+        assert messages == []
+
+        logger.flush()
+        assert messages == [(Fmi2Status.ok, "info", "a")]
+
+    def test_drop_oldest(self):
+        logger, messages = create_logger()
+        logger.set_debug_logging(True, [])
+        logger.set_buffering(2, "drop_oldest")
+
+        for m in "abc":
+            logger.ok(m)
+        logger.flush()
+
+        assert [m for _, _, m in messages] == ["b", "c"]
+        assert logger.dropped == 1
+
+    def test_block(self):
+        logger, messages = create_logger()
+        logger.set_debug_logging(True, [])
+        logger.set_buffering(2, "block")
+
+        for m in "abc":
+            logger.ok(m)
+        assert [m for _, _, m in messages] == ["a", "b"]
+
+        logger.flush()
+        assert [m for _, _, m in messages] == ["a", "b", "c"]
+        assert logger.dropped == 0
+
+    def test_summarize(self):
+        logger, messages = create_logger()
+        logger.set_debug_logging(True, [])
+        logger.set_buffering(1, "summarize")
+
+        logger.ok("a")
+        logger.ok("b")
+        logger.warning("c")
+        logger.flush()
+
+        assert messages[0] == (Fmi2Status.ok, "info", "a")
+        status, category, message = messages[1]
+        assert (status, category) == (Fmi2Status.warning, "pyfmu")
+        assert message.startswith("2 messages were dropped")
+        assert logger.dropped == 2
+
+    def test_invalid_configuration(self):
+        logger, _ = create_logger()
+
+        with pytest.raises(SlaveConfigError):
+            logger.configure({"logging": {"buffer_size": 10, "overflow": "never"}})
+
+        with pytest.raises(SlaveConfigError):
+            logger.configure({"logging": {"buffer_size": 0}})
@@ -0,0 +1,301 @@
+import math
+from array import array
+
+import pytest
+
+from pyfmu.builder.export import extract_model_description
+from pyfmu.fmi2 import Fmi2OdeSlave, Fmi2Slave, Fmi2Status
+from pyfmu.fmi2.exception import InvalidVariableError, SlaveAttributeError
+from pyfmu.fmi2.storage import Fmi2ArrayStorage
+
+
+class Plant(Fmi2Slave):
+    def __init__(self, n: int):
+        super().__init__(model_name="Plant")
+
+        for i in range(n):
+            setattr(self, f"u{i}", 0.0)
+        self.k = 2
+        self.on = True
+
+
+class TestRegistration:
+    def test_register_variables(self):
+        s = Plant(3)
+
+        inputs = s.register_variables([f"u{i}" for i in range(3)], "input")
+        outputs = s.register_variables(["y", "flag"], "output", ["real", "boolean"])
+        parameters = s.register_variables(
+            ["k", "on"], "parameter", ["integer", "boolean"], descriptions=["gain", None],
+        )
+
+        assert inputs + outputs + parameters == list(range(7))
+        declared = [(v.name, v.causality, v.variability, v.initial) for v in s.variables]
+        assert declared[2:6] == [
+            ("u2", "input", "continuous", None),
+            ("y", "output", "continuous", "calculated"),
+            ("flag", "output", "continuous", "calculated"),
+            ("k", "parameter", "tunable", "exact"),
+        ]
+        assert [v.start for v in s.variables] == [0.0, 0.0, 0.0, None, None, 2, True]
+        assert s.variables[5].description == "gain"
+
+        # variables are slotted
+        assert not hasattr(s.variables[0], "__dict__")
+
+    def test_invalid_tables_register_nothing(self):
+        s = Plant(2)
+        s.register_input("u0")
+
+        with pytest.raises(SlaveAttributeError, match="u0"):
+            s.register_variables(["u1", "u0"], "input")
+
+        with pytest.raises(InvalidVariableError):
+            s.register_variables(["u1", "y"], ["input", "output"], variability="fixed")
+
+        # the start value of an integer must be an integer
+        with pytest.raises(InvalidVariableError):
+            s.register_variables(["u1", "k"], "input", "integer", "discrete")
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_variables(["u1"], "input", ["real", "real"])
+
+        assert [v.name for v in s.variables] == ["u0"]
+        assert s.register_variables(["u1"], "input") == [1]
+
+    def test_register_duplicate(self):
+        s = Plant(1)
+        s.register_input("u0")
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_input("u0")
+
+
+class TestArrayStorage:
+    def test_blocks_are_held_by_a_single_array(self):
+        storage = Fmi2ArrayStorage()
+        values, other = array("d", [1.0] * 3), array("d", [1.0] * 3)
+
+        storage.refs_to_locations = {0: (values, 0), 1: (values, 1), 2: (values, 2)}
+        assert storage.block(0, 3).tolist() == [1.0] * 3
+
+        # an array with equal contents is not the same array
+        storage.refs_to_locations[1] = (other, 1)
+        assert storage.block(0, 3) is None
+
+
+class Diagnostics(Fmi2Slave):
+    def __init__(self):
+        super().__init__(model_name="Diagnostics")
+
+        self.u = 2.0
+        self.computed = 0
+        self.register_input("u")
+        self.register_output("squared", compute=self.square)
+        self.register_output("cube", compute=lambda s: s.u ** 3)
+
+    def square(self):
+        self.computed += 1
+        return self.u ** 2
+
+
+class TestComputedOutputs:
+    def test_outputs_are_computed_on_demand(self):
+        s = Diagnostics()
+        assert s.computed == 0
+
+        assert (s.squared, s.squared, s.cube) == (4.0, 4.0, 8.0)
+        assert s.computed == 1
+
+        s.u = 3.0
+        assert s.squared == 4.0
+        s.invalidate_computed_outputs()
+        assert s.squared == 9.0
+        assert s.computed == 2
+
+        with pytest.raises(AttributeError):
+            s.squared = 1.0
+
+    def test_clones_compute_their_own_outputs(self):
+        s = Diagnostics()
+        clone = s.clone(s._logger)
+        clone.u = 4.0
+
+        assert (s.squared, clone.squared) == (4.0, 16.0)
+        assert (s.computed, clone.computed) == (1, 1)
+
+    def test_initial_must_be_calculated(self):
+        s = Diagnostics()
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_output("y", initial="exact", compute=lambda s: 1.0)
+
+
+class Sensors(Fmi2Slave):
+    def __init__(self):
+        super().__init__(model_name="Sensors", author="")
+
+        self.u = [1.0, 2.0, 3.0]
+        self.register_array_input("u", 3)
+        self.register_array_parameter("gain", (2, 3), "integer")
+        self.register_array_output("y", (2, 3))
+
+    def do_step(self, current_time, step_size, no_set_fmu_state_prior):
+        self.y = self.gain * self.u
+        return Fmi2Status.ok
+
+
+class TestArrayVariables:
+    def test_elements_are_registered(self):
+        s = Sensors()
+
+        assert [v.name for v in s.variables[:5]] == [
+            "u[1]",
+            "u[2]",
+            "u[3]",
+            "gain[1,1]",
+            "gain[1,2]",
+        ]
+        assert [v.value_reference for v in s.variables] == list(range(15))
+        assert [v.start for v in s.variables[:4]] == [1.0, 2.0, 3.0, 0]
+        assert s.variable_naming_convention == "structured"
+
+        description = extract_model_description(s).decode()
+        assert 'variableNamingConvention="structured"' in description
+        assert '<ScalarVariable name="u[2]" valueReference="1"' in description
+
+    def test_arrays_share_memory_with_storage(self):
+        s = Sensors()
+        assert s.u.shape == (3,) and s.gain.shape == (2, 3)
+
+        s.gain = [[1, 1, 1], [2, 2, 2]]
+        s.do_step(0.0, 1.0, True)
+
+        assert s.get_value_block(9, 15).tolist() == [1.0, 2.0, 3.0, 2.0, 4.0, 6.0]
+        s.get_value_block(0, 3)[:] = array("d", [0.0, 0.0, 1.0])
+        assert s.u.tolist() == [0.0, 0.0, 1.0]
+
+        # blocks do not span variables
+        assert s.get_value_block(2, 4) is None
+
+    def test_clones_have_their_own_arrays(self):
+        s = Sensors()
+        clone = s.clone(s._logger)
+        clone.u = 0.0
+
+        assert (s.u.tolist(), clone.u.tolist()) == ([1.0, 2.0, 3.0], [0.0, 0.0, 0.0])
+        assert clone.get_value_block(0, 3).tolist() == [0.0, 0.0, 0.0]
+
+    def test_invalid_arrays(self):
+        s = Sensors()
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_array_input("u", 3)
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_input("gain")
+
+        with pytest.raises(SlaveAttributeError):
+            s.register_array_output("names", 2, "string")
+
+        s.v = [1.0, 2.0]
+        with pytest.raises(SlaveAttributeError):
+            s.register_array_input("v", 3)
+
+
+class Decay(Fmi2OdeSlave):
+    def __init__(self, method: str = "RK45"):
+        super().__init__("Decay", method=method, rtol=1e-8, atol=1e-10, vectorized=True)
+
+        self.k = 1.0
+        self.x = 1.0
+        self.z = 2.0
+        self.register_input("k")
+        self.register_state("x")
+        self.register_state("z")
+
+    def derivatives(self, t, x):
+        return -self.k * x
+
+
+class TestOdeSlave:
+    @pytest.mark.parametrize("method", ["RK45", "DOP853", "Radau"])
+    def test_decay(self, method):
+        s = Decay(method)
+
+        for i in range(100):
+            assert s.do_step(i * 0.01, 0.01, True) == Fmi2Status.ok
+
+        assert type(s.x) is float
+        assert s.x == pytest.approx(math.exp(-1), rel=1e-6)
+        assert list(s.state) == [s.x, s.z]
+
+        # inputs may change between steps, the slave context notifies the slave of these
+        s.k = 2.0
+        s.variables_changed()
+        s.do_step(1.0, 1.0, True)
+        assert s.x == pytest.approx(math.exp(-3), rel=1e-6)
+
+    def test_solver_is_kept(self):
+        def evaluations(communication_step):
+            s = Decay()
+            derivatives = s.derivatives
+            times = []
+
+            def counted(t, x):
+                times.append(t)
+                return derivatives(t, x)
+
+            s.derivatives = counted
+            n_steps = round(1.0 / communication_step)
+            for i in range(n_steps):
+                s.do_step(i * communication_step, communication_step, True)
+
+            assert s.x == pytest.approx(math.exp(-1), rel=1e-6)
+            return s, times
+
+        # the steps of the solver are independent of the communication points
+        s, times = evaluations(0.01)
+        assert times == evaluations(0.1)[1]
+
+        # the solver created after a change starts from the step size of the previous one rather than
+        # estimating it, evaluating the derivatives once at its start and six times per step of RK45
+        n = len(times)
+        s.k = 2.0
+        s.variables_changed()
+        s.do_step(1.0, 1.0, True)
+        assert (len(times) - n) % 6 == 1
+        assert s.x == pytest.approx(math.exp(-3), rel=1e-6)
+
+    def test_states_are_shared(self):
+        s = Decay()
+        s.state[0] = 3.0
+        s.z = 4.0
+
+        assert s.x == 3.0
+        assert s.state[1] == 4.0
+        assert list(s.get_value_block(1, 3)) == [3.0, 4.0]
+
+        # the vector can not grow while it is referenced
+        state = s.state
+        s.w = 0.0
+        with pytest.raises(SlaveAttributeError):
+            s.register_state("w")
+
+        del state
+        s.register_state("w")
+        assert list(s.state) == [3.0, 4.0, 0.0]
+
+    def test_restored_state_is_reproduced(self):
+        s = Decay()
+        for i in range(10):
+            s.do_step(i * 0.1, 0.1, True)
+
+        hidden, states = s.get_state(), s.state.copy()
+        s.do_step(1.0, 0.1, True)
+        expected = s.state.copy()
+
+        s.state[:] = states
+        s.set_state(hidden)
+        s.do_step(1.0, 0.1, True)
+        assert list(s.state) == list(expected)
@@ -0,0 +1,109 @@
+"""Measure the startup cost of example FMUs, as experienced by a wrapper instantiating these in a fresh interpreter.
+
+Each project is exported with and without precompiled bytecode and instantiated repeatedly in a new interpreter,
+reporting the time taken to import the slave context, to create the first instance and to create each of the subsequent instances.
+Interpreters are started with PYTHONDONTWRITEBYTECODE set, such that each repetition loads a freshly extracted FMU.
+
+    python -m tests.utils.benchmark_startup --instances 100 --repeat 5 Adder BicycleDynamic
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+from pyfmu.builder.export import export_project
+
+from . import get_example_project
+
+_measure = """
+import json
+import sys
+from time import perf_counter
+
+start = perf_counter()
+from pyfmu.fmi2.slaveContext import Fmi2SlaveContext
+from pyfmu.fmi2.types import Fmi2Type
+imported = perf_counter()
+
+context = Fmi2SlaveContext()
+times = []
+
+for i in range(int(sys.argv[2])):
+    instantiating = perf_counter()
+    handle = context.instantiate(
+        f"i{i}", Fmi2Type.co_simulation, "", sys.argv[1], lambda *m: None, False, False
+    )
+    times.append(perf_counter() - instantiating)
+
+    if handle is None:
+        sys.exit("instantiation failed")
+
+print(json.dumps({"import": imported - start, "instances": times}))
+"""
+
+
+def measure(resources_uri: str, instances: int, repeat: int) -> dict:
+    """Returns the median time in seconds of importing the context, and of creating the first and subsequent instances."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    runs = []
+
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _measure, resources_uri, str(instances)],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+        runs.append(json.loads(completed.stdout))
+
+    subsequent = [t for r in runs for t in r["instances"][1:]]
+
+    return {
+        "import": median(r["import"] for r in runs),
+        "first": median(r["instances"][0] for r in runs),
+        "nth": median(subsequent) if subsequent else 0.0,
+    }
+
+
+def benchmark_startup(projects, instances: int, repeat: int):
+
+    print(f"{'project':<20}{'bytecode':<10}{'import':>12}{'first':>12}{'nth':>12}")
+
+    with TemporaryDirectory() as tmpdir:
+        for name in projects:
+            for precompile in [False, True]:
+                output_path = Path(tmpdir) / f"{name}-{precompile}"
+                try:
+                    archive = export_project(
+                        get_example_project(name),
+                        output_path,
+                        compress=False,
+                        precompile=precompile,
+                    )
+                    times = measure(
+                        archive.resources_dir.as_uri(), instances, repeat
+                    )
+                except Exception as e:
+                    print(f"{name:<20}skipped: {e}")
+                    break
+
+                columns = [f"{times[k] * 1e3:>10.2f}ms" for k in ["import", "first", "nth"]]
+                print(f"{name:<20}{'yes' if precompile else 'no':<10}{''.join(columns)}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("projects", nargs="*", default=["Adder", "BicycleDynamic"])
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    benchmark_startup(args.projects, args.instances, args.repeat)